@@ -1,709 +1,247 @@
 import streamlit as st
-import pandas as pd
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import time
-import random
+import json
+import os
+from functools import partial
+from call_store import AppendBuffer, CallStore
+from call_generator import CallGenerator, seed_demo_calls
+from rollups import CallRollups
+from matrix_theme import build_theme
+from series_pyramid import CallSeriesPyramid, LEVEL_NAMES
+from forecast import ForecastEngine, INTERVALS as FORECAST_INTERVALS, MAX_HORIZON_DAYS
+from staffing import StaffingPlanner, SERVICE_LEVEL, ANSWER_WITHIN
+from anomaly import CallAnomalyMonitor, METRICS as ANOMALY_METRICS, METRIC_LABELS as ANOMALY_LABELS
+from call_events import CallEventBus, DemoCallFeed, LiveAgentScores, SlidingCategoryCounter
+from training_jobs import (JobManager, JobLimitError, ACTIVE_STATES, PAUSED,
+                           COMPLETED, CANCELLED, FAILED)
+from neural_engine import DATASETS, MLP, MLPTrainer, evaluate, load_dataset, train_test_split
+from model_registry import ModelRegistry, arrays_from_npz
+from perf_monitor import PerfStats, RerunProfiler, stage as perf_stage
+
+# Plotly, pandas and pyarrow are imported inside the pages that use them so
+# a cold start that lands on the Command Center never loads them
+
+@st.cache_resource
+def get_theme_asset():
+    """Minify and hash the Matrix stylesheet once per process"""
+    return build_theme()
 
 # Enhanced Matrix AI Call Center theme with sidebar modifications
 def apply_matrix_theme():
-    st.markdown("""
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Orbitron:wght@400;700;900&family=Share+Tech+Mono:wght@400&display=swap');
-    
-    /* Matrix AI Call Center Variables */
-    :root {
-        --matrix-green: #00ff41;
-        --matrix-bright-green: #39ff14;
-        --matrix-dark-green: #008f11;
-        --matrix-neon-blue: #00ffff;
-        --matrix-purple: #9d4edd;
-        --matrix-black: #000000;
-        --matrix-dark: #0a0a0a;
-        --matrix-darker: #050505;
-    }
-    
-    /* Hide default Streamlit elements */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-    .stDeployButton {visibility: hidden;}
-    
-    /* Show and style sidebar toggle button */
-    .st-emotion-cache-1cypcdb .st-emotion-cache-1inwz65 {
-        visibility: visible !important;
-        opacity: 1 !important;
-    }
-    
-    /* Style the sidebar toggle button */
-    button[title="Close sidebar"] {
-        background: linear-gradient(45deg, rgba(0,0,0,0.9), rgba(0,143,17,0.3)) !important;
-        border: 2px solid var(--matrix-green) !important;
-        border-radius: 8px !important;
-        color: var(--matrix-green) !important;
-        font-family: 'Orbitron', monospace !important;
-        font-weight: 700 !important;
-        text-shadow: 0 0 8px var(--matrix-green) !important;
-        box-shadow: 0 0 15px rgba(0,255,65,0.4) !important;
-        transition: all 0.3s ease !important;
-        position: fixed !important;
-        top: 20px !important;
-        left: 20px !important;
-        z-index: 9999 !important;
-        width: 50px !important;
-        height: 50px !important;
-        padding: 8px !important;
-    }
-    
-    button[title="Close sidebar"]:hover {
-        background: linear-gradient(45deg, rgba(0,143,17,0.6), rgba(0,255,65,0.4)) !important;
-        color: #000000 !important;
-        text-shadow: 0 0 8px #000000 !important;
-        box-shadow: 0 0 25px rgba(0,255,65,0.6) !important;
-        transform: scale(1.1) !important;
-        border-color: var(--matrix-bright-green) !important;
-    }
-    
-    button[title="Open sidebar"] {
-        background: linear-gradient(45deg, rgba(0,0,0,0.9), rgba(0,143,17,0.3)) !important;
-        border: 2px solid var(--matrix-green) !important;
-        border-radius: 8px !important;
-        color: var(--matrix-green) !important;
-        font-family: 'Orbitron', monospace !important;
-        font-weight: 700 !important;
-        text-shadow: 0 0 8px var(--matrix-green) !important;
-        box-shadow: 0 0 15px rgba(0,255,65,0.4) !important;
-        transition: all 0.3s ease !important;
-        position: fixed !important;
-        top: 20px !important;
-        left: 20px !important;
-        z-index: 9999 !important;
-        width: 50px !important;
-        height: 50px !important;
-        padding: 8px !important;
-    }
-    
-    button[title="Open sidebar"]:hover {
-        background: linear-gradient(45deg, rgba(0,143,17,0.6), rgba(0,255,65,0.4)) !important;
-        color: #000000 !important;
-        text-shadow: 0 0 8px #000000 !important;
-        box-shadow: 0 0 25px rgba(0,255,65,0.6) !important;
-        transform: scale(1.1) !important;
-        border-color: var(--matrix-bright-green) !important;
-    }
-    
-    /* Ensure sidebar is always visible and accessible */
-    .css-1d391kg {
-        visibility: visible !important;
-        opacity: 1 !important;
-        position: relative !important;
-    }
-    
-    /* Force sidebar to be expanded by default */
-    .css-1d391kg, .css-1cypcdb {
-        width: 21rem !important;
-        min-width: 21rem !important;
-    }
-    
-    /* Make sure main content adjusts when sidebar is open */
-    .main .block-container {
-        padding-left: 1rem !important;
-        padding-right: 1rem !important;
-        max-width: none !important;
-    }
-    
-    /* Main app styling */
-    .stApp {
-        background: linear-gradient(135deg, #000000 0%, #0a0a0a 30%, #1a0a1a 60%, #050505 100%);
-        color: var(--matrix-green);
-        font-family: 'Orbitron', 'Share Tech Mono', monospace;
-        overflow-x: hidden;
-    }
-    
-    /* Animated background grid */
-    .stApp::before {
-        content: '';
-        position: fixed;
-        top: 0;
-        left: 0;
-        width: 100%;
-        height: 100%;
-        background-image: 
-            linear-gradient(rgba(0,255,65,0.03) 1px, transparent 1px),
-            linear-gradient(90deg, rgba(0,255,65,0.03) 1px, transparent 1px);
-        background-size: 50px 50px;
-        animation: grid-move 20s linear infinite;
-        z-index: -2;
-    }
-    
-    @keyframes grid-move {
-        0% { transform: translate(0, 0); }
-        100% { transform: translate(50px, 50px); }
-    }
-    
-    /* Matrix rain enhanced */
-    .matrix-bg {
-        position: fixed;
-        top: 0;
-        left: 0;
-        width: 100%;
-        height: 100vh;
-        z-index: -1;
-        overflow: hidden;
-        background: transparent;
-        pointer-events: none;
-    }
-    
-    .matrix-rain {
-        position: absolute;
-        color: var(--matrix-green);
-        font-family: 'Share Tech Mono', monospace;
-        font-size: 12px;
-        line-height: 14px;
-        text-shadow: 0 0 10px var(--matrix-green);
-        white-space: nowrap;
-        opacity: 0;
-        animation: rain linear infinite;
-    }
-    
-    .matrix-rain:nth-child(odd) {
-        color: var(--matrix-neon-blue);
-        text-shadow: 0 0 10px var(--matrix-neon-blue);
-    }
-    
-    @keyframes rain {
-        0% {
-            opacity: 0;
-            transform: translateY(-100px);
-        }
-        5% {
-            opacity: 1;
-        }
-        95% {
-            opacity: 1;
-        }
-        100% {
-            opacity: 0;
-            transform: translateY(calc(100vh + 100px));
-        }
-    }
-    
-    /* Hero section styling */
-    .hero-section {
-        background: linear-gradient(135deg, rgba(0,0,0,0.95) 0%, rgba(26,10,26,0.9) 50%, rgba(0,0,0,0.95) 100%);
-        border: 3px solid var(--matrix-green);
-        border-radius: 20px;
-        padding: 50px 30px;
-        margin: 30px 0;
-        text-align: center;
-        position: relative;
-        overflow: hidden;
-        box-shadow: 
-            0 0 50px rgba(0,255,65,0.4),
-            inset 0 0 50px rgba(0,255,65,0.1),
-            0 0 100px rgba(157,78,221,0.2);
-        animation: hero-pulse 4s ease-in-out infinite alternate;
-    }
-    
-    .hero-section::before {
-        content: '';
-        position: absolute;
-        top: -50%;
-        left: -50%;
-        width: 200%;
-        height: 200%;
-        background: linear-gradient(45deg, transparent 30%, rgba(0,255,65,0.1) 50%, transparent 70%);
-        animation: hero-sweep 8s linear infinite;
-        pointer-events: none;
-    }
-    
-    @keyframes hero-pulse {
-        0% { 
-            box-shadow: 0 0 50px rgba(0,255,65,0.4), inset 0 0 50px rgba(0,255,65,0.1), 0 0 100px rgba(157,78,221,0.2);
-        }
-        100% { 
-            box-shadow: 0 0 80px rgba(0,255,65,0.6), inset 0 0 80px rgba(0,255,65,0.2), 0 0 150px rgba(157,78,221,0.4);
-        }
-    }
-    
-    @keyframes hero-sweep {
-        0% { transform: translateX(-100%) translateY(-100%) rotate(45deg); }
-        100% { transform: translateX(100%) translateY(100%) rotate(45deg); }
-    }
-    
-    /* Enhanced headers */
-    .hero-title {
-        font-family: 'Orbitron', monospace !important;
-        font-size: 4rem !important;
-        font-weight: 900 !important;
-        background: linear-gradient(45deg, var(--matrix-bright-green), var(--matrix-neon-blue), var(--matrix-purple));
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        text-shadow: 0 0 30px var(--matrix-green);
-        margin-bottom: 20px !important;
-        animation: title-glow 3s ease-in-out infinite alternate;
-        position: relative;
-        z-index: 1;
-    }
-    
-    .hero-subtitle {
-        font-family: 'Share Tech Mono', monospace !important;
-        font-size: 1.5rem !important;
-        color: var(--matrix-neon-blue) !important;
-        text-shadow: 0 0 20px var(--matrix-neon-blue);
-        margin-bottom: 30px !important;
-        animation: subtitle-flicker 2s linear infinite;
-    }
-    
-    @keyframes title-glow {
-        0% { text-shadow: 0 0 30px var(--matrix-green), 0 0 60px var(--matrix-green); }
-        100% { text-shadow: 0 0 50px var(--matrix-bright-green), 0 0 100px var(--matrix-bright-green); }
-    }
-    
-    @keyframes subtitle-flicker {
-        0%, 98% { opacity: 1; }
-        99% { opacity: 0.8; }
-        100% { opacity: 1; }
-    }
-    
-    /* Enhanced Sidebar Menu Boxes */
-    .sidebar-menu-box {
-        background: linear-gradient(135deg, rgba(0,0,0,0.95) 0%, rgba(0,143,17,0.1) 100%);
-        border: 2px solid var(--matrix-green);
-        border-radius: 15px;
-        padding: 20px;
-        margin: 15px 0;
-        position: relative;
-        overflow: hidden;
-        box-shadow: 
-            0 5px 25px rgba(0,255,65,0.3),
-            inset 0 1px 0 rgba(255,255,255,0.1);
-        transition: all 0.3s ease;
-    }
-    
-    .sidebar-menu-box::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: -100%;
-        width: 100%;
-        height: 100%;
-        background: linear-gradient(90deg, transparent, rgba(0,255,65,0.2), transparent);
-        transition: left 0.6s ease;
-    }
-    
-    .sidebar-menu-box:hover {
-        border-color: var(--matrix-bright-green);
-        box-shadow: 
-            0 8px 35px rgba(0,255,65,0.5),
-            inset 0 1px 0 rgba(255,255,255,0.2);
-        transform: translateY(-2px);
-    }
-    
-    .sidebar-menu-box:hover::before {
-        left: 100%;
-    }
-    
-    .sidebar-menu-title {
-        color: var(--matrix-bright-green) !important;
-        font-family: 'Orbitron', monospace !important;
-        font-weight: 700 !important;
-        font-size: 1rem !important;
-        text-align: center !important;
-        margin-bottom: 15px !important;
-        text-shadow: 0 0 10px var(--matrix-green);
-        border-bottom: 1px solid var(--matrix-green);
-        padding-bottom: 8px;
-    }
-    
-    /* Enhanced sidebar navigation buttons */
-    div[data-testid="stSidebar"] .stButton > button {
-        width: 100% !important;
-        margin: 6px 0 !important;
-        background: linear-gradient(45deg, rgba(0,0,0,0.9), rgba(0,143,17,0.2)) !important;
-        border: 2px solid var(--matrix-green) !important;
-        border-radius: 12px !important;
-        padding: 12px 18px !important;
-        font-family: 'Orbitron', monospace !important;
-        font-weight: 600 !important;
-        font-size: 0.85rem !important;
-        text-transform: uppercase !important;
-        letter-spacing: 1px !important;
-        color: var(--matrix-green) !important;
-        text-shadow: 0 0 8px var(--matrix-green) !important;
-        box-shadow: 
-            0 4px 15px rgba(0,255,65,0.3),
-            inset 0 1px 0 rgba(255,255,255,0.1) !important;
-        transition: all 0.3s ease !important;
-        position: relative !important;
-        overflow: hidden !important;
-    }
-    
-    div[data-testid="stSidebar"] .stButton > button::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: -100%;
-        width: 100%;
-        height: 100%;
-        background: linear-gradient(90deg, transparent, rgba(0,255,65,0.4), transparent);
-        transition: left 0.6s ease;
-    }
-    
-    div[data-testid="stSidebar"] .stButton > button:hover {
-        background: linear-gradient(45deg, rgba(0,143,17,0.6), rgba(0,255,65,0.4)) !important;
-        color: #000000 !important;
-        text-shadow: 0 0 8px #000000 !important;
-        box-shadow: 
-            0 6px 25px rgba(0,255,65,0.6),
-            inset 0 1px 0 rgba(255,255,255,0.2) !important;
-        transform: translateY(-3px) scale(1.02) !important;
-        border-color: var(--matrix-bright-green) !important;
-    }
-    
-    div[data-testid="stSidebar"] .stButton > button:hover::before {
-        left: 100%;
-    }
-    
-    /* Horizontal Navigation Menu */
-    .horizontal-nav {
-        background: linear-gradient(135deg, rgba(0,0,0,0.9) 0%, rgba(0,20,0,0.8) 100%);
-        border: 2px solid var(--matrix-green);
-        border-radius: 15px;
-        padding: 20px;
-        margin: 20px 0;
-        position: relative;
-        overflow: hidden;
-        box-shadow: 0 10px 30px rgba(0,255,65,0.3);
-    }
-    
-    .horizontal-nav::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: -100%;
-        width: 100%;
-        height: 100%;
-        background: linear-gradient(90deg, transparent, rgba(0,255,65,0.1), transparent);
-        animation: nav-sweep 8s linear infinite;
-        pointer-events: none;
-    }
-    
-    @keyframes nav-sweep {
-        0% { left: -100%; }
-        100% { left: 100%; }
-    }
-    
-    .horizontal-nav-title {
-        color: var(--matrix-neon-blue) !important;
-        font-family: 'Orbitron', monospace !important;
-        font-weight: 700 !important;
-        font-size: 1.2rem !important;
-        text-align: center !important;
-        margin-bottom: 20px !important;
-        text-shadow: 0 0 15px var(--matrix-neon-blue);
-        position: relative;
-        z-index: 1;
-    }
-    
-    .nav-button {
-        background: linear-gradient(45deg, rgba(0,0,0,0.8), rgba(0,143,17,0.3)) !important;
-        color: var(--matrix-green) !important;
-        border: 2px solid var(--matrix-green) !important;
-        border-radius: 10px !important;
-        padding: 12px 20px !important;
-        font-family: 'Orbitron', monospace !important;
-        font-weight: 600 !important;
-        font-size: 0.9rem !important;
-        text-transform: uppercase !important;
-        letter-spacing: 1px !important;
-        text-shadow: 0 0 8px var(--matrix-green) !important;
-        box-shadow: 0 4px 15px rgba(0,255,65,0.3) !important;
-        transition: all 0.3s ease !important;
-        position: relative !important;
-        overflow: hidden !important;
-        margin: 0 10px !important;
-        cursor: pointer !important;
-        min-width: 120px !important;
-    }
-    
-    .nav-button::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: -100%;
-        width: 100%;
-        height: 100%;
-        background: linear-gradient(90deg, transparent, rgba(0,255,65,0.4), transparent);
-        transition: left 0.6s ease;
-    }
-    
-    .nav-button:hover {
-        background: linear-gradient(45deg, rgba(0,143,17,0.6), rgba(0,255,65,0.4)) !important;
-        color: #000000 !important;
-        text-shadow: 0 0 8px #000000 !important;
-        box-shadow: 0 6px 25px rgba(0,255,65,0.6) !important;
-        transform: translateY(-3px) scale(1.05) !important;
-        border-color: var(--matrix-bright-green) !important;
-    }
-    
-    .nav-button:hover::before {
-        left: 100%;
-    }
-    
-    .nav-button.active {
-        background: linear-gradient(45deg, rgba(0,255,65,0.3), rgba(0,255,255,0.2)) !important;
-        color: #000000 !important;
-        border-color: var(--matrix-neon-blue) !important;
-        box-shadow: 0 0 25px rgba(0,255,65,0.8) !important;
-        text-shadow: 0 0 8px #000000 !important;
-    }
-    
-    /* Service cards */
-    .service-card {
-        background: linear-gradient(135deg, rgba(0,0,0,0.9) 0%, rgba(0,20,0,0.8) 100%);
-        border: 2px solid var(--matrix-green);
-        border-radius: 15px;
-        padding: 30px 20px;
-        margin: 20px 10px;
-        text-align: center;
-        position: relative;
-        overflow: hidden;
-        transition: all 0.4s ease;
-        box-shadow: 0 10px 30px rgba(0,255,65,0.3);
-        cursor: pointer;
-    }
-    
-    .service-card::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: -100%;
-        width: 100%;
-        height: 100%;
-        background: linear-gradient(90deg, transparent, rgba(0,255,65,0.2), transparent);
-        transition: left 0.6s ease;
-    }
-    
-    .service-card:hover {
-        transform: translateY(-10px) scale(1.02);
-        border-color: var(--matrix-neon-blue);
-        box-shadow: 
-            0 20px 50px rgba(0,255,65,0.5),
-            0 0 50px rgba(0,255,255,0.3);
-    }
-    
-    .service-card:hover::before {
-        left: 100%;
-    }
-    
-    .service-icon {
-        font-size: 3rem;
-        margin-bottom: 20px;
-        display: block;
-        text-shadow: 0 0 20px currentColor;
-        animation: icon-float 3s ease-in-out infinite;
-    }
-    
-    @keyframes icon-float {
-        0%, 100% { transform: translateY(0px); }
-        50% { transform: translateY(-10px); }
-    }
-    
-    /* Enhanced sidebar */
-    .css-1d391kg, .css-1cypcdb, .css-17eq0hr {
-        background: linear-gradient(180deg, #000000 0%, #0a0a0a 50%, #1a0a1a 100%) !important;
-        border-right: 3px solid var(--matrix-green) !important;
-        box-shadow: 10px 0 30px rgba(0,255,65,0.3) !important;
-    }
-    
-    /* Stats section */
-    .stats-container {
-        background: rgba(0,0,0,0.8);
-        border: 2px solid var(--matrix-purple);
-        border-radius: 15px;
-        padding: 30px;
-        margin: 30px 0;
-        box-shadow: 0 0 30px rgba(157,78,221,0.4);
-    }
-    
-    .stat-item {
-        text-align: center;
-        padding: 20px;
-    }
-    
-    .stat-number {
-        font-family: 'Orbitron', monospace !important;
-        font-size: 3rem !important;
-        font-weight: 900 !important;
-        color: var(--matrix-neon-blue) !important;
-        text-shadow: 0 0 20px var(--matrix-neon-blue);
-        display: block;
-        margin-bottom: 10px;
-        animation: number-count 2s ease-out;
-    }
-    
-    @keyframes number-count {
-        from { transform: scale(0); opacity: 0; }
-        to { transform: scale(1); opacity: 1; }
-    }
-    
-    /* Enhanced buttons */
-    .stButton > button {
-        background: linear-gradient(45deg, rgba(0,0,0,0.8), rgba(0,143,17,0.4)) !important;
-        color: var(--matrix-bright-green) !important;
-        border: 2px solid var(--matrix-green) !important;
-        border-radius: 12px !important;
-        font-family: 'Orbitron', monospace !important;
-        font-weight: 700 !important;
-        text-transform: uppercase !important;
-        letter-spacing: 1px !important;
-        padding: 15px 30px !important;
-        text-shadow: 0 0 10px var(--matrix-green) !important;
-        box-shadow: 0 0 20px rgba(0,255,65,0.3) !important;
-        transition: all 0.3s ease !important;
-        position: relative !important;
-        overflow: hidden !important;
-    }
-    
-    .stButton > button:hover {
-        background: linear-gradient(45deg, rgba(0,143,17,0.6), rgba(0,255,65,0.4)) !important;
-        color: #000000 !important;
-        box-shadow: 0 0 40px var(--matrix-bright-green) !important;
-        transform: translateY(-2px) !important;
-    }
-    
-    /* Terminal styling */
-    .terminal {
-        background: rgba(0,0,0,0.95);
-        border: 2px solid var(--matrix-green);
-        border-radius: 10px;
-        padding: 20px;
-        font-family: 'Share Tech Mono', monospace;
-        color: var(--matrix-green);
-        text-shadow: 0 0 5px var(--matrix-green);
-        box-shadow: 
-            0 0 20px rgba(0,255,65,0.4),
-            inset 0 0 20px rgba(0,255,65,0.1);
-        margin: 20px 0;
-    }
-    
-    /* Matrix container styling */
-    .matrix-container {
-        background: linear-gradient(135deg, rgba(0,0,0,0.9) 0%, rgba(0,20,0,0.8) 100%);
-        border: 2px solid var(--matrix-green);
-        border-radius: 15px;
-        padding: 25px;
-        margin: 20px 0;
-        position: relative;
-        overflow: hidden;
-        box-shadow: 0 10px 30px rgba(0,255,65,0.3);
-    }
-    
-    .matrix-container::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: -100%;
-        width: 100%;
-        height: 100%;
-        background: linear-gradient(90deg, transparent, rgba(0,255,65,0.1), transparent);
-        animation: container-sweep 6s linear infinite;
-        pointer-events: none;
-    }
-    
-    @keyframes container-sweep {
-        0% { left: -100%; }
-        100% { left: 100%; }
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    """Link the cached theme stylesheet instead of re-sending it every rerun"""
+    asset = get_theme_asset()
+    st.markdown(asset.markup(st.get_option("server.enableStaticServing")),
+                unsafe_allow_html=True)
+
+# Matrix rain renderers selectable from the sidebar
+RAIN_MODES = {
+    "Canvas": "canvas",
+    "Classic": "classic",
+    "Off": "off"
+}
 
-def matrix_rain_effect():
-    """Enhanced Matrix rain effect with multiple layers"""
-    rain_script = """
+def rain_script(mode, fps, density):
+    """Script that brings the page's Matrix rain to ``mode``, tearing down any other renderer
+
+    st.html runs it in the app page itself, where it outlives the element
+    that injected it, so each renderer is a singleton on ``window`` with a
+    ``destroy()``: reruns reconfigure it and never stack timers, and the
+    short "off" script stops whatever is drawing.
+    """
+    if mode == "off":
+        return """
     <script>
-    function createEnhancedMatrixRain() {
-        const matrixContainer = document.getElementById('matrix-bg');
-        if (!matrixContainer) {
-            const bgDiv = document.createElement('div');
-            bgDiv.id = 'matrix-bg';
-            bgDiv.className = 'matrix-bg';
-            document.body.appendChild(bgDiv);
-        }
-        
-        const container = document.getElementById('matrix-bg');
+    if (window.__matrixRain) { window.__matrixRain.destroy(); }
+    if (window.__matrixClassic) { window.__matrixClassic.destroy(); }
+    </script>
+    """
+    settings = json.dumps({"mode": mode, "fps": fps, "density": density})
+    return """
+    <script>
+    (function() {
+        const settings = __SETTINGS__;
         const characters = '01ﾊﾐﾋｰｳｼﾅﾓﾆｻﾜﾂｵﾘｱﾎﾃﾏｹﾒｴｶｷﾑﾕﾗｾﾈｽﾀﾇﾍABCDEFGHIJKLMNOPQRSTUVWXYZ';
-        const columns = Math.floor(window.innerWidth / 20);
         
-        function createColumn(x) {
-            const column = document.createElement('div');
-            column.className = 'matrix-rain';
-            column.style.left = x + 'px';
-            column.style.animationDuration = (Math.random() * 4 + 3) + 's';
-            column.style.animationDelay = Math.random() * 3 + 's';
+        if (settings.mode !== 'canvas' && window.__matrixRain) {
+            window.__matrixRain.destroy();
+        }
+        if (settings.mode !== 'classic' && window.__matrixClassic) {
+            window.__matrixClassic.destroy();
+        }
+        if (settings.mode === 'canvas') {
+            if (window.__matrixRain) {
+                window.__matrixRain.configure(settings);
+            } else {
+                window.__matrixRain = createCanvasRain(settings);
+            }
+        } else if (settings.mode === 'classic' && !window.__matrixClassic) {
+            window.__matrixClassic = createClassicRain();
+        }
+        
+        function createCanvasRain(settings) {
+            const fontSize = 14;
+            const reducedMotion = window.matchMedia('(prefers-reduced-motion: reduce)');
             
-            let text = '';
-            const length = Math.random() * 30 + 15;
-            for (let i = 0; i < length; i++) {
-                text += characters.charAt(Math.floor(Math.random() * characters.length)) + '<br>';
+            const canvas = document.createElement('canvas');
+            canvas.className = 'matrix-bg';
+            document.body.appendChild(canvas);
+            const ctx = canvas.getContext('2d');
+            
+            let drops = new Float32Array(0);
+            let spacing = fontSize;
+            let frameId = null;
+            let lastFrame = 0;
+            
+            function resize() {
+                canvas.width = window.innerWidth;
+                canvas.height = window.innerHeight;
+                // Density caps the number of columns, not just their speed
+                const columns = Math.max(1, Math.floor(canvas.width / fontSize * settings.density));
+                spacing = canvas.width / columns;
+                const next = new Float32Array(columns);
+                for (let i = 0; i < columns; i++) {
+                    next[i] = i < drops.length ? drops[i] : Math.random() * -50;
+                }
+                drops = next;
+                ctx.font = fontSize + "px 'Share Tech Mono', monospace";
             }
-            column.innerHTML = text;
             
-            container.appendChild(column);
+            function draw(timestamp) {
+                frameId = window.requestAnimationFrame(draw);
+                if (timestamp - lastFrame < 1000 / settings.fps) {
+                    return;
+                }
+                lastFrame = timestamp;
+                
+                ctx.fillStyle = 'rgba(0, 0, 0, 0.08)';
+                ctx.fillRect(0, 0, canvas.width, canvas.height);
+                for (let i = 0; i < drops.length; i++) {
+                    ctx.fillStyle = i % 2 ? '#00ffff' : '#00ff41';
+                    const y = drops[i] * fontSize;
+                    ctx.fillText(characters[(Math.random() * characters.length) | 0], i * spacing, y);
+                    if (y > canvas.height && Math.random() > 0.975) {
+                        drops[i] = 0;
+                    }
+                    drops[i] += 1;
+                }
+            }
+            
+            function start() {
+                if (frameId === null && !document.hidden && !reducedMotion.matches) {
+                    lastFrame = 0;
+                    frameId = window.requestAnimationFrame(draw);
+                }
+            }
+            
+            function stop() {
+                if (frameId !== null) {
+                    window.cancelAnimationFrame(frameId);
+                    frameId = null;
+                }
+            }
+            
+            function onVisibility() {
+                document.hidden ? stop() : start();
+            }
             
-            setTimeout(() => {
-                if (column.parentNode) {
-                    column.parentNode.removeChild(column);
+            function onMotionPreference() {
+                if (reducedMotion.matches) {
+                    stop();
+                    ctx.clearRect(0, 0, canvas.width, canvas.height);
+                } else {
+                    start();
                 }
-            }, 8000);
+            }
+            
+            document.addEventListener('visibilitychange', onVisibility);
+            reducedMotion.addEventListener('change', onMotionPreference);
+            window.addEventListener('resize', resize);
+            resize();
+            start();
+            
+            return {
+                configure(next) {
+                    Object.assign(settings, next);
+                    resize();
+                },
+                destroy() {
+                    stop();
+                    document.removeEventListener('visibilitychange', onVisibility);
+                    reducedMotion.removeEventListener('change', onMotionPreference);
+                    window.removeEventListener('resize', resize);
+                    canvas.remove();
+                    delete window.__matrixRain;
+                }
+            };
         }
         
-        // Initialize effects
-        for (let i = 0; i < columns; i++) {
-            setTimeout(() => createColumn(i * 20), Math.random() * 2000);
-        }
-    }
-    
-    // Initialize enhanced effects
-    setTimeout(createEnhancedMatrixRain, 1000);
-    setInterval(() => {
-        const container = document.getElementById('matrix-bg');
-        if (container) {
-            const columns = Math.floor(window.innerWidth / 20);
-            for (let i = 0; i < Math.min(5, columns); i++) {
-                setTimeout(() => {
-                    const x = Math.random() * window.innerWidth;
-                    const column = document.createElement('div');
-                    column.className = 'matrix-rain';
-                    column.style.left = x + 'px';
-                    column.style.animationDuration = (Math.random() * 4 + 3) + 's';
-                    
-                    let text = '';
-                    const length = Math.random() * 30 + 15;
-                    const chars = '01ﾊﾐﾋｰｳｼﾅﾓﾆｻﾜﾂｵﾘｱﾎﾃﾏｹﾒｴｶｷﾑﾕﾗｾﾈｽﾀﾇﾍABCDEFGHIJKLMNOPQRSTUVWXYZ';
-                    for (let j = 0; j < length; j++) {
-                        text += chars.charAt(Math.floor(Math.random() * chars.length)) + '<br>';
-                    }
-                    column.innerHTML = text;
-                    
-                    container.appendChild(column);
-                    
-                    setTimeout(() => {
-                        if (column.parentNode) {
-                            column.parentNode.removeChild(column);
-                        }
-                    }, 8000);
-                }, Math.random() * 500);
+        // The original multi-layer DOM effect; every timer it starts is tracked so destroy() clears it
+        function createClassicRain() {
+            const container = document.createElement('div');
+            container.id = 'matrix-bg';
+            container.className = 'matrix-bg';
+            document.body.appendChild(container);
+            const timers = new Set();
+            
+            function later(callback, delay) {
+                const id = setTimeout(() => {
+                    timers.delete(id);
+                    callback();
+                }, delay);
+                timers.add(id);
             }
+            
+            function createColumn(x, delayed) {
+                const column = document.createElement('div');
+                column.className = 'matrix-rain';
+                column.style.left = x + 'px';
+                column.style.animationDuration = (Math.random() * 4 + 3) + 's';
+                if (delayed) {
+                    column.style.animationDelay = Math.random() * 3 + 's';
+                }
+                
+                let text = '';
+                const length = Math.random() * 30 + 15;
+                for (let i = 0; i < length; i++) {
+                    text += characters.charAt(Math.floor(Math.random() * characters.length)) + '<br>';
+                }
+                column.innerHTML = text;
+                container.appendChild(column);
+                later(() => column.remove(), 8000);
+            }
+            
+            later(() => {
+                const columns = Math.floor(window.innerWidth / 20);
+                for (let i = 0; i < columns; i++) {
+                    later(() => createColumn(i * 20, true), Math.random() * 2000);
+                }
+            }, 1000);
+            const interval = setInterval(() => {
+                const columns = Math.floor(window.innerWidth / 20);
+                for (let i = 0; i < Math.min(5, columns); i++) {
+                    later(() => createColumn(Math.random() * window.innerWidth, false), Math.random() * 500);
+                }
+            }, 300);
+            
+            return {
+                destroy() {
+                    clearInterval(interval);
+                    timers.forEach(clearTimeout);
+                    container.remove();
+                    delete window.__matrixClassic;
+                }
+            };
         }
-    }, 300);
+    })();
     </script>
-    """
-    st.components.v1.html(rain_script, height=0)
+    """.replace("__SETTINGS__", settings)
+
+def matrix_rain_effect(mode="canvas", fps=24, density=0.6):
+    """Matrix rain effect: capped single-canvas renderer, the classic multi-layer DOM effect, or off"""
+    st.html(rain_script(mode, fps, density), unsafe_allow_javascript=True)
 
 def create_hero_section():
     """Create website-style hero section"""
@@ -717,7 +255,90 @@ def create_hero_section():
     </div>
     """, unsafe_allow_html=True)
 
-def create_horizontal_nav(current_tab, tabs, tab_key):
+# URL slug -> page; a page's tab buttons are keyed "<slug>_<tab>"
+PAGE_SLUGS = {
+    "home": "Command Center",
+    "analytics": "Call Analytics",
+    "neural": "Neural Control",
+    "perf": "Perf"
+}
+
+# Page -> session key of its horizontal tab selection
+PAGE_TAB_KEYS = {
+    "Command Center": "home_tab",
+    "Call Analytics": "analytics_tab",
+    "Neural Control": "neural_tab"
+}
+
+# Page -> horizontal tabs in display order (slug -> label)
+PAGE_TABS = {
+    "Command Center": {
+        "overview": "🏠 OVERVIEW",
+        "services": "⚙️ SERVICES",
+        "stats": "📊 STATISTICS",
+        "status": "💻 STATUS"
+    },
+    "Call Analytics": {
+        "dashboard": "📊 DASHBOARD",
+        "realtime": "⚡ REAL-TIME",
+        "reports": "📈 REPORTS",
+        "trends": "📉 TRENDS",
+        "staffing": "👥 STAFFING"
+    },
+    "Neural Control": {
+        "config": "⚙️ CONFIG",
+        "training": "🚀 TRAINING",
+        "monitoring": "🧠 MONITORING",
+        "models": "🤖 MODELS"
+    }
+}
+
+def sync_url():
+    """Mirror the current page and tab in ?page=&tab=, touching only changed params"""
+    page = st.session_state.current_page
+    route = {"page": next(slug for slug, name in PAGE_SLUGS.items() if name == page)}
+    tab_key = PAGE_TAB_KEYS.get(page)
+    if tab_key:
+        route["tab"] = st.session_state[tab_key]
+    elif "tab" in st.query_params:
+        del st.query_params["tab"]
+    for name, value in route.items():
+        if st.query_params.get(name) != value:
+            st.query_params[name] = value
+
+def navigate(page, tab=None):
+    """on_click callback: switch page and tab before the rerun starts"""
+    st.session_state.current_page = page
+    if page in PAGE_TABS:
+        # Without an explicit tab, reopen the page's last tab or its first one
+        if tab is None:
+            tab = st.session_state.get(PAGE_TAB_KEYS[page])
+        if tab not in PAGE_TABS[page]:
+            tab = next(iter(PAGE_TABS[page]))
+        st.session_state[PAGE_TAB_KEYS[page]] = tab
+    sync_url()
+
+def route_from_url():
+    """Apply ?page=&tab= to the session so deep links and back/forward land in one run"""
+    page = PAGE_SLUGS.get(st.query_params.get("page"))
+    if page == "Perf":
+        st.session_state.perf_enabled = True
+    if page is not None:
+        st.session_state.current_page = page
+    elif 'current_page' not in st.session_state:
+        st.session_state.current_page = "Command Center"
+    
+    page = st.session_state.current_page
+    if page in PAGE_TABS:
+        tabs = PAGE_TABS[page]
+        tab = st.query_params.get("tab")
+        if tab in tabs:
+            st.session_state[PAGE_TAB_KEYS[page]] = tab
+        elif st.session_state.get(PAGE_TAB_KEYS[page]) not in tabs:
+            st.session_state[PAGE_TAB_KEYS[page]] = next(iter(tabs))
+    sync_url()
+
+def create_horizontal_nav(tabs, tab_key):
     """Create horizontal navigation menu for pages"""
     st.markdown(f"""
     <div class="horizontal-nav">
@@ -725,17 +346,14 @@ def create_horizontal_nav(current_tab, tabs, tab_key):
         <div style="display: flex; justify-content: center; flex-wrap: wrap; gap: 10px; position: relative; z-index: 1;">
     """, unsafe_allow_html=True)
     
-    # Create navigation buttons
+    # Tab buttons switch through a callback, so the click's own rerun renders the tab
     cols = st.columns(len(tabs))
     for i, (tab_name, tab_display) in enumerate(tabs.items()):
         with cols[i]:
-            active_class = "active" if current_tab == tab_name else ""
-            if st.button(tab_display, key=f"{tab_key}_{tab_name}", 
-                        help=f"Navigate to {tab_display}"):
-                return tab_name
+            st.button(tab_display, key=f"{tab_key}_{tab_name}", help=f"Navigate to {tab_display}",
+                      on_click=navigate, args=(PAGE_SLUGS[tab_key], tab_name))
     
     st.markdown("</div></div>", unsafe_allow_html=True)
-    return current_tab
 
 def create_services_section():
     """Create services showcase"""
@@ -853,26 +471,11 @@ def create_stats_section():
 
 # Page functions
 def home_page():
-    # Matrix rain effect
-    matrix_rain_effect()
-    
     # Hero section
     create_hero_section()
     
     # Horizontal navigation for home page sections
-    if 'home_tab' not in st.session_state:
-        st.session_state.home_tab = "overview"
-    
-    home_tabs = {
-        "overview": "🏠 OVERVIEW",
-        "services": "⚙️ SERVICES", 
-        "stats": "📊 STATISTICS",
-        "status": "💻 STATUS"
-    }
-    
-    st.session_state.home_tab = create_horizontal_nav(
-        st.session_state.home_tab, home_tabs, "home"
-    )
+    create_horizontal_nav(PAGE_TABS["Command Center"], "home")
     
     # Display content based on selected tab
     if st.session_state.home_tab == "overview":
@@ -943,7 +546,155 @@ def home_page():
             </div>
             """, unsafe_allow_html=True)
 
+@st.cache_resource
+def get_call_store():
+    """Open the process-wide call event store, seeding demo traffic on first use"""
+    store = CallStore()
+    seed_demo_calls(store)
+    return store
+
+@st.cache_resource
+def get_call_bus():
+    """Process-wide call event bus; published batches are appended to the store every few seconds"""
+    store = get_call_store()
+    bus = CallEventBus()
+    bus.subscribe(AppendBuffer(store).start().append)
+    if os.environ.get("CALL_DEMO_FEED", "1") != "0":
+        # The feed continues the stored history from the same generator, from just after its last call
+        generator = CallGenerator()
+        latest = store.latest_start()
+        DemoCallFeed(bus, generator, store.agent_codes(generator.agent_names),
+                     start=None if latest is None else latest + 1).start()
+    return bus
+
+@st.cache_resource
+def get_call_counter():
+    """Process-wide sliding-window category counts, seeded from the last hour and fed by the bus"""
+    store = get_call_store()
+    counter = SlidingCategoryCounter(len(store.categories))
+    now = store.latest_start()
+    if now is not None:
+        recent = store.window(now - counter.span, now + 1, ['start', 'category'])
+        counter.add(recent['start'], recent['category'])
+    # Calls published after the last stored one may still be buffered; the bus replays them
+    get_call_bus().subscribe(lambda batch: counter.add(batch['start'], batch['category']),
+                             after=-np.inf if now is None else now + 1)
+    return counter
+
+@st.cache_resource
+def get_live_agents():
+    """Process-wide agent scores over the last hour, seeded from the store and fed by the bus"""
+    return LiveAgentScores(get_call_store(), get_call_bus())
+
+@st.cache_resource
+def get_call_pyramid():
+    """Process-wide multi-resolution call series, caught up with the store on every query"""
+    return CallSeriesPyramid(get_call_store())
+
+@st.cache_resource
+def get_anomaly_monitor():
+    """Process-wide hourly anomaly detector over all calls, categories and agents, warmed up in the background"""
+    return CallAnomalyMonitor(get_call_store()).start()
+
+@st.cache_resource
+def get_forecast_engine():
+    """Process-wide per-category volume forecasts, refitted once per closed day"""
+    return ForecastEngine(get_data_layer().rollups)
+
+@st.cache_resource
+def get_staffing_planner():
+    """Process-wide arrival and handle time profiles for Erlang C staffing"""
+    return StaffingPlanner(get_call_store())
+
+@st.cache_resource
+def get_export_pruner():
+    """Process-wide thread deleting expired export files"""
+    from call_export import ExportPruner
+    return ExportPruner().start()
+
+@st.cache_resource
+def get_data_layer():
+    """Process-wide cached access to call aggregates, shared by every session"""
+    from data_layer import CallDataLayer
+    store = get_call_store()
+    return CallDataLayer(store, CallRollups(store))
+
+def realtime_panels():
+    """Live Call Distribution and Agent Performance, advanced by new call events only"""
+    live_agents = get_live_agents()
+    sequence = get_call_bus().sequence
+    arrived = sequence - st.session_state.get('live_sequence', sequence)
+    st.session_state.live_sequence = sequence
+    
+    # Real-time call monitoring
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("#### Live Call Distribution")
+        window = st.radio("Window", [1, 5, 15, 60], index=3, horizontal=True, key="live_window",
+                          format_func=lambda minutes: f"{minutes} min")
+        counts = get_call_counter().counts(window * 60)
+        fig = cached_figure("pie_figure", counts, tuple(get_data_layer().categories()),
+                            f"Call Categories, Last {window} min ({counts.sum():,} calls)")
+        plotly_chart(fig, width="stretch", key="live_distribution")
+    
+    with col2:
+        st.markdown("#### Agent Performance")
+        agent_names = get_data_layer().agents()
+        best, performance = live_agents.top_agents(10)
+        agents = [agent_names[i] for i in best]
+        
+        fig = cached_figure("bar_figure", tuple(agents), np.round(performance, 1), "Top 10 Agent Performance",
+                            accent='#00ffff', colorscale='Greens', tickangle=-45)
+        plotly_chart(fig, width="stretch", key="live_agents")
+    
+    st.caption(f"{arrived} new call batches since the last refresh · event sequence {sequence}")
+    
+    agent_leaderboard(live_agents)
+
+def agent_leaderboard(live_agents):
+    """One page of the live agent ranking; only the visible rows are ranked and sent"""
+    import pandas as pd
+    st.markdown("#### Agent Leaderboard")
+    data = get_data_layer()
+    categories = data.categories()
+    col1, col2, col3 = st.columns([3, 1, 1])
+    with col1:
+        skills = st.multiselect("Skill / Category", categories, key="board_categories",
+                                help="Rank agents on calls in these categories only")
+    with col2:
+        min_calls = st.number_input("Min Calls", 1, 1000, 1, key="board_min_calls")
+    with col3:
+        page_size = st.selectbox("Rows", [10, 25, 50, 100], key="board_rows")
+    
+    selected = [categories.index(name) for name in skills]
+    ranked = live_agents.ranked(selected, min_calls)
+    pages = max(1, -(-ranked // page_size))
+    # Filters can shrink the ranking under the page being shown
+    if st.session_state.get('board_page', 1) > pages:
+        st.session_state.board_page = pages
+    page = st.number_input(f"Page (of {pages})", 1, pages, key="board_page")
+    
+    codes, score, calls, _ = live_agents.page(page_size, (page - 1) * page_size, selected, min_calls)
+    agent_names = data.agents()
+    st.dataframe(pd.DataFrame({
+        'Rank': np.arange(len(codes)) + (page - 1) * page_size + 1,
+        'Agent': [agent_names[i] for i in codes],
+        'Score': np.round(score, 1),
+        'Calls': calls
+    }), width="stretch", hide_index=True)
+    st.caption(f"{ranked:,} agents ranked over the last hour")
+
+# Per-call means the trends tab can chart beside volume: pyramid series, title, axis unit
+TREND_METRICS = {
+    "Satisfaction": ('satisfaction', "Customer Satisfaction Score", None),
+    "Response Time": ('response_time', "Average Response Time", "seconds")
+}
+
 def call_analytics_page():
+    import pandas as pd
+    data = get_data_layer()
+    
     st.markdown("""
     <div class="hero-section" style="margin-bottom: 40px;">
         <h1 style="color: #39ff14; font-size: 2.5rem;">CALL ANALYTICS</h1>
@@ -952,30 +703,23 @@ def call_analytics_page():
     """, unsafe_allow_html=True)
     
     # Horizontal navigation for analytics
-    if 'analytics_tab' not in st.session_state:
-        st.session_state.analytics_tab = "dashboard"
-    
-    analytics_tabs = {
-        "dashboard": "📊 DASHBOARD",
-        "realtime": "⚡ REAL-TIME",
-        "reports": "📈 REPORTS",
-        "trends": "📉 TRENDS"
-    }
-    
-    st.session_state.analytics_tab = create_horizontal_nav(
-        st.session_state.analytics_tab, analytics_tabs, "analytics"
-    )
+    create_horizontal_nav(PAGE_TABS["Call Analytics"], "analytics")
     
     if st.session_state.analytics_tab == "dashboard":
         # Real-time metrics dashboard
+        metrics = data.dashboard_metrics()
+        
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("Active Calls", "1,247", "↑ 23")
+            st.metric("Active Calls", f"{metrics['active_now']:,}",
+                      f"{metrics['active_now'] - metrics['active_before']:+,}")
         with col2:
-            st.metric("Avg Response", "0.3s", "↓ 0.1s")
+            st.metric("Avg Response", f"{metrics['response_now']:.2f}s",
+                      f"{metrics['response_now'] - metrics['response_before']:+.2f}s",
+                      delta_color="inverse")
         with col3:
-            st.metric("Satisfaction", "96.8%", "↑ 1.2%")
+            st.metric("Satisfaction", f"{metrics['satisfaction']:.1f}%")
         with col4:
             st.metric("Resolution", "94.5%", "↑ 2.1%")
         
@@ -986,10 +730,7 @@ def call_analytics_page():
         
         with col1:
             st.markdown("### Call Volume Trends")
-            chart_data = pd.DataFrame({
-                'hour': range(24),
-                'calls': [300 + 200 * np.sin(h/24 * 2 * np.pi) + np.random.randint(-50, 50) for h in range(24)]
-            })
+            chart_data = data.hourly_volume(24)
             st.line_chart(chart_data.set_index('hour'))
         
         with col2:
@@ -1007,44 +748,15 @@ def call_analytics_page():
         </div>
         """, unsafe_allow_html=True)
         
-        # Real-time call monitoring
-        col1, col2 = st.columns(2)
-        
+        # Live mode refreshes only the panels below, from events published since the last tick
+        col1, col2 = st.columns([1, 3])
         with col1:
-            st.markdown("#### Live Call Distribution")
-            categories = ['Technical', 'Billing', 'Sales', 'Support', 'General']
-            values = [random.randint(10, 50) for _ in categories]
-            
-            fig = px.pie(values=values, names=categories, 
-                        title="Current Call Categories",
-                        color_discrete_sequence=['#00ff41', '#00ffff', '#9d4edd', '#39ff14', '#008f11'])
-            
-            fig.update_layout(
-                plot_bgcolor='rgba(0,0,0,0.9)',
-                paper_bgcolor='rgba(0,0,0,0.9)',
-                font_color='#00ff41',
-                title_font_color='#39ff14'
-            )
-            st.plotly_chart(fig, use_container_width=True)
-        
+            live = st.toggle("LIVE MODE", key="live_mode")
         with col2:
-            st.markdown("#### Agent Performance")
-            agents = [f"Agent-{i:03d}" for i in range(1, 11)]
-            performance = [random.randint(80, 100) for _ in agents]
-            
-            fig = px.bar(x=agents, y=performance,
-                        title="Top 10 Agent Performance",
-                        color=performance,
-                        color_continuous_scale='Greens')
-            
-            fig.update_layout(
-                plot_bgcolor='rgba(0,0,0,0.9)',
-                paper_bgcolor='rgba(0,0,0,0.9)',
-                font_color='#00ff41',
-                title_font_color='#00ffff',
-                xaxis_tickangle=-45
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            interval = st.select_slider("Refresh Interval (s)", options=[1, 2, 5, 10], value=2,
+                                        key="live_interval", disabled=not live)
+        
+        st.fragment(realtime_panels, run_every=interval if live else None)()
     
     elif st.session_state.analytics_tab == "reports":
         st.markdown("""
@@ -1053,30 +765,39 @@ def call_analytics_page():
         </div>
         """, unsafe_allow_html=True)
         
+        report_requests = {
+            "daily_report": ("hourly", 24, "Daily report: hourly totals for the current day"),
+            "weekly_report": ("daily", 7, "Weekly summary: daily totals for the last 7 days"),
+            "monthly_report": ("monthly", 12, "Monthly analysis: monthly totals for the last year")
+        }
+        
         col1, col2, col3 = st.columns(3)
         
         with col1:
             if st.button("📊 DAILY REPORT", key="daily_report"):
-                st.success("Generating daily analytics report...")
+                st.session_state.report_request = "daily_report"
         
         with col2:
             if st.button("📈 WEEKLY SUMMARY", key="weekly_report"):
-                st.success("Compiling weekly performance summary...")
+                st.session_state.report_request = "weekly_report"
         
         with col3:
             if st.button("📉 MONTHLY ANALYSIS", key="monthly_report"):
-                st.success("Processing monthly trend analysis...")
+                st.session_state.report_request = "monthly_report"
+        
+        if st.session_state.get('report_request') in report_requests:
+            resolution, buckets, title = report_requests[st.session_state.report_request]
+            started = time.perf_counter()
+            report = data.report(resolution, buckets)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            st.success(f"{title} ({len(report)} rows in {elapsed_ms:.1f} ms)")
+            st.dataframe(report, width="stretch")
         
-        # Sample report data
+        # Recent daily report data
         st.markdown("#### Recent Performance Metrics")
-        report_data = pd.DataFrame({
-            'Date': pd.date_range('2024-01-01', periods=30, freq='D'),
-            'Calls_Handled': np.random.randint(800, 1500, 30),
-            'Avg_Response_Time': np.random.uniform(0.2, 0.8, 30),
-            'Satisfaction_Score': np.random.uniform(85, 98, 30)
-        })
+        report_data = data.report("daily", 30)
         
-        st.dataframe(report_data.tail(10), use_container_width=True)
+        st.dataframe(report_data.tail(10), width="stretch")
     
     elif st.session_state.analytics_tab == "trends":
         st.markdown("""
@@ -1085,44 +806,139 @@ def call_analytics_page():
         </div>
         """, unsafe_allow_html=True)
         
-        # Generate trend data
-        dates = pd.date_range('2024-01-01', periods=90, freq='D')
-        trend_data = pd.DataFrame({
-            'Date': dates,
-            'Call_Volume': 1000 + 200 * np.sin(np.arange(90) * 2 * np.pi / 7) + np.random.normal(0, 50, 90),
-            'Response_Time': 0.5 + 0.2 * np.sin(np.arange(90) * 2 * np.pi / 30) + np.random.normal(0, 0.05, 90),
-            'Satisfaction': 90 + 5 * np.sin(np.arange(90) * 2 * np.pi / 14) + np.random.normal(0, 2, 90)
-        })
+        # Any range of the store, at the finest resolution the chart width can show
+        pyramid = get_call_pyramid()
+        extent = pyramid.extent()
+        if extent is None:
+            st.info("No calls recorded yet")
+            return
+        first, last = (datetime.fromtimestamp(t) for t in extent)
+        col1, col2 = st.columns([4, 1])
+        with col1:
+            start, end = st.slider("Range", min_value=first, max_value=last,
+                                   value=(max(first, last - timedelta(days=90)), last),
+                                   step=timedelta(hours=1), format="YYYY-MM-DD HH:mm", key="trend_range")
+        with col2:
+            width = st.selectbox("Chart Width (px)", [600, 1200, 2400], key="trend_width")
+        t0, t1 = int(start.timestamp()), int(end.timestamp())
         
         col1, col2 = st.columns(2)
+        with col2:
+            metric = st.radio("Metric", list(TREND_METRICS), horizontal=True, key="trend_metric",
+                              label_visibility="collapsed")
+        size, series = pyramid.series(t0, t1, max_points=width, metrics=('volume', TREND_METRICS[metric][0]))
+        volume, means = series['volume'], series[TREND_METRICS[metric][0]]
+        monitor = get_anomaly_monitor()
         
         with col1:
-            st.markdown("#### Call Volume Trends (90 Days)")
-            fig = px.line(trend_data, x='Date', y='Call_Volume',
-                         title="Daily Call Volume")
-            fig.update_traces(line_color='#00ff41')
-            fig.update_layout(
-                plot_bgcolor='rgba(0,0,0,0.9)',
-                paper_bgcolor='rgba(0,0,0,0.9)',
-                font_color='#00ff41',
-                title_font_color='#39ff14'
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            st.markdown("#### Call Volume Trends")
+            # Flags are on hourly totals; the chart is in calls per minute
+            mark_times, mark_values = monitor.marks('volume', t0, t1)
+            fig = cached_figure("band_figure", volume['t'], volume['value'], volume['band_t'], volume['low'],
+                                volume['high'], "Call Volume", '#00ff41', y_title="calls / min",
+                                mark_times=mark_times, mark_values=mark_values / 60)
+            plotly_chart(fig, width="stretch")
         
         with col2:
-            st.markdown("#### Satisfaction Trends")
-            fig = px.line(trend_data, x='Date', y='Satisfaction',
-                         title="Customer Satisfaction Score")
-            fig.update_traces(line_color='#00ffff')
-            fig.update_layout(
-                plot_bgcolor='rgba(0,0,0,0.9)',
-                paper_bgcolor='rgba(0,0,0,0.9)',
-                font_color='#00ff41',
-                title_font_color='#00ffff'
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            name, title, unit = TREND_METRICS[metric]
+            mark_times, mark_values = monitor.marks(name, t0, t1) if name in ANOMALY_METRICS else (None, None)
+            fig = cached_figure("band_figure", means['t'], means['value'], means['band_t'], means['low'],
+                                means['high'], title, '#00ffff', accent='#00ffff', y_title=unit,
+                                mark_times=mark_times, mark_values=mark_values)
+            plotly_chart(fig, width="stretch")
+        
+        st.caption(f"{LEVEL_NAMES[size]} buckets · {len(volume['t']):,} of at most {width:,} points per line, "
+                   f"min/max band shaded, ✕ hourly anomalies")
+        
+        # Forecasts read fits cached per closed day of data, so viewers never refit
+        st.markdown("#### Call Volume Forecast")
+        categories = data.categories()
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            category = st.selectbox("Category", categories, key="forecast_category")
+        with col2:
+            days = st.slider("Horizon (days)", 1, MAX_HORIZON_DAYS, 7, key="forecast_days")
+        with col3:
+            interval = st.radio("Interval", list(FORECAST_INTERVALS), horizontal=True, key="forecast_interval",
+                                format_func=str.title)
+        forecast = get_forecast_engine().forecast(interval, categories.index(category), days)
+        if forecast is None:
+            st.info("Not enough history to forecast yet")
+        else:
+            fig = cached_figure("forecast_figure", forecast['history_t'], forecast['history'], forecast['t'],
+                                forecast['value'], forecast['low'], forecast['high'],
+                                f"{category} Calls, Next {days} Days", '#00ff41', accent='#9d4edd')
+            plotly_chart(fig, width="stretch")
+            params = forecast['params']
+            fitted = datetime.fromtimestamp(forecast['fitted_through']).strftime("%Y-%m-%d")
+            st.caption(f"Holt-Winters on log volume · α {params['alpha']:.3f} β {params['beta']:.3f} "
+                       f"γ {params['gamma']:.2f} · fitted on calls before {fitted} in "
+                       f"{forecast['fit_seconds']:.2f}s on {forecast['workers']} worker(s) · 95% band")
+
+    elif st.session_state.analytics_tab == "staffing":
+        st.markdown("""
+        <div class="matrix-container">
+            <h3 style="color: #00ffff;">STAFFING PLANNER</h3>
+        </div>
+        """, unsafe_allow_html=True)
+    
+        # What-if changes scale the measured weekly profile; every rerun solves the whole grid
+        planner = get_staffing_planner()
+        profile = planner.profile()
+        if profile is None:
+            st.info("No calls recorded yet")
+            return
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            rate_change = st.slider("Arrival Rate (%)", -50, 100, 0, step=5, key="staffing_rate", format="%+d%%")
+        with col2:
+            handle_change = st.slider("Handle Time (%)", -50, 100, 0, step=5, key="staffing_handle",
+                                      format="%+d%%")
+        with col3:
+            target = st.slider("Service Level (%)", 50, 95, round(SERVICE_LEVEL * 100), step=5,
+                               key="staffing_target")
+        with col4:
+            answer_within = st.select_slider("Answer Within (s)", [10, 15, 20, 30, 45, 60], ANSWER_WITHIN,
+                                             key="staffing_within")
+    
+        # A ±20% grid around the what-if shows how sensitive the staffing is to each input
+        sweep = np.array([-0.2, -0.1, 0.0, 0.1, 0.2])
+        rate_scales = (1 + rate_change / 100) * (1 + sweep)
+        handle_scales = (1 + handle_change / 100) * (1 + sweep)
+        started = time.perf_counter()
+        plan = planner.plan(7, rate_scales, handle_scales, target / 100, answer_within)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        baseline = planner.plan(7, target=target / 100, answer_within=answer_within)['agents'][0, 0]
+        agents = plan['agents'][2, 2]
+    
+        load = plan['calls'] * rate_scales[2] * plan['handle_time'] * handle_scales[2] / 900
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Peak Agents", f"{agents.max():,}", f"{agents.max() - baseline.max():+,}",
+                      delta_color="inverse")
+        with col2:
+            st.metric("Agent Hours / Week", f"{agents.sum() / 4:,.0f}",
+                      f"{(agents.sum() - baseline.sum()) / 4:+,.0f}", delta_color="inverse")
+        with col3:
+            st.metric("Occupancy", f"{load.sum() / max(agents.sum(), 1):.0%}")
+    
+        fig = cached_figure("staffing_figure", plan['t'], agents, baseline, "Agents Needed, Next 7 Days",
+                            '#00ff41', accent='#00ffff')
+        plotly_chart(fig, width="stretch")
+    
+        st.markdown("#### Peak Agents by Arrival Rate and Handle Time")
+        handle_time = profile['mean_handle_time']
+        st.dataframe(pd.DataFrame(
+            plan['agents'].max(axis=2),
+            index=[f"{scale - 1:+.0%} arrivals" for scale in rate_scales],
+            columns=[f"{handle_time * scale:.0f}s handle" for scale in handle_scales]
+        ), width="stretch")
+        st.caption(f"Erlang C on the mean of the last {planner.weeks} weeks per 15 minutes · "
+                   f"measured handle time {handle_time:.0f}s · {plan['agents'].size:,} interval × scenario "
+                   f"cells solved in {elapsed_ms:.0f} ms")
 
 def ai_neural_control_page():
+    import pandas as pd
     st.markdown("""
     <div class="hero-section" style="margin-bottom: 40px;">
         <h1 style="color: #9d4edd; font-size: 2.5rem;">NEURAL CONTROL CENTER</h1>
@@ -1131,19 +947,7 @@ def ai_neural_control_page():
     """, unsafe_allow_html=True)
     
     # Horizontal navigation for neural control
-    if 'neural_tab' not in st.session_state:
-        st.session_state.neural_tab = "config"
-    
-    neural_tabs = {
-        "config": "⚙️ CONFIG",
-        "training": "🚀 TRAINING",
-        "monitoring": "🧠 MONITORING",
-        "models": "🤖 MODELS"
-    }
-    
-    st.session_state.neural_tab = create_horizontal_nav(
-        st.session_state.neural_tab, neural_tabs, "neural"
-    )
+    create_horizontal_nav(PAGE_TABS["Neural Control"], "neural")
     
     if st.session_state.neural_tab == "config":
         # AI Agent configuration
@@ -1157,11 +961,18 @@ def ai_neural_control_page():
         
         with col1:
             st.markdown("#### Neural Network Settings")
-            layers = st.slider("Hidden Layers", 5, 20, 12, key="layers")
-            neurons = st.slider("Neurons per Layer", 64, 512, 256, key="neurons")
+            config = network_settings()
+            layers = st.slider("Hidden Layers", 5, 20, config['layers'], key="layers")
+            neurons = st.slider("Neurons per Layer", 64, 512, config['neurons'], key="neurons")
             learning_rate = st.select_slider("Learning Rate", 
                                            options=[0.0001, 0.001, 0.01, 0.1],
-                                           value=0.001, key="lr")
+                                           value=config['learning_rate'], key="lr")
+            # Widget state is dropped when the tab changes; keep what training needs
+            st.session_state.network_settings = {
+                'layers': layers,
+                'neurons': neurons,
+                'learning_rate': learning_rate
+            }
         
         with col2:
             st.markdown("#### Response Parameters")
@@ -1187,37 +998,75 @@ def ai_neural_control_page():
         col1, col2 = st.columns(2)
         
         with col1:
-            training_data = st.selectbox("Training Dataset", 
-                                       ["Customer Service Calls", "Technical Support", "Sales Inquiries", "Custom Dataset"],
-                                       key="training_data")
+            training_data = st.selectbox("Training Dataset", DATASETS, key="training_data")
             
             epochs = st.number_input("Training Epochs", 1, 1000, 100, key="epochs")
             batch_size = st.selectbox("Batch Size", [16, 32, 64, 128, 256], index=2, key="batch")
+            config = network_settings()
+            st.caption(f"Architecture from CONFIG: {config['layers']} hidden layers × "
+                       f"{config['neurons']} neurons, learning rate {config['learning_rate']}")
         
         with col2:
             st.markdown("#### Current Model Performance")
-            st.metric("Accuracy", "94.7%", "↑ 2.3%")
-            st.metric("Loss", "0.0234", "↓ 0.0045")
-            st.metric("F1 Score", "0.923", "↑ 0.015")
+            latest = latest_training_metrics(get_job_manager())
+            if latest:
+                st.metric("Accuracy", f"{latest['accuracy']:.1%}")
+                st.metric("Loss", f"{latest['loss']:.4f}")
+                st.metric("F1 Score", f"{latest['f1']:.3f}")
+            else:
+                st.info("No completed training run yet")
+        
+        # Training controls act on the background job; the page never blocks on it
+        manager = get_job_manager()
+        job = current_training_job(manager)
+        active = job is not None and job.status in ACTIVE_STATES
         
-        # Training controls
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            if st.button("🚀 START TRAINING", key="start_train"):
-                start_neural_training(epochs, batch_size)
+            if st.button("🚀 START TRAINING", key="start_train", disabled=active):
+                try:
+                    job_id = manager.submit(partial(run_neural_training, get_call_store()),
+                                            name=training_data, dataset=training_data,
+                                            epochs=int(epochs), batch_size=batch_size,
+                                            layers=config['layers'], neurons=config['neurons'],
+                                            learning_rate=config['learning_rate'])
+                    st.session_state.training_job = job_id
+                    st.query_params["job"] = job_id
+                    st.rerun()
+                except JobLimitError as exc:
+                    st.error(str(exc))
         
         with col2:
-            if st.button("⏸️ PAUSE TRAINING", key="pause_train"):
-                st.warning("Training paused - Model state saved")
+            paused = job is not None and job.status == PAUSED
+            if st.button("▶️ RESUME TRAINING" if paused else "⏸️ PAUSE TRAINING", key="pause_train",
+                         disabled=not active):
+                if paused:
+                    manager.resume(job.id)
+                else:
+                    manager.pause(job.id)
+                st.rerun()
         
         with col3:
-            if st.button("🔄 RESET MODEL", key="reset_model"):
+            if st.button("🔄 RESET MODEL", key="reset_model", disabled=job is None):
+                manager.cancel(job.id)
+                st.session_state.pop('training_job', None)
+                st.query_params.pop("job", None)
                 st.error("Model reset - All progress cleared")
         
         with col4:
-            if st.button("💾 SAVE MODEL", key="save_model"):
-                st.success("Model saved successfully!")
+            if st.button("💾 SAVE MODEL", key="save_model",
+                         disabled=job is None or job.status != COMPLETED or job.result is None):
+                registry = get_model_registry()
+                model_id = registry.register_model(f"Neural-{job.name}", job.result, job.metrics,
+                                                   dataset=job.name)
+                manager.release(job.id)
+                record = registry.get(model_id)
+                st.success(f"Model saved to registry as {record['name']} v{record['version']}")
+        
+        job = current_training_job(manager)
+        if job is not None:
+            st.fragment(training_job_panel, run_every=1 if job.status in ACTIVE_STATES else None)(job.id)
     
     elif st.session_state.neural_tab == "monitoring":
         st.markdown("""
@@ -1228,7 +1077,8 @@ def ai_neural_control_page():
         
         # Live neural network visualization
         if st.button("🧠 VISUALIZE NEURAL NETWORK", key="viz_neural"):
-            visualize_neural_network(12, 256)
+            config = network_settings()
+            visualize_neural_network(config['layers'], config['neurons'])
         
         col1, col2, col3 = st.columns(3)
         
@@ -1243,9 +1093,14 @@ def ai_neural_control_page():
             """, unsafe_allow_html=True)
         
         with col2:
-            st.markdown("""
+            active_id, _ = get_model_registry().active()
+            primary = "NONE DEPLOYED"
+            if active_id is not None:
+                record = get_model_registry().get(active_id)
+                primary = f"{record['name']} v{record['version']}"
+            st.markdown(f"""
             <div class="terminal">
-            <div style="color: #39ff14;">[MODEL] Primary: ACTIVE</div>
+            <div style="color: #39ff14;">[MODEL] Primary: {primary}</div>
             <div style="color: #00ffff;">[BACKUP] Secondary: STANDBY</div>
             <div style="color: #9d4edd;">[SYNC] Models synchronized</div>
             <div style="color: #39ff14;">[UPDATE] Ready for deployment</div>
@@ -1269,80 +1124,198 @@ def ai_neural_control_page():
         </div>
         """, unsafe_allow_html=True)
         
-        # Model comparison table
-        model_data = pd.DataFrame({
-            'Model': ['GPT-Neo-Customer', 'BERT-Support', 'T5-Sales', 'Custom-Neural'],
-            'Version': ['v2.1', 'v1.8', 'v3.0', 'v4.2'],
-            'Accuracy': ['94.7%', '92.1%', '96.3%', '95.8%'],
-            'Status': ['ACTIVE', 'STANDBY', 'ACTIVE', 'TRAINING'],
-            'Last_Updated': ['2024-01-15', '2024-01-10', '2024-01-18', '2024-01-20']
-        })
+        # Registered versions come from SQLite; no weights are read to list them
+        registry = get_model_registry()
+        models = registry.list()
         
-        st.dataframe(model_data, use_container_width=True)
+        if models:
+            model_data = pd.DataFrame({
+                'Model': [m['name'] for m in models],
+                'Version': [f"v{m['version']}" for m in models],
+                'Accuracy': [f"{m['accuracy']:.1%}" if m['accuracy'] is not None else "—" for m in models],
+                'Parameters': [f"{m['parameters']:,}" for m in models],
+                'Status': ['ACTIVE' if m['active'] else 'STANDBY' for m in models],
+                'Last_Updated': [datetime.fromtimestamp(m['created_at']).strftime('%Y-%m-%d %H:%M') for m in models]
+            })
+            st.dataframe(model_data, width="stretch")
+            labels = {m['id']: f"{m['name']} v{m['version']}" for m in models}
+            selected = st.selectbox("Model Version", list(labels), format_func=labels.get, key="registry_model")
+        else:
+            st.info("No models registered yet - train one and press SAVE MODEL, or import weights")
+            selected = None
         
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
             if st.button("🔄 REFRESH MODELS", key="refresh_models"):
+                registry.refresh()
                 st.success("Model registry refreshed")
         
         with col2:
-            if st.button("📤 DEPLOY MODEL", key="deploy_model"):
-                st.success("Model deployment initiated")
+            if st.button("📤 DEPLOY MODEL", key="deploy_model", disabled=selected is None):
+                registry.deploy(selected)
+                st.success(f"{labels[selected]} is now the active model")
         
         with col3:
             if st.button("📥 IMPORT MODEL", key="import_model"):
-                st.info("Model import wizard opened")
+                st.session_state.show_model_import = True
         
         with col4:
             if st.button("🗑️ CLEANUP OLD", key="cleanup_models"):
-                st.warning("Old model versions cleaned up")
+                removed = registry.cleanup(keep=3)
+                st.warning(f"Removed {removed} old model versions (keeping the newest 3 of each model)")
+        
+        if st.session_state.get('show_model_import'):
+            uploaded = st.file_uploader("Model weights (.npz with W0, b0, W1, b1, ...)", type="npz",
+                                        key="model_upload")
+            import_name = st.text_input("Model Name", value="Imported-Neural", key="model_import_name")
+            if uploaded is not None and st.button("📥 REGISTER MODEL", key="register_model"):
+                try:
+                    weights, biases = arrays_from_npz(uploaded)
+                    model_id = registry.register(import_name, weights, biases)
+                    st.session_state.show_model_import = False
+                    st.success(f"Imported {import_name} v{registry.get(model_id)['version']}")
+                except (ValueError, KeyError) as exc:
+                    st.error(f"Import failed: {exc}")
 
-def start_neural_training(epochs, batch_size):
-    """Simulate neural network training"""
-    st.markdown("""
+@st.cache_resource
+def get_model_registry():
+    """Process-wide model registry; loaded weights are memory-mapped once and shared"""
+    return ModelRegistry()
+
+@st.cache_resource
+def get_job_manager():
+    """Process-wide background training workers, shared by every session"""
+    return JobManager(max_workers=2)
+
+def current_training_job(manager):
+    """This session's training job, reattaching from the URL after a reload"""
+    job_id = st.session_state.get('training_job') or st.query_params.get("job")
+    job = manager.get(job_id) if job_id else None
+    if job is not None:
+        st.session_state.training_job = job.id
+    return job
+
+def latest_trained_model(manager):
+    """Version id and model of the most recently completed training job"""
+    for job in manager.jobs():
+        if job.status == COMPLETED and isinstance(job.result, MLP):
+            return job.id, job.result
+    return None, None
+
+def latest_training_metrics(manager):
+    """Final metrics of the most recently completed training job"""
+    for job in manager.jobs():
+        if job.status == COMPLETED and job.metrics:
+            return job.metrics
+    return None
+
+def network_settings():
+    """Network settings chosen on the CONFIG tab"""
+    return st.session_state.get('network_settings', {'layers': 12, 'neurons': 256, 'learning_rate': 0.001})
+
+def run_neural_training(store, job, dataset, epochs, batch_size, layers, neurons, learning_rate):
+    """Train a NumPy MLP on the selected dataset (runs on a background worker)"""
+    features, labels, classes = load_dataset(dataset, store)
+    X_train, y_train, X_test, y_test = train_test_split(features, labels)
+    model = MLP([features.shape[1]] + [neurons] * layers + [len(classes)])
+    trainer = MLPTrainer(model, batch_size, learning_rate)
+    rng = np.random.default_rng()
+    
+    for epoch in range(epochs):
+        job.checkpoint()
+        train_loss, throughput = trainer.train_epoch(X_train, y_train, rng)
+        metrics = evaluate(model, X_test, y_test, len(classes))
+        job.report(epoch + 1, dict(metrics, train_loss=train_loss, samples_per_sec=throughput))
+    return model
+
+def training_job_panel(job_id):
+    """Progress and metrics of a background training job, polled without blocking"""
+    job = get_job_manager().get(job_id)
+    if job is None:
+        return
+    state = job.snapshot()
+    
+    st.markdown(f"""
     <div class="terminal">
-        <div style="color: #39ff14; font-weight: bold;">INITIATING NEURAL TRAINING PROTOCOL...</div>
+        <div style="color: #39ff14; font-weight: bold;">NEURAL TRAINING JOB {state['id']} · {state['status'].upper()}</div>
+        <div>Epoch {state['epoch']}/{state['total_epochs']} | Batch Size: {state['params']['batch_size']} | Dataset: {state['name']}</div>
+        <div style="color: #39ff14;">Neural pathways optimizing... {'█' * int(state['progress'] * 30)}</div>
     </div>
     """, unsafe_allow_html=True)
+    st.progress(state['progress'])
     
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-    metrics_placeholder = st.empty()
-    
-    # Training simulation
-    for epoch in range(min(epochs, 20)):  # Limit for demo
-        # Simulate training metrics
-        accuracy = 0.6 + (epoch / 20) * 0.35 + random.uniform(-0.02, 0.02)
-        loss = 1.5 * np.exp(-epoch/8) + random.uniform(-0.1, 0.1)
-        f1_score = 0.55 + (epoch / 20) * 0.38 + random.uniform(-0.02, 0.02)
-        
-        progress = (epoch + 1) / min(epochs, 20)
-        progress_bar.progress(progress)
-        
-        status_text.markdown(f"""
-        <div class="terminal">
-            <div>Epoch {epoch+1}/{min(epochs, 20)} | Batch Size: {batch_size}</div>
-            <div style="color: #00ffff;">Training Loss: {loss:.4f} | Accuracy: {accuracy:.3f}</div>
-            <div style="color: #39ff14;">Neural pathways optimizing... {'█' * int(progress * 30)}</div>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Update metrics
-        col1, col2, col3 = metrics_placeholder.columns(3)
+    if len(state['history']) > 0:
+        current = state['history'][-1]
+        previous = state['history'][-2] if len(state['history']) > 1 else current
+        col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.metric("Accuracy", f"{accuracy:.1%}", f"{random.uniform(0.5, 2.0):.1f}%")
+            st.metric("Accuracy", f"{current['accuracy']:.1%}",
+                      f"{(current['accuracy'] - previous['accuracy']) * 100:+.1f}%")
         with col2:
-            st.metric("Loss", f"{loss:.4f}", f"{random.uniform(-0.05, -0.01):.4f}")
+            st.metric("Loss", f"{current['loss']:.4f}", f"{current['loss'] - previous['loss']:+.4f}",
+                      delta_color="inverse")
         with col3:
-            st.metric("F1 Score", f"{f1_score:.3f}", f"{random.uniform(0.005, 0.02):.3f}")
-        
-        time.sleep(0.3)
-    
-    st.success("NEURAL TRAINING COMPLETE! Model performance optimized.")
-    st.balloons()
+            st.metric("F1 Score", f"{current['f1']:.3f}", f"{current['f1'] - previous['f1']:+.3f}")
+        with col4:
+            st.metric("Throughput", f"{current['samples_per_sec']:,.0f}/s")
+    
+    if state['status'] == COMPLETED:
+        st.success("NEURAL TRAINING COMPLETE! Model performance optimized.")
+    elif state['status'] == FAILED:
+        st.error(f"Training failed: {state['error']}")
+    elif state['status'] == CANCELLED:
+        st.warning("Training cancelled")
+    
+    # Stop polling once the job settles
+    if state['status'] not in ACTIVE_STATES and st.session_state.get('training_polling') == job_id:
+        st.session_state.training_polling = None
+        st.rerun()
+    if state['status'] in ACTIVE_STATES:
+        st.session_state.training_polling = job_id
 
-def visualize_neural_network(layers, neurons):
+def network_points(layer_sizes, activations, max_points):
+    """Scatter coordinates for every neuron, binned per layer once over ``max_points``"""
+    sizes = np.asarray(layer_sizes)
+    # Neurons merged into each drawn point, the same stride for every layer
+    stride = max(1, int(np.ceil(sizes.sum() / max_points)))
+    starts = [np.arange(0, size, stride) for size in sizes]
+    counts = np.array([len(s) for s in starts])
+    
+    layer = np.repeat(np.arange(len(sizes)), counts)
+    neuron = np.concatenate(starts)
+    activation = np.concatenate([np.add.reduceat(a, s) / np.diff(np.append(s, len(a)))
+                                 for a, s in zip(activations, starts)])
+    layer_type = np.where(layer == 0, "Input", np.where(layer == len(sizes) - 1, "Output", "Hidden"))
+    return layer, neuron, activation, layer_type, stride
+
+@st.cache_resource(max_entries=32)
+def build_network_figure(layer_sizes, model_version, max_points, _model=None):
+    """Activation map for one architecture and model version, shared by every session"""
+    from matrix_charts import network_figure
+    if _model is not None:
+        activations = _model.mean_activations()
+        # Rescale to the 0.1-1.0 range the untrained map uses
+        top = max(float(a.max()) for a in activations) or 1.0
+        activations = [0.1 + 0.9 * a / top for a in activations]
+    else:
+        rng = np.random.default_rng(hash(layer_sizes) % 2**32)
+        activations = [rng.uniform(0.1, 1.0, size) for size in layer_sizes]
+    
+    layer, neuron, activation, layer_type, stride = network_points(layer_sizes, activations, max_points)
+    
+    title = "AI Neural Network Activation Map"
+    if stride > 1:
+        title += f" (1 point per {stride} neurons)"
+    fig = network_figure(layer, neuron, activation, layer_type, title)
+    stats = {
+        'neurons': int(sum(layer_sizes)),
+        'points': len(layer),
+        'avg_activation': float(np.concatenate(activations).mean())
+    }
+    return fig, stats
+
+def visualize_neural_network(layers, neurons, max_points=6000):
     """Create neural network visualization"""
     st.markdown("""
     <div class="matrix-container">
@@ -1350,51 +1323,124 @@ def visualize_neural_network(layers, neurons):
     </div>
     """, unsafe_allow_html=True)
     
-    # Generate network data
-    network_data = []
-    for layer in range(layers + 2):  # +2 for input and output
-        layer_neurons = neurons if 0 < layer <= layers else max(neurons//4, 8)
-        for neuron in range(layer_neurons):
-            activation = random.uniform(0.1, 1.0)
-            network_data.append({
-                'layer': layer,
-                'neuron': neuron,
-                'activation': activation,
-                'size': activation * 15 + 5,
-                'layer_type': 'Input' if layer == 0 else 'Output' if layer == layers + 1 else 'Hidden'
-            })
-    
-    network_df = pd.DataFrame(network_data)
-    
-    # Create visualization
-    fig = px.scatter(network_df, x='layer', y='neuron',
-                    size='size', color='activation',
-                    color_continuous_scale='Viridis',
-                    title="AI Neural Network Activation Map",
-                    hover_data=['layer_type'])
-    
-    fig.update_layout(
-        plot_bgcolor='rgba(0,0,0,0.9)',
-        paper_bgcolor='rgba(0,0,0,0.9)',
-        font_color='#00ff41',
-        title_font_color='#9d4edd',
-        xaxis_title="Network Layer",
-        yaxis_title="Neuron Index"
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    # Show the deployed model's real activations, else the latest trained one
+    model_id, model = get_model_registry().active()
+    if model is not None:
+        model_version = f"registry-{model_id}"
+    else:
+        model_version, model = latest_trained_model(get_job_manager())
+    if model is not None:
+        layer_sizes = tuple(model.layer_sizes)
+    else:
+        layer_sizes = (max(neurons//4, 8),) + (neurons,) * layers + (max(neurons//4, 8),)
+        model_version = "untrained"
+    
+    fig, stats = build_network_figure(layer_sizes, model_version, max_points, _model=model)
+    plotly_chart(fig, width="stretch")
     
     # Network stats
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Total Neurons", f"{len(network_df):,}")
+        st.metric("Total Neurons", f"{stats['neurons']:,}")
     with col2:
-        st.metric("Active Layers", f"{layers + 2}")
+        st.metric("Active Layers", f"{len(layer_sizes)}")
     with col3:
-        st.metric("Avg Activation", f"{network_df['activation'].mean():.3f}")
+        st.metric("Avg Activation", f"{stats['avg_activation']:.3f}")
     with col4:
-        st.metric("Network Efficiency", f"{random.uniform(85, 98):.1f}%")
+        st.metric("Points Drawn", f"{stats['points']:,}", model_version, delta_color="off")
+
+def export_panel():
+    """Sidebar controls that stream call data or a report to CSV or Parquet files"""
+    import pandas as pd
+    from call_export import (CallExport, DATASETS as EXPORT_DATASETS, FORMATS as EXPORT_FORMATS,
+                             MAX_PART_BYTES, BUTTON_PART_BYTES, dataset_columns, export_mime, export_path,
+                             export_url, new_session_dir, read_export, session_path)
+    get_export_pruner()
+    data = get_data_layer()
+    first, last = data.store.earliest_start(), data.store.latest_start()
+    if first is None:
+        st.sidebar.info("No calls to export yet")
+        return
+    first_day = pd.Timestamp(first, unit='s').date()
+    last_day = pd.Timestamp(last, unit='s').date()
+    
+    dataset = st.sidebar.selectbox("Export Dataset", list(EXPORT_DATASETS), key="export_dataset")
+    span = st.sidebar.date_input("Date Range", value=(max(first_day, last_day - timedelta(days=6)), last_day),
+                                 min_value=first_day, max_value=last_day, key="export_range")
+    columns = st.sidebar.multiselect("Columns", dataset_columns(dataset), default=dataset_columns(dataset),
+                                     key=f"export_columns_{dataset}")
+    fmt = st.sidebar.radio("Format", list(EXPORT_FORMATS), horizontal=True, key="export_format")
+    
+    # Served from disk by the static route; st.download_button would hold each file in memory
+    static = st.get_option("server.enableStaticServing")
+    if 'export_dir' not in st.session_state:
+        st.session_state.export_dir = new_session_dir()
+    session_dir = st.session_state.export_dir
+    
+    ready = len(span) == 2 and len(columns) > 0
+    if st.sidebar.button("▶️ RUN EXPORT", key="run_export", disabled=not ready):
+        t0 = int(pd.Timestamp(span[0]).timestamp())
+        t1 = int(pd.Timestamp(span[1] + timedelta(days=1)).timestamp())
+        export = CallExport(data, dataset, fmt, t0, t1, columns,
+                            directory=session_path(session_dir),
+                            max_part_bytes=MAX_PART_BYTES if static else BUTTON_PART_BYTES)
+        progress = st.sidebar.progress(0.0, text="Starting export...")
+        started = time.perf_counter()
+        for written, total in export.run():
+            progress.progress(written / max(total, 1), text=f"{written:,} / {total:,} rows")
+        st.session_state.export_files = export.files
+        st.sidebar.success(f"📊 Exported {written:,} rows in {time.perf_counter() - started:.1f}s")
+    
+    for name in st.session_state.get('export_files', []):
+        if not os.path.exists(export_path(session_dir, name)):
+            continue
+        if static:
+            st.sidebar.markdown(f'<a class="export-link" href="{export_url(session_dir, name)}" '
+                                f'download="{name}">⬇️ {name}</a>', unsafe_allow_html=True)
+        else:
+            st.sidebar.download_button(f"⬇️ {name}", data=partial(read_export, session_dir, name),
+                                       file_name=name, mime=export_mime(name), on_click="ignore",
+                                       key=f"download_{name}", width="stretch")
+
+def anomaly_text(event):
+    """One line for a flagged hour, such as 05-14 09:00 Billing call volume ↑ 412 (exp. 190)"""
+    hour = datetime.fromtimestamp(event['t']).strftime("%m-%d %H:00")
+    digits = 0 if event['metric'] == 'volume' else 2
+    arrow = "↑" if event['z'] > 0 else "↓"
+    return (f"{hour} {event['series']} {ANOMALY_LABELS[event['metric']]} {arrow} "
+            f"{event['value']:,.{digits}f} (exp. {event['expected']:,.{digits}f})")
+
+def sidebar_status():
+    """Live metrics in columns; a fragment, so they refresh without the rest of the app"""
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Calls", "1.2K", "↑ 150", delta_color="normal")
+        st.metric("Load", "67%", "↓ 5%", delta_color="inverse")
+    with col2:
+        # Agents the last closed 15 minutes needed to answer 80% of calls within 20s
+        staffing = get_staffing_planner().current()
+        if staffing is None:
+            st.metric("Agents", "—")
+        else:
+            needed, before = staffing['agents'][1], staffing['agents'][0]
+            st.metric("Agents", f"{needed:,}", f"{needed - before:+,}", delta_color="off",
+                      help=f"Erlang C agents needed for {SERVICE_LEVEL:.0%} of calls answered within "
+                           f"{ANSWER_WITHIN}s over the last closed 15 minutes")
+        st.metric("Response", "0.3s", "↓ 0.1s", delta_color="inverse")
+    
+    # Anomalies flagged since this session last looked pop up once as toasts
+    monitor = get_anomaly_monitor()
+    if 'anomaly_cursor' not in st.session_state:
+        st.session_state.anomaly_cursor = monitor.sequence
+    fresh, st.session_state.anomaly_cursor = monitor.since(st.session_state.anomaly_cursor)
+    for event in sorted(fresh, key=lambda event: -abs(event['z']))[:3]:
+        st.toast(f"Anomaly: {anomaly_text(event)}", icon="⚠️")
+    recent = monitor.recent(3)
+    if recent:
+        lines = "".join(f'<div style="color: {"#ff0055" if abs(event["z"]) >= 10 else "#00ffff"};">'
+                        f'⚠ {anomaly_text(event)}</div>' for event in recent)
+        st.markdown(f'<div class="terminal" style="font-size: 0.75rem;">{lines}</div>', unsafe_allow_html=True)
 
 # Enhanced sidebar with better menu boxes
 def create_sidebar():
@@ -1414,20 +1460,18 @@ def create_sidebar():
     </div>
     """, unsafe_allow_html=True)
     
-    # Initialize session state for page selection
-    if 'current_page' not in st.session_state:
-        st.session_state.current_page = "Command Center"
-    
     # Navigation buttons
     nav_buttons = [
         ("🏠 COMMAND CENTER", "Command Center"),
         ("📊 CALL ANALYTICS", "Call Analytics"), 
         ("🧠 NEURAL CONTROL", "Neural Control")
     ]
+    if st.session_state.get('perf_enabled'):
+        nav_buttons.append(("⏱️ PERF", "Perf"))
     
     for button_text, page_key in nav_buttons:
-        if st.sidebar.button(button_text, key=f"nav_{page_key}", use_container_width=True):
-            st.session_state.current_page = page_key
+        st.sidebar.button(button_text, key=f"nav_{page_key}", width="stretch",
+                          on_click=navigate, args=(page_key,))
     
     # System status menu box
     st.sidebar.markdown("""
@@ -1436,14 +1480,8 @@ def create_sidebar():
     </div>
     """, unsafe_allow_html=True)
     
-    # Live metrics in columns
-    col1, col2 = st.sidebar.columns(2)
-    with col1:
-        st.metric("Calls", "1.2K", "↑ 150", delta_color="normal")
-        st.metric("Load", "67%", "↓ 5%", delta_color="inverse")
-    with col2:
-        st.metric("Agents", "185", "→", delta_color="off")
-        st.metric("Response", "0.3s", "↓ 0.1s", delta_color="inverse")
+    with st.sidebar:
+        st.fragment(sidebar_status)()
     
     # Operator profile box
     st.sidebar.markdown("""
@@ -1481,10 +1519,25 @@ def create_sidebar():
                 elif "RESTART" in action_text:
                     st.sidebar.warning("🔄 System restart initiated...")
                 elif "EXPORT" in action_text:
-                    st.sidebar.success("📊 Data exported")
+                    st.session_state.show_export = not st.session_state.get('show_export', False)
                 elif "SECURITY" in action_text:
                     st.sidebar.info("🛡️ Security scan active")
     
+    if st.session_state.get('show_export'):
+        export_panel()
+    
+    # Display settings menu box
+    st.sidebar.markdown("""
+    <div class="sidebar-menu-box">
+        <h4 class="sidebar-menu-title">DISPLAY</h4>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    st.sidebar.selectbox("Matrix Rain", list(RAIN_MODES), key="rain_mode",
+                         help="Canvas draws on one element with an FPS cap; Classic is the original DOM effect")
+    st.sidebar.slider("Rain FPS Cap", 5, 60, 24, key="rain_fps")
+    st.sidebar.slider("Rain Density", 0.1, 1.0, 0.6, key="rain_density")
+    
     # Network diagnostics box
     st.sidebar.markdown("""
     <div class="sidebar-menu-box">
@@ -1500,31 +1553,8 @@ def create_sidebar():
     """, unsafe_allow_html=True)
 
 # Main application
-def main():
-    st.set_page_config(
-        page_title="AI Call Center | Neural Interface",
-        page_icon="🤖",
-        layout="wide",
-        initial_sidebar_state="expanded"
-    )
-    
-    # Apply enhanced Matrix theme
-    apply_matrix_theme()
-    
-    # Create enhanced sidebar
-    create_sidebar()
-    
-    # Page mapping
-    pages = {
-        "Command Center": home_page,
-        "Call Analytics": call_analytics_page,
-        "Neural Control": ai_neural_control_page
-    }
-    
-    # Execute selected page
-    pages[st.session_state.current_page]()
-    
-    # Enhanced footer
+def create_footer():
+    """Enhanced footer"""
     st.markdown("---")
     st.markdown("""
     <div style="text-align: center; padding: 30px 20px; background: rgba(0,0,0,0.8); border-radius: 15px; margin-top: 50px;">
@@ -1545,5 +1575,139 @@ def main():
     </div>
     """, unsafe_allow_html=True)
 
+@st.cache_resource
+def get_perf_stats():
+    """Process-wide rolling rerun samples for the Perf page"""
+    return PerfStats(window=500)
+
+def current_view():
+    """Page and tab label a rerun's profile is recorded under"""
+    page = st.session_state.get('current_page', "Command Center")
+    tab_key = PAGE_TAB_KEYS.get(page)
+    tab = st.session_state.get(tab_key) if tab_key else None
+    return f"{page} / {tab}" if tab else page
+
+@st.cache_resource(max_entries=64)
+def cached_figure(builder, *args, **kwargs):
+    """Figure from a matrix_charts builder, built once per distinct input and shared by every session"""
+    import matrix_charts
+    return getattr(matrix_charts, builder)(*args, **kwargs)
+
+def plotly_chart(fig, **kwargs):
+    """st.plotly_chart, timed as the Plotly stage of the rerun profile"""
+    # Figures carry the matrix template, which Streamlit's chart theme would restyle
+    kwargs.setdefault('theme', None)
+    with perf_stage('plotly'):
+        return st.plotly_chart(fig, **kwargs)
+
+def perf_page():
+    """Rolling per-rerun timings by page and tab, from sessions opened with ?perf=1"""
+    import pandas as pd
+    from matrix_charts import bar_figure
+    st.markdown("""
+    <div class="matrix-container">
+        <h3 style="color: #00ffff;">⏱️ RERUN PERFORMANCE</h3>
+        <p style="color: #00ff41;">Stage timings, elements and bytes sent per rerun, over the last 500 profiled runs of each view</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    stats = get_perf_stats()
+    rows = stats.summary()
+    if not rows:
+        st.info("No reruns recorded yet")
+        return
+    st.dataframe(pd.DataFrame(rows), width="stretch", hide_index=True)
+    
+    view = st.selectbox("View", stats.views(), key="perf_view")
+    last = stats.last(view)
+    breakdown = pd.DataFrame({
+        'Stage': list(last['stages']),
+        'ms': [round(t * 1000, 2) for t in last['stages'].values()],
+        'Elements': [last['elements'].get(name, 0) for name in last['stages']],
+        'KB': [round(last['bytes'].get(name, 0) / 1024, 1) for name in last['stages']]
+    })
+    
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        fig = bar_figure(breakdown['Stage'], breakdown['ms'], f"Last rerun of {view}", accent='#00ffff',
+                         text=breakdown['KB'])
+        plotly_chart(fig, width="stretch")
+    with col2:
+        st.dataframe(breakdown, width="stretch", hide_index=True)
+        st.metric("Total", f"{last['total'] * 1000:.1f} ms")
+        if st.button("🗑️ RESET SAMPLES", key="perf_reset"):
+            stats.reset()
+            st.rerun()
+
+def start_profiler(ctx):
+    """Profile this run when the session opted in with ?perf=1; otherwise stages are no-ops"""
+    if not st.session_state.get('perf_enabled'):
+        return None
+    return RerunProfiler(get_perf_stats()).start(ctx)
+
+def page_body(pages):
+    """Current page; a fragment, so a tab switch reruns only the content area"""
+    ctx = get_script_run_ctx()
+    if ctx is None or not ctx.fragment_ids_this_run:
+        pages[st.session_state.current_page]()
+        return
+    
+    # Fragment reruns skip main(), so they are profiled here
+    profiler = start_profiler(ctx)
+    try:
+        with perf_stage('page'):
+            pages[st.session_state.current_page]()
+    finally:
+        if profiler is not None:
+            profiler.finish(current_view())
+
+def main():
+    st.set_page_config(
+        page_title="AI Call Center | Neural Interface",
+        page_icon="🤖",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    
+    if st.query_params.get("perf") == "1":
+        st.session_state.perf_enabled = True
+    route_from_url()
+    
+    profiler = start_profiler(get_script_run_ctx())
+    try:
+        # Apply enhanced Matrix theme
+        with perf_stage('theme'):
+            apply_matrix_theme()
+            # Rain only behind Command Center; every other page gets the script that stops it
+            rain_mode = RAIN_MODES[st.session_state.get('rain_mode', "Canvas")]
+            matrix_rain_effect(
+                rain_mode if st.session_state.current_page == "Command Center" else "off",
+                st.session_state.get('rain_fps', 24),
+                st.session_state.get('rain_density', 0.6)
+            )
+        
+        # Create enhanced sidebar
+        with perf_stage('sidebar'):
+            create_sidebar()
+        
+        # Page mapping
+        pages = {
+            "Command Center": home_page,
+            "Call Analytics": call_analytics_page,
+            "Neural Control": ai_neural_control_page
+        }
+        if st.session_state.get('perf_enabled'):
+            pages["Perf"] = perf_page
+        
+        # Execute selected page as a fragment, so its tab buttons rerun only the page
+        with perf_stage('page'):
+            st.fragment(page_body)(pages)
+        
+        with perf_stage('footer'):
+            create_footer()
+    finally:
+        if profiler is not None:
+            profiler.finish(current_view())
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,249 @@
+"""Streaming anomaly detection on hourly call volume and response time.
+
+``SeasonalDetector`` scores a whole matrix of series per time step.  Every
+series has an hour-of-week baseline, kept as an exponentially weighted mean
+per slot, and a robust scale, kept as an exponentially weighted mean
+absolute deviation; a point is flagged when its residual is several scales
+away.  Residuals are clipped before they update either, so a spike or an
+outage is flagged without dragging the baseline after it, while a lasting
+shift (a busier month) is absorbed over a few weeks.  Each step touches one
+slot per series, so its cost does not grow with history.
+
+``CallAnomalyMonitor`` feeds closed hours from a CallStore through one
+detector covering all calls, each category and each agent, starting a few
+months back, and keeps a bounded log of flagged points that sessions read
+with a cursor, like the call event bus.
+"""
+import threading
+from collections import deque
+
+import numpy as np
+
+# Hours per season; each hour of the week has its own baseline
+SEASON = 168
+
+METRICS = ('volume', 'response_time')
+METRIC_LABELS = {'volume': 'call volume', 'response_time': 'response time'}
+
+# Mean absolute deviation to standard deviation, for normal residuals
+MAD_TO_SIGMA = np.sqrt(np.pi / 2)
+
+
+class SeasonalDetector:
+    """Hour-of-week EWMA baselines and robust z-scores for an array of series
+
+    The baseline is kept per slot, but the scale is pooled over every step of
+    a series, in units of its expected noise: the square root of the
+    baseline for ``counts`` series (broadcast against ``shape``), one over
+    the square root of the observations behind each value for series of
+    means.  A few weeks of history then give a steady scale for every hour.
+    Scales never drop below Poisson noise for counts, or ``relative_floor``
+    of the baseline for means.  A slot scores points once it has seen
+    ``warmup`` values.
+    """
+
+    def __init__(self, shape, counts=None, season=SEASON, alpha=0.2, scale_alpha=0.01, threshold=5.0,
+                 clip=3.0, warmup=3, relative_floor=0.05):
+        self.season = season
+        self.alpha = alpha
+        self.scale_alpha = scale_alpha
+        self.threshold = threshold
+        self.clip = clip
+        self.warmup = warmup
+        self.relative_floor = relative_floor
+        self.mean = np.zeros((season,) + tuple(shape))
+        self.seen = np.zeros(self.mean.shape, dtype=np.int32)
+        self.deviation = np.zeros(shape)
+        # Weight the deviation average still gives its zero start, (1 - scale_alpha) ** updates
+        self.decay = np.ones(shape)
+        self.counts = np.asarray(False if counts is None else counts, dtype=bool)
+
+    def grow(self, n):
+        """Extend the last axis to ``n`` series; new series start unseen"""
+        extra = n - self.mean.shape[-1]
+        if extra <= 0:
+            return
+        pad = [(0, 0)] * (self.mean.ndim - 1) + [(0, extra)]
+        self.mean = np.pad(self.mean, pad)
+        self.seen = np.pad(self.seen, pad)
+        self.deviation = np.pad(self.deviation, pad[1:])
+        self.decay = np.pad(self.decay, pad[1:], constant_values=1.0)
+
+    def scale(self, mean, unit):
+        """Standard deviation expected around ``mean``, for values with noise ``unit``"""
+        # The deviation average starts at zero; divide out that start's remaining weight
+        deviation = self.deviation / np.maximum(1 - self.decay, self.scale_alpha)
+        floor = np.where(self.counts, unit, self.relative_floor * np.abs(mean))
+        return np.maximum(MAD_TO_SIGMA * deviation * unit, floor)
+
+    def update(self, step, x, weight=None):
+        """Score ``x`` at time ``step`` and fold it into that step's slot
+
+        ``weight`` is the number of observations behind each value of a
+        series of means, so a thin hour is not flagged for ordinary noise.
+        Returns z-scores (NaN where ``x`` is NaN or the slot is still
+        warming up) and the baseline the points were scored against.
+        """
+        slot = step % self.season
+        mean, seen = self.mean[slot], self.seen[slot]
+        weight = np.ones(x.shape) if weight is None else np.maximum(weight, 1)
+        unit = np.where(self.counts, np.sqrt(np.abs(mean) + 1), 1 / np.sqrt(weight))
+        valid = np.isfinite(x)
+        x = np.where(valid, x, 0.0)
+        expected = mean.copy()
+        scale = self.scale(mean, unit)
+        residual = x - mean
+        scored = valid & (seen >= self.warmup)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            z = np.where(scored, residual / scale, np.nan)
+
+        # Warm-up values are taken as they are; later ones are clipped first
+        bound = self.clip * scale
+        step_size = np.where(scored, np.clip(residual, -bound, bound), residual)
+        mean += np.where(valid & (seen > 0), self.alpha * step_size, 0.0)
+        first = valid & (seen == 0)
+        np.copyto(mean, x, where=first)
+        seen += valid
+        # Only residuals against a settled baseline say anything about the noise
+        self.deviation += np.where(scored, self.scale_alpha * (np.abs(step_size) / unit - self.deviation), 0.0)
+        self.decay *= np.where(scored, 1 - self.scale_alpha, 1.0)
+        return z, expected
+
+
+class CallAnomalyMonitor:
+    """Hourly anomaly scores for every call category and agent, with an event log
+
+    Response time is only scored for hours with at least ``min_calls``
+    calls; other options go to ``SeasonalDetector``.
+    """
+
+    def __init__(self, store, history=500, min_calls=5, lookback=6 * SEASON, **detector_options):
+        self.store = store
+        self.min_calls = min_calls
+        self.lookback = lookback
+        self.detector_options = detector_options
+        self.detector = None
+        self.hour = None
+        self.sequence = 0
+        self._lock = threading.Lock()
+        self._events_lock = threading.Lock()
+        self._thread = None
+        self._log = deque(maxlen=history)
+        # Flagged hours of the all-calls series, kept in full for chart overlays
+        self._marks = {metric: [] for metric in METRICS}
+
+    def labels(self):
+        return ['All calls'] + list(self.store.categories) + list(self.store.agents)
+
+    def _bucket(self, h0, h1):
+        """Calls and response time sums per hour in [h0, h1) for every series"""
+        rows = self.store.row_range(h0 * 3600, h1 * 3600)
+        hour = self.store.column('start')[rows] // 3600 - h0
+        category = self.store.column('category')[rows]
+        agent = self.store.column('agent')[rows]
+        response = self.store.column('response_time')[rows]
+        hours, n_categories, n_agents = h1 - h0, len(self.store.categories), len(self.store.agents)
+        calls, sums = [], []
+        for ids, n in ((hour, 1), (hour * n_categories + category, n_categories),
+                       (hour * n_agents + agent, n_agents)):
+            calls.append(np.bincount(ids, minlength=hours * n).reshape(hours, n))
+            sums.append(np.bincount(ids, weights=response, minlength=hours * n).reshape(hours, n))
+        return np.hstack(calls).astype(np.float64), np.hstack(sums)
+
+    def _score(self, h0, h1, replaying=False):
+        calls, sums = self._bucket(h0, h1)
+        n_series = calls.shape[1]
+        if self.detector is None:
+            self.detector = SeasonalDetector((len(METRICS), n_series), counts=[[True], [False]],
+                                             **self.detector_options)
+        self.detector.grow(n_series)
+        labels = self.labels()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            response = np.where(calls >= self.min_calls, sums / calls, np.nan)
+        values = np.stack([calls, response], axis=1)
+        weights = np.stack([np.ones_like(calls), calls], axis=1)
+        z = np.empty_like(values)
+        expected = np.empty_like(values)
+        for i in range(h1 - h0):
+            z[i], expected[i] = self.detector.update(h0 + i, values[i], weights[i])
+        with np.errstate(invalid='ignore'):
+            hits = np.argwhere(np.abs(z) >= self.detector.threshold)
+        for i, metric, series in hits:
+            event = {
+                't': (h0 + i) * 3600,
+                'metric': METRICS[metric],
+                'series': labels[series],
+                'value': float(values[i, metric, series]),
+                'expected': float(expected[i, metric, series]),
+                'z': float(z[i, metric, series]),
+                # Found while replaying history, so never announced as new
+                'replayed': replaying,
+            }
+            with self._events_lock:
+                self.sequence += 1
+                event['sequence'] = self.sequence
+                self._log.append(event)
+                if series == 0:
+                    self._marks[event['metric']].append((event['t'], event['value']))
+        return len(hits)
+
+    def update(self, wait=True):
+        """Score every hour closed since the last update; returns how many points were flagged
+
+        With ``wait=False`` the call returns at once while another thread
+        is scoring, leaving readers with the events logged so far.
+        """
+        latest = self.store.latest_start()
+        if latest is None or (self.hour is not None and self.hour >= latest // 3600):
+            return 0
+        if not self._lock.acquire(blocking=wait):
+            return 0
+        try:
+            closed = latest // 3600
+            replaying = self.hour is None
+            if replaying:
+                # Baselines settle within a few weeks, so older history is not replayed
+                self.hour = max(self.store.earliest_start() // 3600, closed - self.lookback)
+            flagged = 0
+            # A week at a time bounds the per-hour matrices on a cold start
+            while self.hour < closed:
+                stop = min(self.hour + SEASON, closed)
+                flagged += self._score(self.hour, stop, replaying)
+                self.hour = stop
+            return flagged
+        finally:
+            self._lock.release()
+
+    def start(self):
+        """Replay recent history on a background thread so the first reader does not wait"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.update, name="anomaly-replay", daemon=True)
+            self._thread.start()
+        return self
+
+    def since(self, cursor):
+        """Events flagged after ``cursor``, oldest first, and the new cursor
+
+        Events found while replaying history are never reported as new, even
+        to a session whose cursor was taken while the replay was running.
+        """
+        self.update(wait=False)
+        with self._events_lock:
+            return [event for event in self._log
+                    if event['sequence'] > cursor and not event['replayed']], self.sequence
+
+    def recent(self, n=5):
+        """The ``n`` most recent events, newest hour first and most severe first within an hour"""
+        self.update(wait=False)
+        with self._events_lock:
+            return sorted(self._log, key=lambda event: (-event['t'], -abs(event['z'])))[:n]
+
+    def marks(self, metric, t0, t1):
+        """Hour starts and values of all-calls anomalies in [t0, t1)"""
+        self.update(wait=False)
+        with self._events_lock:
+            points = [point for point in self._marks[metric] if t0 <= point[0] < t1]
+        if not points:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        t, values = zip(*points)
+        return np.array(t, dtype=np.int64), np.array(values)
@@ -0,0 +1,109 @@
+"""Backtest of the call-volume forecasts: accuracy and fit time.
+
+A seeded call store covering ``--days`` days is forecast from several
+rolling origins, one week apart, each fitted only on calls before it and
+scored on the following ``--horizon`` days:
+
+* WAPE: absolute error over all categories and buckets, divided by the
+  actual calls, next to a seasonal-naive forecast (the last season repeated)
+* coverage: share of actual buckets inside the 95% prediction band
+* fit: median seconds to fit every category and interval, in-process and
+  split across ``--workers`` worker processes
+
+The check fails if the models do worse than seasonal naive for any interval.
+
+Run from the repository root:
+
+    python bench/forecast_backtest.py
+    python bench/forecast_backtest.py --origins 8 --workers 4
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def timed_fit(engine, day, workers, repeat):
+    """Median seconds over ``repeat`` fits, after one untimed warm-up fit"""
+    engine.fit(day, workers=workers)
+    seconds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        engine.fit(day, workers=workers)
+        seconds.append(time.perf_counter() - started)
+    return statistics.median(seconds)
+
+
+def score(engine, fits, interval, horizon):
+    """Absolute errors of the model and of seasonal naive, actual calls, and buckets inside the band"""
+    from forecast import INTERVALS, project
+    seconds, season, _ = INTERVALS[interval]
+    steps = horizon * 86400 // seconds
+    actual = engine.rollups.by_category(interval, fits['end'], fits['end'] + steps * seconds)
+    fit = fits['models'][interval]
+    _, counts = fits['history'][interval]
+    naive = np.resize(counts[-season:], (steps, counts.shape[1]))
+    model_error = inside = 0
+    for category in range(actual.shape[1]):
+        mean, low, high = (np.expm1(values) for values in project(fit, category, steps))
+        model_error += np.abs(mean - actual[:, category]).sum()
+        inside += ((actual[:, category] >= low) & (actual[:, category] <= high)).sum()
+    return model_error, np.abs(naive - actual).sum(), actual.sum(), inside, actual.size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--days', type=int, default=180, help="days of seeded history")
+    parser.add_argument('--horizon', type=int, default=14, help="days forecast from each origin")
+    parser.add_argument('--origins', type=int, default=4, help="rolling forecast origins, a week apart")
+    parser.add_argument('--workers', type=int, default=2, help="worker processes for the parallel fit")
+    parser.add_argument('--repeat', type=int, default=5, help="timed fits per setting")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, ROOT)
+    from call_generator import seed_demo_calls
+    from call_store import CallStore
+    from forecast import INTERVALS, ForecastEngine
+    from rollups import CallRollups
+
+    store = CallStore(tempfile.mkdtemp(prefix='bench-forecast-'))
+    seed_demo_calls(store, days=args.days, end=1_790_000_000)
+    engine = ForecastEngine(CallRollups(store))
+    last = store.latest_start() // 86400 - args.horizon
+    days = [last - 7 * i for i in reversed(range(args.origins))]
+
+    failed = False
+    for interval in INTERVALS:
+        totals = np.zeros(5)
+        for day in days:
+            fits = engine.fit(day, workers=1)
+            if interval in fits['models']:
+                totals += score(engine, fits, interval, args.horizon)
+        if not totals[2]:
+            print(f"{interval:<7} too little history for a backtest")
+            continue
+        model, naive = totals[0] / totals[2], totals[1] / totals[2]
+        print(f"{interval:<7} WAPE {model:.3f}  seasonal naive {naive:.3f}  "
+              f"band coverage {totals[3] / totals[4]:.2f}  ({len(days)} origins x {args.horizon} days)")
+        failed |= model > naive
+
+    serial = timed_fit(engine, last, 1, args.repeat)
+    print(f"fit     {serial * 1000:.0f} ms in-process", end='')
+    if args.workers > 1:
+        pooled = timed_fit(engine, last, args.workers, args.repeat)
+        print(f", {pooled * 1000:.0f} ms on {args.workers} workers ({serial / pooled:.1f}x)", end='')
+    print()
+
+    if failed:
+        print("REGRESSION forecasts are less accurate than seasonal naive")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""Throughput and reproducibility of the synthetic call generator.
+
+Generates ``--rows`` calls at ``--calls-per-day`` in chunks of about
+``--chunk-rows`` rows, from a fixed start, and reports rows and column bytes
+per second plus a checksum of every column.  The same seed always gives the
+same checksum; the first days are also regenerated in smaller chunks, and
+the check fails if they differ from the first pass.
+
+With ``--store`` the calls are appended to a call store at that path (which
+must be empty), to build large stores for the other benchmarks, for example:
+
+    CALL_STORE_DIR=/tmp/calls-100m python bench/load_test.py
+
+Run from the repository root:
+
+    python bench/generate_calls.py                        # 100M rows, generation only
+    python bench/generate_calls.py --rows 5000000 --store /tmp/calls-5m
+"""
+import argparse
+import hashlib
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Generated calls end here, where the other benchmarks end their seeded stores
+END = 1_790_000_000
+
+
+class Checksum:
+    """Hash of every column's bytes, the same however the rows are chunked"""
+
+    def __init__(self):
+        self.columns = {}
+
+    def update(self, chunk):
+        for name, values in chunk.items():
+            self.columns.setdefault(name, hashlib.sha256()).update(np.ascontiguousarray(values).tobytes())
+
+    def hexdigest(self):
+        combined = hashlib.sha256()
+        for name in sorted(self.columns):
+            combined.update(self.columns[name].digest())
+        return combined.hexdigest()[:16]
+
+
+def digest(chunks, rows):
+    """Checksum of the first ``rows`` rows of the chunks"""
+    checksum, seen = Checksum(), 0
+    for chunk in chunks:
+        take = min(len(chunk['start']), rows - seen)
+        checksum.update({name: values[:take] for name, values in chunk.items()})
+        seen += take
+        if seen >= rows:
+            break
+    return checksum.hexdigest()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000_000)
+    parser.add_argument('--calls-per-day', type=int, default=1_000_000)
+    parser.add_argument('--chunk-rows', type=int, default=1 << 20)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--store', help="append the calls to an empty call store at this path")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, ROOT)
+    from call_generator import CallGenerator
+    from call_store import CallStore
+
+    generator = CallGenerator(args.calls_per_day, seed=args.seed)
+    # Whole days from a fixed start, comfortably more than the rows asked for
+    days = -(-args.rows * 2 // args.calls_per_day) + 1
+    begin = END - days * 86400
+    store = CallStore(args.store) if args.store else None
+    if store is not None and store.rows:
+        print(f"{args.store} already holds {store.rows:,} calls")
+        return 1
+    codes = store.agent_codes(generator.agent_names) if store is not None else None
+
+    checksum, rows, nbytes = Checksum(), 0, 0
+    started = time.perf_counter()
+    for chunk in generator.chunks(begin, END, args.chunk_rows):
+        take = min(len(chunk['start']), args.rows - rows)
+        chunk = {name: values[:take] for name, values in chunk.items()}
+        checksum.update(chunk)
+        if store is not None:
+            store.append(dict(chunk, agent=codes[chunk['agent']]))
+        rows += take
+        nbytes += sum(values.nbytes for values in chunk.values())
+        if rows >= args.rows:
+            break
+    elapsed = time.perf_counter() - started
+    print(f"{rows:,} rows in {elapsed:.1f} s: {rows / elapsed / 1e6:.2f} M rows/s, "
+          f"{nbytes / elapsed / 1e6:.0f} MB/s of columns, checksum {checksum.hexdigest()}")
+    if store is not None:
+        print(f"appended to {args.store} (store version {store.version})")
+
+    # Day streams make the output independent of chunk size
+    sample = min(rows, 2 * args.calls_per_day)
+    first = digest(generator.chunks(begin, END, args.chunk_rows), sample)
+    again = digest(generator.chunks(begin, END, max(args.chunk_rows // 16, 1)), sample)
+    if first != again:
+        print(f"REGRESSION first {sample:,} rows differ between chunk sizes ({first} != {again})")
+        return 1
+    print(f"first {sample:,} rows identical across chunk sizes")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
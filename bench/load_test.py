@@ -0,0 +1,322 @@
+"""Localhost load test: many simulated browser sessions against one app server.
+
+Starts ``streamlit run App.py`` on a free localhost port, then steps through
+increasing session counts.  Each simulated session speaks Streamlit's
+websocket protocol directly (BackMsg/ForwardMsg protobufs over
+``/_stcore/stream``): it renders the app, then clicks a random sidebar nav
+button or horizontal tab at the configured rate and times every rerun until
+the server reports ``script_finished``.  Like the browser, a click on a
+button inside a fragment reruns only that fragment.  Nothing leaves
+localhost.
+
+Each level reports rerun latency percentiles, completed reruns per second,
+the server's resident memory and its growth per session.  The saturation
+point is the first level where throughput grows less than 10% over the
+previous level or p95 latency passes ``--slo``.
+
+The server gets its own seeded call store and model registry under a
+temporary directory, with the demo feed off, so the repository's ``data/``
+is never touched and every run serves the same calls.  ``CALL_STORE_DIR``
+set in the environment overrides the store, for example to load-test a
+large one built by ``generate_calls.py``.
+
+Run from the repository root:
+
+    python bench/load_test.py --sessions 1 2 4 8 16 --rate 0.5 --duration 20
+    python bench/load_test.py --sessions 1 --clicks tabs --page analytics
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from urllib.parse import urlparse
+
+import numpy as np
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, 'App.py')
+
+# Widget ids end in the user key: sidebar nav buttons and horizontal tab buttons
+CLICKABLE = {
+    'all': re.compile(r'-(nav_.+|(home|analytics|neural)_\w+)$'),
+    'tabs': re.compile(r'-(home|analytics|neural)_\w+$'),
+}
+
+# ScriptFinishedStatus values that end a full rerun, and a fragment rerun
+FINISHED = {0, 1}
+FRAGMENT_FINISHED = 3
+LOCAL_HOSTS = {'localhost', '127.0.0.1', '::1'}
+
+# Seeded benchmark stores end here
+SEED_END = 1_790_000_000
+
+
+class SimulatedSession:
+    """One browser tab: a websocket plus the clickable buttons on screen
+
+    ``buttons`` maps each widget id to the fragment it was drawn in ('' for
+    the main script).
+    """
+
+    def __init__(self, url, timeout=60.0, clicks='all', query_string=''):
+        self.url = url
+        self.query_string = query_string
+        self.timeout = timeout
+        self.clickable = CLICKABLE[clicks]
+        self.ws = None
+        self.buttons = {}
+        self.page_hash = ''
+        self.errors = 0
+        self.bytes = 0
+
+    async def connect(self):
+        self.ws = await websockets.connect(self.url, subprotocols=['streamlit'], max_size=None)
+        return await self.rerun()
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    async def rerun(self, widget_id=None):
+        """Request a rerun (optionally clicking ``widget_id``) and return its latency"""
+        back = BackMsg()
+        back.rerun_script.page_script_hash = self.page_hash
+        back.rerun_script.query_string = self.query_string
+        if widget_id is not None:
+            back.rerun_script.fragment_id = self.buttons.get(widget_id, '')
+            widget = back.rerun_script.widget_states.widgets.add()
+            widget.id = widget_id
+            widget.trigger_value = True
+        started = time.perf_counter()
+        await self.ws.send(back.SerializeToString())
+        await asyncio.wait_for(self._read_until_finished(), self.timeout)
+        return time.perf_counter() - started
+
+    async def _read_until_finished(self):
+        buttons = {}
+        while True:
+            data = await self.ws.recv()
+            self.bytes += len(data)
+            msg = ForwardMsg()
+            msg.ParseFromString(data)
+            kind = msg.WhichOneof('type')
+            if kind == 'new_session':
+                self.page_hash = msg.new_session.main_script_hash
+            elif kind == 'delta' and msg.delta.WhichOneof('type') == 'new_element':
+                element = msg.delta.new_element.WhichOneof('type')
+                if element == 'button' and self.clickable.search(msg.delta.new_element.button.id):
+                    buttons[msg.delta.new_element.button.id] = msg.delta.fragment_id
+                elif element == 'exception':
+                    self.errors += 1
+            elif kind == 'script_finished' and msg.script_finished in FINISHED:
+                self.buttons = buttons
+                return
+            elif kind == 'script_finished' and msg.script_finished == FRAGMENT_FINISHED:
+                # Only the rerun fragments were redrawn; keep everything else
+                rerun = set(buttons.values())
+                self.buttons = {widget_id: fragment for widget_id, fragment in self.buttons.items()
+                                if fragment not in rerun}
+                self.buttons.update(buttons)
+                return
+
+
+async def drive_session(url, rate, deadline, rng, latencies, ready, clicks='all', query_string=''):
+    session = SimulatedSession(url, clicks=clicks, query_string=query_string)
+    try:
+        latencies.append(await session.connect())
+        ready.append(session)
+        while True:
+            wait = rng.expovariate(rate)
+            if time.monotonic() + wait >= deadline:
+                break
+            await asyncio.sleep(wait)
+            if session.buttons:
+                latencies.append(await session.rerun(rng.choice(sorted(session.buttons))))
+    except (asyncio.TimeoutError, websockets.ConnectionClosed, OSError):
+        session.errors += 1
+    return session
+
+
+def rss_mb(pid):
+    """Resident set size of ``pid`` in MB (Linux), or None"""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+
+
+async def run_level(url, pid, n_sessions, rate, duration, seed, base_rss=None, clicks='all',
+                    query_string=''):
+    """Drive ``n_sessions`` concurrent sessions for ``duration`` seconds
+
+    Memory per session is the peak growth over ``base_rss``, the server's
+    size once warm; freed session memory is rarely returned to the OS, so
+    growth over the previous level would understate it.
+    """
+    peak_rss = rss_mb(pid)
+    latencies = []
+    ready = []
+    deadline = time.monotonic() + duration
+    started = time.perf_counter()
+    tasks = [asyncio.create_task(drive_session(url, rate, deadline, random.Random(seed + i),
+                                               latencies, ready, clicks, query_string))
+             for i in range(n_sessions)]
+    while not all(task.done() for task in tasks):
+        await asyncio.sleep(0.5)
+        if pid is not None:
+            peak_rss = max(peak_rss, rss_mb(pid) or 0)
+    sessions = [task.result() for task in tasks]
+    elapsed = time.perf_counter() - started
+    for session in sessions:
+        await session.close()
+
+    lat = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    return {
+        'sessions': n_sessions,
+        'connected': len(ready),
+        'reruns': len(latencies),
+        'reruns_per_sec': len(latencies) / elapsed,
+        'p50_ms': float(np.percentile(lat, 50)),
+        'p95_ms': float(np.percentile(lat, 95)),
+        'p99_ms': float(np.percentile(lat, 99)),
+        'errors': sum(session.errors for session in sessions),
+        'kb_per_rerun': sum(session.bytes for session in sessions) / max(len(latencies), 1) / 1024,
+        'rss_mb': peak_rss,
+        'mb_per_session': (peak_rss - base_rss) / n_sessions if base_rss is not None else None,
+    }
+
+
+def saturation(levels, slo_ms):
+    """First level where throughput stops scaling or p95 breaks the SLO"""
+    for previous, level in zip([None] + levels, levels):
+        if level['p95_ms'] > slo_ms or level['connected'] < level['sessions']:
+            return level
+        if previous is not None and level['reruns_per_sec'] < previous['reruns_per_sec'] * 1.1:
+            return level
+    return None
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def bench_env(prefix):
+    """App settings for a benchmark: data under a new temporary directory, demo feed off
+
+    The call store is seeded here, so the app under test never pays for
+    generating it.  ``CALL_STORE_DIR`` from the environment wins, and is only
+    seeded when empty.
+    """
+    workdir = tempfile.mkdtemp(prefix=prefix)
+    env = {
+        'CALL_STORE_DIR': os.environ.get('CALL_STORE_DIR', os.path.join(workdir, 'calls')),
+        'MODEL_REGISTRY_DIR': os.path.join(workdir, 'models'),
+        'CALL_DEMO_FEED': '0',
+    }
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    from call_generator import seed_demo_calls
+    from call_store import CallStore
+    seed_demo_calls(CallStore(env['CALL_STORE_DIR']), end=SEED_END)
+    return env
+
+
+def start_server(port, python_args=(), stderr=subprocess.DEVNULL, env=None):
+    """Launch the app on 127.0.0.1:``port`` with ``env`` added to the environment, and wait for its health check"""
+    process = subprocess.Popen(
+        [sys.executable, *python_args, '-m', 'streamlit', 'run', APP_PATH,
+         '--server.address', '127.0.0.1', '--server.port', str(port),
+         '--server.headless', 'true', '--browser.gatherUsageStats', 'false'],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=stderr, env={**os.environ, **(env or {})})
+    health = f'http://127.0.0.1:{port}/_stcore/health'
+    for _ in range(120):
+        try:
+            with urllib.request.urlopen(health, timeout=1) as response:
+                if response.status == 200:
+                    return process
+        except OSError:
+            time.sleep(0.5)
+    process.kill()
+    raise RuntimeError("app server did not become healthy")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32],
+                        help="concurrent session counts to step through")
+    parser.add_argument('--rate', type=float, default=0.5, help="clicks per second per session")
+    parser.add_argument('--duration', type=float, default=20.0, help="seconds per level")
+    parser.add_argument('--slo', type=float, default=2000.0, help="p95 rerun latency limit in ms")
+    parser.add_argument('--url', help="existing localhost server (default: start one)")
+    parser.add_argument('--clicks', choices=sorted(CLICKABLE), default='all',
+                        help="buttons sessions click: nav and tabs, or horizontal tabs only")
+    parser.add_argument('--page', default='', help="page slug sessions open, e.g. analytics")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    process = None
+    if args.url:
+        host = urlparse(args.url).hostname
+        if host not in LOCAL_HOSTS:
+            parser.error("load tests only run against localhost")
+        base, pid = args.url.rstrip('/'), None
+    else:
+        port = free_port()
+        process = start_server(port, env=bench_env('bench-load-'))
+        base, pid = f'http://127.0.0.1:{port}', process.pid
+    url = base.replace('http', 'ws', 1) + '/_stcore/stream'
+    query_string = f'page={args.page}' if args.page else ''
+
+    try:
+        # Warm the server's caches so the first level is not charged for them
+        asyncio.run(run_level(url, pid, 1, args.rate, 1.0, args.seed, clicks=args.clicks,
+                              query_string=query_string))
+        base_rss = rss_mb(pid)
+        levels = []
+        print(f"{'sessions':>8} {'reruns/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+              f"{'errors':>6} {'KB/rerun':>9} {'RSS MB':>8} {'MB/session':>10}")
+        for n_sessions in args.sessions:
+            level = asyncio.run(run_level(url, pid, n_sessions, args.rate, args.duration, args.seed,
+                                          base_rss, args.clicks, query_string))
+            levels.append(level)
+            per_session = f"{level['mb_per_session']:.1f}" if level['mb_per_session'] is not None else "n/a"
+            rss = f"{level['rss_mb']:.0f}" if level['rss_mb'] is not None else "n/a"
+            print(f"{n_sessions:>8} {level['reruns_per_sec']:>9.2f} {level['p50_ms']:>8.0f} "
+                  f"{level['p95_ms']:>8.0f} {level['p99_ms']:>8.0f} {level['errors']:>6} "
+                  f"{level['kb_per_rerun']:>9.1f} {rss:>8} {per_session:>10}")
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+
+    saturated = saturation(levels, args.slo)
+    if saturated is None:
+        print(f"no saturation up to {args.sessions[-1]} sessions at {args.rate} clicks/s each")
+    else:
+        print(f"saturation at {saturated['sessions']} sessions "
+              f"({saturated['reruns_per_sec']:.2f} reruns/s, p95 {saturated['p95_ms']:.0f} ms)")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'levels': levels, 'saturation': saturated and saturated['sessions']}, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
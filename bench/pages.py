@@ -0,0 +1,193 @@
+"""Headless render benchmark for every page and tab, checked against baselines.
+
+Each view (an entry of the ``pages`` dict in ``main()`` plus one of its
+horizontal tabs) is opened with Streamlit's AppTest in a fresh session through
+its deep link, ``?page=<slug>&tab=<tab>``:
+
+* cold: first render after clearing every ``st.cache_data`` and
+  ``st.cache_resource`` entry (the call store stays on disk)
+* warm: median of repeated reruns once caches are filled
+* peak: peak traced Python/NumPy allocation during a cold render
+* payload: serialized size of the element tree the rerun produces
+
+Results are compared with ``bench/baselines.json``; a view regresses when a
+metric exceeds its baseline by the relative threshold plus a small absolute
+slack.  Only peak memory and payload size are checked by default: they do not
+depend on the machine, while timings do, so ``--timing`` checks those too and
+is only meaningful on the host that recorded the baselines.  The benchmark
+uses its own seeded call store and model registry under a temporary
+directory, with the demo feed off.
+
+Run from the repository root:
+
+    python bench/pages.py              # compare memory and payload, exit 1 on regressions
+    python bench/pages.py --timing     # also compare timings, on the baseline host
+    python bench/pages.py --update     # record new baselines
+"""
+import argparse
+import ast
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+from load_test import bench_env
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, 'App.py')
+BASELINES = os.path.join(ROOT, 'bench', 'baselines.json')
+
+# Metric -> (relative threshold, absolute slack); the slack on timings absorbs timer noise
+THRESHOLDS = {
+    'cold_ms': (0.5, 50.0),
+    'warm_ms': (0.5, 20.0),
+    'peak_mb': (0.3, 5.0),
+    'payload_kb': (0.2, 2.0),
+}
+TIMINGS = ('cold_ms', 'warm_ms')
+
+
+def discover_views(path=APP_PATH):
+    """(page slug, tab) for every page in main()'s map and every tab of that page"""
+    tree = ast.parse(open(path, encoding='utf-8').read())
+    dicts = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign) and isinstance(node.value, ast.Dict):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    dicts[target.id] = node.value
+    slugs = {page: slug for slug, page in ast.literal_eval(dicts['PAGE_SLUGS']).items()}
+    page_tabs = ast.literal_eval(dicts['PAGE_TABS'])
+    views = []
+    for page in (ast.literal_eval(key) for key in dicts['pages'].keys):
+        views.extend((page, slugs[page], tab) for tab in page_tabs.get(page, [None]))
+    return views
+
+
+def payload_bytes(node):
+    """Serialized size of an AppTest element tree"""
+    children = getattr(node, 'children', None)
+    if children:
+        return sum(payload_bytes(child) for child in children.values())
+    proto = getattr(node, 'proto', None)
+    return proto.ByteSize() if proto is not None else 0
+
+
+def clear_caches():
+    import streamlit as st
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+
+def view_test(page, slug, tab):
+    """AppTest session deep-linked to ``?page=<slug>&tab=<tab>``"""
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(APP_PATH, default_timeout=300)
+    at.query_params['page'] = slug
+    if tab:
+        at.query_params['tab'] = tab
+    return at
+
+
+def checked_run(at, label):
+    at.run()
+    if at.exception:
+        raise RuntimeError(f"{label}: {at.exception[0].value}")
+
+
+def measure(page, slug, tab, repeat):
+    label = f"{page} / {tab}" if tab else page
+
+    clear_caches()
+    at = view_test(page, slug, tab)
+    started = time.perf_counter()
+    checked_run(at, label)
+    cold = time.perf_counter() - started
+    payload = payload_bytes(at._tree)
+
+    warm = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        checked_run(at, label)
+        warm.append(time.perf_counter() - started)
+
+    clear_caches()
+    at = view_test(page, slug, tab)
+    tracemalloc.start()
+    try:
+        checked_run(at, label)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return label, {
+        'cold_ms': round(cold * 1000, 1),
+        'warm_ms': round(statistics.median(warm) * 1000, 1),
+        'peak_mb': round(peak / 2**20, 1),
+        'payload_kb': round(payload / 1024, 1),
+    }
+
+
+def regressions(results, baselines, timing=False):
+    found = []
+    for view, metrics in results.items():
+        base = baselines.get(view)
+        if base is None:
+            continue
+        for metric, (relative, slack) in THRESHOLDS.items():
+            if metric not in base or (metric in TIMINGS and not timing):
+                continue
+            limit = base[metric] * (1 + relative) + slack
+            if metrics[metric] > limit:
+                found.append(f"{view}: {metric} {metrics[metric]} > {limit:.1f} (baseline {base[metric]})")
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--update', action='store_true', help="write results as the new baselines")
+    parser.add_argument('--timing', action='store_true',
+                        help="also fail on timing regressions (baselines must come from this host)")
+    parser.add_argument('--repeat', type=int, default=5, help="warm reruns per view")
+    parser.add_argument('--baselines', default=BASELINES)
+    args = parser.parse_args(argv)
+
+    # Seeded once so cold runs measure rendering, not data generation
+    os.environ.update(bench_env('bench-pages-'))
+
+    views = discover_views()
+    # Pages import their heavy libraries lazily; render each once untimed so
+    # module imports are not charged to whichever view loads them first
+    for view in views:
+        checked_run(view_test(*view), "warm-up")
+
+    results = {}
+    for page, slug, tab in views:
+        label, metrics = measure(page, slug, tab, args.repeat)
+        results[label] = metrics
+        print(f"{label:<32} cold {metrics['cold_ms']:>8.1f} ms  warm {metrics['warm_ms']:>7.1f} ms  "
+              f"peak {metrics['peak_mb']:>6.1f} MB  payload {metrics['payload_kb']:>6.1f} KB")
+
+    if args.update:
+        with open(args.baselines, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"baselines written to {os.path.relpath(args.baselines, ROOT)}")
+        return 0
+
+    if not os.path.exists(args.baselines):
+        print("no baselines yet; run with --update")
+        return 0
+    with open(args.baselines) as f:
+        found = regressions(results, json.load(f), args.timing)
+    for line in found:
+        print(f"REGRESSION {line}")
+    checked = "memory, payload and timing" if args.timing else "memory and payload"
+    print(f"{len(found)} {checked} regression(s) across {len(results)} views")
+    return 1 if found else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""Cold-start time of the app server, with an import breakdown and a budget guard.
+
+A cold start is measured the way a freshly scheduled pod sees it: launch
+``streamlit run App.py`` in a new process, wait for the health check, then
+open one session and time until the Command Center has rendered.  The median
+of ``--runs`` starts must stay within ``--budget`` seconds.
+
+One extra start runs under ``python -X importtime`` to attribute import time
+to top-level packages.  The guard also fails if the first Command Center
+render imports pandas, Plotly or pyarrow, which only the pages that draw
+charts, tables or exports should load.
+
+Every start uses the same seeded call store under a temporary directory,
+with the demo feed off, as the load test does, so a start never seeds or
+appends to the repository's ``data/``.
+
+Run from the repository root:
+
+    python bench/startup.py                   # breakdown + budget check
+    python bench/startup.py --budget 3.5 --runs 5
+"""
+import argparse
+import asyncio
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+
+from load_test import SimulatedSession, bench_env, free_port, start_server
+
+DEFAULT_BUDGET = 2.5
+# Streamlit itself imports plotly.graph_objects, a cheap lazy shim, so only the
+# expensive entry points are checked
+HEAVY_MODULES = ('pandas', 'plotly.express', 'pyarrow')
+APP_MODULES = ('App', 'call_store', 'rollups', 'data_layer', 'matrix_theme', 'call_events',
+               'training_jobs', 'neural_engine', 'model_registry', 'perf_monitor', 'call_export',
+               'matrix_charts', 'leaderboard', 'series_pyramid', 'anomaly', 'forecast', 'staffing',
+               'call_generator')
+
+IMPORT_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def cold_start(env, python_args=(), stderr=None):
+    """Seconds to a healthy server and to the first rendered page"""
+    port = free_port()
+    started = time.perf_counter()
+    kwargs = {'stderr': stderr} if stderr is not None else {}
+    process = start_server(port, python_args, env=env, **kwargs)
+    try:
+        healthy = time.perf_counter() - started
+        session = SimulatedSession(f'ws://127.0.0.1:{port}/_stcore/stream')
+
+        async def first_render():
+            await session.connect()
+            await session.close()
+        asyncio.run(first_render())
+        return healthy, time.perf_counter() - started
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def import_breakdown(log_path):
+    """Cumulative import seconds per top-level package, plus every module imported"""
+    totals = {}
+    modules = set()
+    with open(log_path, errors='replace') as f:
+        for line in f:
+            match = IMPORT_LINE.match(line)
+            if not match:
+                continue
+            cumulative, indent, name = int(match.group(2)), match.group(3), match.group(4)
+            modules.add(name)
+            # Only outermost imports, so nested ones are not counted twice
+            if len(indent) == 1:
+                root = name.split('.')[0]
+                totals[root] = totals.get(root, 0.0) + cumulative / 1e6
+    return totals, modules
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET,
+                        help="maximum median seconds from launch to first render")
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--top', type=int, default=12, help="packages shown in the breakdown")
+    args = parser.parse_args(argv)
+    env = bench_env('bench-startup-')
+
+    with tempfile.NamedTemporaryFile('w+', suffix='.log', delete=False) as log:
+        log_path = log.name
+    try:
+        with open(log_path, 'w') as log:
+            cold_start(env, ('-X', 'importtime'), stderr=log)
+        totals, modules = import_breakdown(log_path)
+    finally:
+        os.remove(log_path)
+
+    print("import time by top-level package (first render, under -X importtime):")
+    for root, seconds in sorted(totals.items(), key=lambda item: -item[1])[:args.top]:
+        tag = "  (app)" if root in APP_MODULES else ""
+        print(f"  {root:<24} {seconds * 1000:>8.1f} ms{tag}")
+    print(f"  {'total':<24} {sum(totals.values()) * 1000:>8.1f} ms")
+
+    runs = [cold_start(env) for _ in range(args.runs)]
+    healthy = statistics.median(run[0] for run in runs)
+    first_render = statistics.median(run[1] for run in runs)
+    print(f"server healthy after {healthy:.2f}s, first render after {first_render:.2f}s "
+          f"(median of {args.runs}; budget {args.budget:.2f}s)")
+
+    failures = []
+    if first_render > args.budget:
+        failures.append(f"cold start {first_render:.2f}s exceeds the {args.budget:.2f}s budget")
+    loaded = [name for name in HEAVY_MODULES if name in modules]
+    if loaded:
+        failures.append(f"first Command Center render imported {', '.join(loaded)}")
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""Bytes the Matrix theme adds to every rerun: legacy inline CSS vs hashed static link.
+
+"legacy" is the markup apply_matrix_theme sent before the theme became a
+static asset, Google Fonts @import included, kept verbatim in
+``bench/legacy_theme.html``.
+
+Run from the repository root:
+
+    python bench/theme_bytes.py
+"""
+import os
+import sys
+
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def theme_script(root, mode):
+    import os
+    import sys
+    sys.path.insert(0, root)
+    import streamlit as st
+    from matrix_theme import build_theme
+
+    if mode == 'legacy':
+        with open(os.path.join(root, 'bench', 'legacy_theme.html'), encoding='utf-8') as f:
+            st.markdown(f.read(), unsafe_allow_html=True)
+    else:
+        st.markdown(build_theme().markup(mode == 'linked'), unsafe_allow_html=True)
+
+
+def rerun_bytes(mode):
+    """Serialized size of the theme element sent on one rerun"""
+    at = AppTest.from_function(theme_script, args=(ROOT, mode))
+    at.run()
+    return sum(element.proto.ByteSize() for element in at.markdown)
+
+
+def main():
+    results = {mode: rerun_bytes(mode) for mode in ('legacy', 'minified', 'linked')}
+    for mode, size in results.items():
+        print(f"{mode:>9}: {size:>7,} bytes/rerun")
+    print(f"reduction: {results['legacy'] / max(results['linked'], 1):,.0f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
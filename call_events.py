@@ -0,0 +1,252 @@
+"""In-process publish/subscribe of call events.
+
+Producers publish batches of call records (dicts of column arrays, the same shape
+``CallStore.append`` takes) to a ``CallEventBus``.  Consumers such as the
+store, the sliding counters and the live agent scores subscribe once per
+process with a callback and are pushed every batch; sessions only read their
+shared state, so a slow or closed browser tab never holds a queue.
+"""
+import logging
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from call_generator import concat_calls, trim_calls
+from leaderboard import AgentScores
+
+logger = logging.getLogger(__name__)
+
+# Most seconds of calls one demo feed batch covers while catching up
+CATCH_UP = 86400
+
+
+class CallEventBus:
+    """Fan-out of call batches to callbacks, plus a bounded log replayed to late subscribers"""
+
+    def __init__(self, history=3600):
+        self._lock = threading.Lock()
+        self._subscribers = []
+        self._log = deque(maxlen=history)
+        self.sequence = 0
+
+    def subscribe(self, callback, after=None):
+        """Push every future batch to ``callback``; returns an unsubscribe function
+
+        With ``after``, logged calls that started at or after that second are
+        replayed first, so a consumer seeded from the store up to ``after``
+        also gets the calls still on their way to it, each exactly once.
+        """
+        with self._lock:
+            if after is not None:
+                for batch in self._logged_after(after):
+                    callback(batch)
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+    def publish(self, batch):
+        """Deliver a batch to subscribers and log it for later ones"""
+        with self._lock:
+            self.sequence += 1
+            self._log.append(batch)
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(batch)
+            except Exception:
+                logger.exception("Call event subscriber failed")
+        return self.sequence
+
+    def _logged_after(self, after):
+        batches = []
+        for batch in self._log:
+            recent = np.asarray(batch['start']) >= after
+            if recent.any():
+                batches.append({name: np.asarray(values)[recent] for name, values in batch.items()})
+        return batches
+
+
+class DemoCallFeed:
+    """Background thread publishing a CallGenerator's calls to a bus as their start times pass
+
+    ``agents`` maps generator agent indices to store codes.  One day is
+    generated at a time and sliced per tick, so the live calls are the ones
+    the generator would have seeded for the same seconds.  ``start`` is the
+    first second to publish, normally just after the store's last call, so a
+    restart continues the stored history without a gap; a long gap is
+    caught up a day per batch without waiting between batches.
+    """
+
+    def __init__(self, bus, generator, agents, tick=1.0, start=None):
+        self.bus = bus
+        self.generator = generator
+        self.agents = np.asarray(agents)
+        self.tick = tick
+        self._day = None
+        self._until = None if start is None else int(start)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="demo-call-feed", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def make_batch(self, now):
+        """Calls that started since the previous batch (or during the last tick) up to ``now``, at most a day"""
+        t1 = int(now)
+        t0 = t1 - max(int(self.tick), 1) if self._until is None else self._until
+        t1 = min(t1, t0 + CATCH_UP)
+        self._until = max(t0, t1)
+        parts = []
+        # At least the day of t0, so an empty tick still yields empty columns
+        for day in range(t0 // 86400, max(-(-t1 // 86400), t0 // 86400 + 1)):
+            if self._day is None or self._day[0] != day:
+                self._day = (day, self.generator.day(day))
+            parts.append(trim_calls(self._day[1], t0, t1))
+        batch = concat_calls(parts)
+        return dict(batch, agent=self.agents[batch['agent']])
+
+    def _run(self):
+        delay = self.tick
+        while not self._stop.wait(delay):
+            now = time.time()
+            batch = self.make_batch(now)
+            if len(batch['start']):
+                self.bus.publish(batch)
+            delay = 0 if self._until < int(now) else self.tick
+
+
+class SlidingCategoryCounter:
+    """Per-category call counts over several trailing windows, shared by every session
+
+    Calls are counted into a ring of one-second buckets spanning the longest
+    window, and every window keeps a running total.  A call is added to each
+    window it falls in; as the clock moves on, the buckets leaving a window
+    are subtracted from it.  Counting costs O(windows) per call, reading
+    every window costs O(categories), and memory is fixed at one bucket per
+    second of the longest window.  The clock is the newest call start seen,
+    so a quiet feed leaves the counts as they were.
+    """
+
+    def __init__(self, n_categories, windows=(60, 300, 900, 3600)):
+        self.windows = tuple(sorted(windows))
+        self.span = self.windows[-1]
+        self.clock = None
+        self._lock = threading.Lock()
+        self._ring = np.zeros((self.span, n_categories), dtype=np.int64)
+        self._totals = np.zeros((len(self.windows), n_categories), dtype=np.int64)
+
+    def add(self, start, category):
+        """Count calls by start second and category code; calls older than the span are dropped"""
+        start = np.asarray(start, dtype=np.int64)
+        if len(start) == 0:
+            return
+        category = np.asarray(category, dtype=np.int64)
+        n_categories = self._ring.shape[1]
+        with self._lock:
+            newest = int(start.max())
+            if self.clock is None or newest > self.clock:
+                self._advance(newest)
+            age = self.clock - start
+            recent = age < self.span
+            start, category, age = start[recent], category[recent], age[recent]
+            np.add.at(self._ring, (start % self.span, category), 1)
+            for i, window in enumerate(self.windows):
+                self._totals[i] += np.bincount(category[age < window], minlength=n_categories)
+
+    def _advance(self, now):
+        if self.clock is None or now - self.clock >= self.span:
+            self._ring[:] = 0
+            self._totals[:] = 0
+            self.clock = now
+            return
+        for i, window in enumerate(self.windows):
+            # Counted seconds that are ``window`` old at the new clock leave this window
+            leaving = np.arange(self.clock - window + 1, min(now - window, self.clock) + 1)
+            self._totals[i] -= self._ring[leaving % self.span].sum(axis=0)
+        self._ring[np.arange(self.clock + 1, now + 1) % self.span] = 0
+        self.clock = now
+
+    def counts(self, window):
+        """Calls per category over the last ``window`` seconds"""
+        with self._lock:
+            return self._totals[self.windows.index(window)].copy()
+
+    def snapshot(self):
+        """Window -> calls per category, for every window"""
+        with self._lock:
+            return {window: totals.copy() for window, totals in zip(self.windows, self._totals)}
+
+
+class LiveAgentScores:
+    """Per-agent totals over a trailing window, shared by every session and fed by the bus
+
+    The totals are seeded once from the store, then every published batch is
+    added as it arrives and subtracted again once it leaves the window, so
+    no rerun rescans history or rebuilds the scores.  Reads take the same
+    lock as the bus thread's updates.
+    """
+
+    def __init__(self, store, bus, window=3600):
+        self.store = store
+        self.window = window
+        self._lock = threading.Lock()
+        self._batches = deque()
+        self.agents = AgentScores(len(store.agents), len(store.categories))
+        now = store.latest_start()
+        if now is not None:
+            recent = store.window(now - window, now + 1, ['start', 'category', 'agent', 'satisfaction'])
+            # Seed minute by minute so the seed ages out of the window gradually
+            minutes = np.searchsorted(recent['start'], np.arange(now - window, now + 1, 60)[1:])
+            for chunk in zip(*(np.split(recent[name], minutes) for name in recent)):
+                self._add(dict(zip(recent, chunk)))
+        # Published calls not yet written to the store are replayed from the bus log
+        bus.subscribe(self.add, after=-np.inf if now is None else now + 1)
+
+    def add(self, batch):
+        """Count a published batch and drop batches that left the window"""
+        with self._lock:
+            self._add(batch)
+
+    def _add(self, batch):
+        if len(batch['start']) == 0:
+            return
+        summary = (
+            int(batch['start'].max()),
+            np.asarray(batch['agent'], dtype=np.int64),
+            np.asarray(batch['category'], dtype=np.int64),
+            np.asarray(batch['satisfaction'], dtype=np.float64),
+        )
+        self._apply(summary, 1)
+        self._batches.append(summary)
+        while self._batches[0][0] < summary[0] - self.window:
+            self._apply(self._batches.popleft(), -1)
+
+    def _apply(self, summary, sign):
+        _, agents, categories, satisfaction = summary
+        self.agents.add(agents, categories, satisfaction, sign)
+
+    def top_agents(self, k=10):
+        """Agent codes and mean satisfaction of the ``k`` best agents in the window"""
+        codes, score, _, _ = self.page(k)
+        return codes, score
+
+    def ranked(self, categories=None, min_calls=1):
+        with self._lock:
+            return self.agents.ranked(categories, min_calls)
+
+    def page(self, k=10, offset=0, categories=None, min_calls=1):
+        with self._lock:
+            return self.agents.page(k, offset, categories, min_calls)
@@ -0,0 +1,247 @@
+"""Streaming CSV and Parquet exports of call data and rollup reports.
+
+An export pulls fixed-size chunks from the data layer and writes each one
+with pyarrow before asking for the next, so memory stays flat however many
+rows are selected.  Each session writes into its own directory under
+``static/exports``, named by a random 128-bit token that only that session
+knows, and downloads its files from Streamlit's static route, which streams
+them from disk.  Parts stay under the route's 200MB file limit.  Without
+static serving, downloads go through ``st.download_button``, which holds a
+whole file in memory, so parts are capped at ``BUTTON_PART_BYTES``.  An
+``ExportPruner`` thread deletes files once they are an hour old.
+"""
+import gzip
+import os
+import secrets
+import shutil
+import threading
+import time
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+from call_store import COLUMNS
+
+EXPORT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'exports')
+EXPORT_URL = 'app/static/exports'
+EXPORT_CHUNK_ROWS = 250_000
+MAX_PART_BYTES = 190 * 1024 * 1024
+BUTTON_PART_BYTES = 8 * 1024 * 1024
+EXPORT_TTL = 3600
+PRUNE_INTERVAL = 300
+
+FORMATS = {'CSV': '.csv.gz', 'Parquet': '.parquet'}
+MIME_TYPES = {'.csv.gz': 'application/gzip', '.parquet': 'application/vnd.apache.parquet'}
+
+# Dataset name -> rollup resolution (None for raw calls)
+DATASETS = {
+    'Calls': None,
+    'Hourly Report': 'hourly',
+    'Daily Report': 'daily',
+    'Monthly Report': 'monthly',
+}
+
+REPORT_COLUMNS = ['start', 'calls', 'response_time', 'satisfaction']
+
+
+def dataset_columns(dataset):
+    return list(COLUMNS) if DATASETS[dataset] is None else list(REPORT_COLUMNS)
+
+
+def to_record_batch(chunk, store):
+    """Arrow batch for a chunk, with times as timestamps and codes as names"""
+    arrays = []
+    for name, values in chunk.items():
+        if name in ('start', 'end'):
+            arrays.append(pa.array(np.asarray(values, dtype=np.int64).astype('datetime64[s]')))
+        elif name == 'category':
+            arrays.append(pa.DictionaryArray.from_arrays(values.astype(np.int32), store.categories))
+        elif name == 'agent':
+            arrays.append(pa.DictionaryArray.from_arrays(values.astype(np.int32), store.agents))
+        else:
+            arrays.append(pa.array(values))
+    return pa.RecordBatch.from_arrays(arrays, list(chunk))
+
+
+class PartWriter:
+    """Writes record batches to part files of at most about ``max_part_bytes``"""
+
+    def __init__(self, stem, fmt, max_part_bytes=MAX_PART_BYTES):
+        self.stem = stem
+        self.fmt = fmt
+        self.max_part_bytes = max_part_bytes
+        self.paths = []
+        self._file = None
+        self._stream = None
+        self._writer = None
+
+    def _open(self, schema):
+        path = f"{self.stem}.part{len(self.paths) + 1:03d}{FORMATS[self.fmt]}"
+        self.paths.append(path)
+        self._file = open(path, 'wb')
+        if self.fmt == 'CSV':
+            # Fastest gzip level: arrow's default level is several times slower
+            self._stream = gzip.GzipFile(fileobj=self._file, mode='wb', compresslevel=1)
+            self._writer = pa_csv.CSVWriter(pa.PythonFile(self._stream, mode='w'), schema)
+        else:
+            self._writer = pq.ParquetWriter(self._file, schema, compression='zstd')
+
+    def _close(self):
+        if self._writer is not None:
+            self._writer.close()
+            if self._stream is not None:
+                self._stream.close()
+            self._file.close()
+        self._file = self._stream = self._writer = None
+
+    def write(self, batch):
+        if self._writer is None:
+            self._open(batch.schema)
+        self._writer.write_batch(batch)
+        # Bytes already on disk; a part is closed once it nears the limit
+        if self._file.tell() >= self.max_part_bytes:
+            self._close()
+
+    def close(self):
+        """Finish the last part; a single part drops its ``.part001`` suffix"""
+        self._close()
+        if len(self.paths) == 1:
+            single = f"{self.stem}{FORMATS[self.fmt]}"
+            os.replace(self.paths[0], single)
+            self.paths = [single]
+        return self.paths
+
+
+class CallExport:
+    """One export of calls or a rollup report over [t0, t1)
+
+    ``run()`` is a generator yielding ``(rows_written, total_rows)`` after
+    each chunk; once it is exhausted ``files`` lists the written file names.
+    """
+
+    def __init__(self, data, dataset, fmt, t0, t1, columns=None, directory=EXPORT_DIR,
+                 chunk_rows=EXPORT_CHUNK_ROWS, max_part_bytes=MAX_PART_BYTES):
+        self.data = data
+        self.dataset = dataset
+        self.fmt = fmt
+        self.t0 = t0
+        self.t1 = t1
+        self.columns = [c for c in dataset_columns(dataset) if c in (columns or dataset_columns(dataset))]
+        self.directory = directory
+        self.chunk_rows = chunk_rows
+        self.max_part_bytes = max_part_bytes
+        self.files = []
+
+    def _chunks(self):
+        resolution = DATASETS[self.dataset]
+        if resolution is None:
+            rows = self.data.store.row_range(self.t0, self.t1)
+            return rows.stop - rows.start, self.data.iter_calls(self.t0, self.t1, self.columns,
+                                                                self.chunk_rows)
+        summary = self.data.rollups.summary(resolution, self.t0, self.t1)
+        total = len(summary['start'])
+        return total, ({name: summary[name][lo:lo + self.chunk_rows] for name in self.columns}
+                       for lo in range(0, total, self.chunk_rows))
+
+    def run(self):
+        os.makedirs(self.directory, exist_ok=True)
+        day = time.strftime('%Y%m%d', time.gmtime(self.t0))
+        last_day = time.strftime('%Y%m%d', time.gmtime(self.t1 - 1))
+        name = self.dataset.lower().replace(' ', '-')
+        stem = os.path.join(self.directory, f"{name}-{day}-{last_day}-{secrets.token_hex(6)}")
+
+        total, chunks = self._chunks()
+        writer = PartWriter(stem, self.fmt, self.max_part_bytes)
+        written = 0
+        try:
+            for chunk in chunks:
+                writer.write(to_record_batch(chunk, self.data.store))
+                written += len(chunk[self.columns[0]])
+                yield written, total
+            if written == 0:
+                empty = {name: np.array([], dtype=COLUMNS.get(name, np.float64)) for name in self.columns}
+                writer.write(to_record_batch(empty, self.data.store))
+                yield 0, 0
+        finally:
+            paths = writer.close()
+        self.files = [os.path.basename(path) for path in paths]
+
+
+def new_session_dir():
+    """Name of a fresh per-session export directory, unguessable by other sessions"""
+    return secrets.token_hex(16)
+
+
+def session_path(session_dir, directory=EXPORT_DIR):
+    return os.path.join(directory, os.path.basename(session_dir))
+
+
+def export_path(session_dir, filename, directory=EXPORT_DIR):
+    return os.path.join(session_path(session_dir, directory), os.path.basename(filename))
+
+
+def export_url(session_dir, filename):
+    """Static route URL of an export file, relative to the app page"""
+    return f"{EXPORT_URL}/{os.path.basename(session_dir)}/{os.path.basename(filename)}"
+
+
+def export_mime(filename):
+    return next((mime for suffix, mime in MIME_TYPES.items() if filename.endswith(suffix)),
+                'application/octet-stream')
+
+
+def read_export(session_dir, filename, directory=EXPORT_DIR):
+    """Contents of an export file, for st.download_button when static serving is off"""
+    with open(export_path(session_dir, filename, directory), 'rb') as f:
+        return f.read()
+
+
+def prune_exports(directory=EXPORT_DIR, max_age=EXPORT_TTL):
+    """Delete export files older than ``max_age`` seconds, and session directories left empty"""
+    if not os.path.isdir(directory):
+        return
+    cutoff = time.time() - max_age
+    for session in os.scandir(directory):
+        try:
+            if not session.is_dir():
+                if session.stat().st_mtime < cutoff:
+                    os.remove(session.path)
+                continue
+            # Deleting files touches the directory, so its age is read first
+            idle = session.stat().st_mtime < cutoff
+            for entry in os.scandir(session.path):
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            if idle and not os.listdir(session.path):
+                shutil.rmtree(session.path, ignore_errors=True)
+        except FileNotFoundError:
+            pass
+
+
+class ExportPruner:
+    """Background thread deleting expired exports every ``interval`` seconds"""
+
+    def __init__(self, directory=EXPORT_DIR, max_age=EXPORT_TTL, interval=PRUNE_INTERVAL):
+        self.directory = directory
+        self.max_age = max_age
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="export-pruner", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while True:
+            prune_exports(self.directory, self.max_age)
+            if self._stop.wait(self.interval):
+                return
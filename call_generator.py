@@ -0,0 +1,172 @@
+"""Seeded synthetic call events for the demo store, the live demo feed and benchmarks.
+
+``CallGenerator`` draws calls from a fixed model of a contact center.
+Arrivals follow an hour-of-week curve per category: a morning and an
+afternoon peak on weekdays, quieter weekends, technical calls early in the
+day and sales calls late.  Each call goes to an agent skilled in its
+category, and handle time, response time and satisfaction depend on the
+category, that agent's proficiency and how busy the hour is.  Every step is
+a NumPy operation over whole arrays, with no per-call Python.
+
+Each UTC day is drawn from its own random stream, seeded by (seed, day), so
+a day's calls are identical whatever range, chunk size or order it is
+generated in.
+"""
+import time
+
+import numpy as np
+
+from call_store import CATEGORIES, CATEGORY_MIX
+
+# Hours by which each category's daily curve is shifted, in CATEGORIES order
+CATEGORY_SHIFTS = np.array([-1.0, -0.5, 2.5, 0.5, 0.0])
+
+# Median handle time in seconds per category, and the spread of its lognormal
+HANDLE_MEDIANS = np.array([420.0, 240.0, 330.0, 360.0, 180.0])
+HANDLE_SIGMA = 0.55
+
+# Relative volume per day of the week, Monday first
+WEEKDAY_VOLUME = np.array([1.15, 1.1, 1.05, 1.05, 1.0, 0.6, 0.45])
+
+# Spread of the day-to-day volume factor
+DAY_SIGMA = 0.03
+
+# Low bits of the sort key that carry the category
+CATEGORY_BITS = 3
+
+# Stream of the agent roster, past any day number
+ROSTER_STREAM = 2**32 - 1
+
+
+def daily_curve(hours):
+    """Relative call volume at fractional hours of the day: peaks at 10:30 and 15:00 over a night floor"""
+    return (0.08 + np.exp(-0.5 * ((hours - 10.5) / 1.8) ** 2)
+            + 0.8 * np.exp(-0.5 * ((hours - 15.0) / 2.2) ** 2))
+
+
+def trim_calls(calls, t0, t1):
+    """Calls of a start-ordered batch that started in [t0, t1)"""
+    lo, hi = np.searchsorted(calls['start'], [t0, t1])
+    return {name: values[lo:hi] for name, values in calls.items()}
+
+
+def concat_calls(parts):
+    """One batch from start-ordered batches that follow each other"""
+    if len(parts) == 1:
+        return parts[0]
+    return {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+
+
+class CallGenerator:
+    """Deterministic synthetic calls: ``calls_per_day`` on an average day across ``agents`` agents
+
+    Agents are named Agent-001 onwards; the ``agent`` column holds indices
+    into ``agent_names``.
+    """
+
+    def __init__(self, calls_per_day=12000, agents=250, seed=7):
+        self.calls_per_day = calls_per_day
+        self.seed = seed
+        self.agent_names = [f"Agent-{i:03d}" for i in range(1, agents + 1)]
+        n_categories = len(CATEGORIES)
+
+        # Expected calls per hour of the week (Monday 00:00 first) and category
+        hours = np.arange(168)
+        curve = daily_curve((hours % 24)[:, None] - CATEGORY_SHIFTS[None, :])
+        rates = curve * np.asarray(CATEGORY_MIX) * WEEKDAY_VOLUME[hours // 24, None]
+        self.hour_rates = rates * (7 * calls_per_day / rates.sum())
+        # How busy each hour is next to the average hour, which slows first responses
+        totals = self.hour_rates.sum(axis=1)
+        self.hour_load = totals / totals.mean()
+
+        # Every agent has a primary skill and some secondary ones; proficiency scales handle time
+        rng = np.random.default_rng([seed, ROSTER_STREAM])
+        primary = rng.choice(n_categories, agents, p=CATEGORY_MIX)
+        skills = rng.random((agents, n_categories)) < 0.3
+        skills[np.arange(agents), primary] = True
+        self.proficiency = np.clip(rng.normal(1.0, 0.15, (agents, n_categories)), 0.6, 1.4)
+        self.proficiency[np.arange(agents), primary] += 0.1
+        # Per-call arithmetic stays in float32, the width the store keeps
+        self.proficiency = self.proficiency.astype(np.float32)
+        self.handle_medians = HANDLE_MEDIANS.astype(np.float32)
+        # Skilled agents per category, padded to a table a call indexes with one uniform draw
+        self.pool_sizes = skills.sum(axis=0)
+        self.pools = np.zeros((n_categories, self.pool_sizes.max()), dtype=np.int64)
+        for category in range(n_categories):
+            members = np.flatnonzero(skills[:, category])
+            self.pools[category, :len(members)] = members
+
+    def calls(self, rng, t0, t1, scale=1.0):
+        """Calls starting in [t0, t1), ordered by start, with volume times ``scale``"""
+        hours = np.arange(t0 // 3600, -(-t1 // 3600))
+        lo = np.maximum(hours * 3600, t0)
+        hi = np.minimum(hours * 3600 + 3600, t1)
+        # Epoch hour 0 was a Thursday, hour 72 of the week
+        slot = (hours + 72) % 168
+        counts = rng.poisson(scale * self.hour_rates[slot] * ((hi - lo) / 3600)[:, None])
+        n_categories = counts.shape[1]
+        hour = np.repeat(np.arange(len(hours)), counts.sum(axis=1))
+        category = np.repeat(np.tile(np.arange(n_categories), len(hours)), counts.ravel())
+        start = lo[hour] + (rng.random(len(hour), dtype=np.float32) * (hi - lo)[hour]).astype(np.int64)
+        # One sort of start and category packed together orders calls and keeps their categories
+        key = start << CATEGORY_BITS | category
+        key.sort()
+        start, category = key >> CATEGORY_BITS, key & (1 << CATEGORY_BITS) - 1
+        n = len(key)
+
+        pick = (rng.random(n, dtype=np.float32) * self.pool_sizes[category]).astype(np.int64)
+        agent = self.pools[category, pick]
+        proficiency = self.proficiency[agent, category]
+        noise = rng.standard_normal((3, n), dtype=np.float32)
+        handle = self.handle_medians[category] * np.exp(HANDLE_SIGMA * noise[0]) / proficiency
+        # Busy hours answer more slowly, as do less proficient agents
+        busy = np.sqrt(self.hour_load[slot]).astype(np.float32)[start // 3600 - hours[0]]
+        response_time = 0.35 * np.exp(0.35 * noise[1]) * busy / np.sqrt(proficiency)
+        satisfaction = (92 + 5 * noise[2] - 4 * (response_time - 0.35)
+                        - 3 * HANDLE_SIGMA * noise[0] + 8 * (proficiency - 1))
+        return {
+            'start': start,
+            'end': start + handle.astype(np.int64) + 15,
+            'category': category.astype(np.uint8),
+            'agent': agent,
+            'response_time': response_time.astype(np.float32),
+            'satisfaction': np.clip(satisfaction, 0, 100).astype(np.float32),
+        }
+
+    def day(self, day):
+        """Every call of UTC day number ``day``, from that day's own stream"""
+        rng = np.random.default_rng([self.seed, day])
+        return self.calls(rng, day * 86400, (day + 1) * 86400, scale=rng.lognormal(0.0, DAY_SIGMA))
+
+    def chunks(self, begin, end, chunk_rows=1 << 20):
+        """Calls starting in [begin, end), oldest first, in chunks of whole days of at least ``chunk_rows`` rows
+
+        The first and last days are trimmed to the range; the final chunk
+        may be shorter.
+        """
+        pending, rows = [], 0
+        for day in range(begin // 86400, -(-end // 86400)):
+            calls = trim_calls(self.day(day), begin, end)
+            pending.append(calls)
+            rows += len(calls['start'])
+            if rows >= chunk_rows:
+                yield concat_calls(pending)
+                pending, rows = [], 0
+        if rows:
+            yield concat_calls(pending)
+
+    def fill(self, store, begin, end, chunk_rows=1 << 20):
+        """Append the calls of [begin, end) to ``store`` chunk by chunk; returns the store version"""
+        codes = store.agent_codes(self.agent_names)
+        for calls in self.chunks(begin, end, chunk_rows):
+            calls['agent'] = codes[calls['agent']]
+            store.append(calls)
+        return store.version
+
+
+def seed_demo_calls(store, days=90, calls_per_day=12000, seed=7, end=None):
+    """Fill an empty store with ``days`` of generated traffic ending at ``end``"""
+    if store.rows:
+        return store.version
+    end = int(end if end is not None else time.time())
+    return CallGenerator(calls_per_day, seed=seed).fill(store, end - days * 86400, end)
@@ -0,0 +1,248 @@
+"""Append-only, column-oriented call event store backed by memory-mapped files.
+
+Every column lives in its own flat binary file under the store directory and
+is exposed to readers as a read-only ``np.memmap``.  Slicing a time range
+returns views into the mapping, so sessions share the OS page cache instead
+of copying whole columns into their own DataFrames.
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CATEGORIES = ['Technical', 'Billing', 'Sales', 'Support', 'General']
+CATEGORY_MIX = [0.3, 0.2, 0.15, 0.25, 0.1]
+
+# Column name -> on-disk dtype (little-endian, fixed width)
+COLUMNS = {
+    'start': np.dtype('<i8'),          # call start, epoch seconds
+    'end': np.dtype('<i8'),            # call end, epoch seconds
+    'category': np.dtype('u1'),        # index into CATEGORIES
+    'agent': np.dtype('<u4'),          # index into the agent dictionary
+    'response_time': np.dtype('<f4'),  # seconds until first response
+    'satisfaction': np.dtype('<f4'),   # 0-100 survey score
+}
+
+DEFAULT_STORE_DIR = os.environ.get(
+    'CALL_STORE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'calls')
+)
+
+
+class CallStore:
+    """Columnar call log with memory-mapped, zero-copy reads"""
+
+    META_FILE = 'meta.json'
+
+    def __init__(self, path=DEFAULT_STORE_DIR):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._lock = threading.RLock()
+        self._maps = {}
+        self._load_meta()
+        self._repair()
+
+    # Metadata -------------------------------------------------------------
+
+    def _load_meta(self):
+        meta_path = os.path.join(self.path, self.META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+        else:
+            meta = {'rows': 0, 'version': 0, 'categories': CATEGORIES, 'agents': []}
+        self.rows = meta['rows']
+        self.version = meta['version']
+        self.categories = meta['categories']
+        self.agents = meta['agents']
+
+    def _write_meta(self):
+        meta = {
+            'rows': self.rows,
+            'version': self.version,
+            'categories': self.categories,
+            'agents': self.agents,
+        }
+        tmp_path = os.path.join(self.path, self.META_FILE + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, os.path.join(self.path, self.META_FILE))
+
+    def _column_path(self, name):
+        return os.path.join(self.path, f"{name}.bin")
+
+    def _repair(self):
+        """Drop bytes written past the committed row count by an interrupted append"""
+        for name, dtype in COLUMNS.items():
+            col_path = self._column_path(name)
+            expected = self.rows * dtype.itemsize
+            if not os.path.exists(col_path):
+                open(col_path, 'wb').close()
+            elif os.path.getsize(col_path) > expected:
+                with open(col_path, 'r+b') as f:
+                    f.truncate(expected)
+
+    def refresh(self):
+        """Pick up rows committed by another process"""
+        with self._lock:
+            self._load_meta()
+
+    # Writes ---------------------------------------------------------------
+
+    def agent_codes(self, names):
+        """Map agent names to dictionary codes, registering unseen names"""
+        with self._lock:
+            index = {name: i for i, name in enumerate(self.agents)}
+            codes = np.empty(len(names), dtype=COLUMNS['agent'])
+            for i, name in enumerate(names):
+                if name not in index:
+                    index[name] = len(self.agents)
+                    self.agents.append(name)
+                codes[i] = index[name]
+            return codes
+
+    def append(self, records):
+        """Append a batch of calls given as a dict of equal-length column arrays
+
+        The batch is ordered by start time and must not start before the last
+        committed call, which keeps ``start`` sorted for range lookups.
+        """
+        missing = set(COLUMNS) - set(records)
+        if missing:
+            raise ValueError(f"Missing call columns: {sorted(missing)}")
+
+        batch = {name: np.asarray(records[name], dtype=dtype) for name, dtype in COLUMNS.items()}
+        n = len(batch['start'])
+        if any(len(col) != n for col in batch.values()):
+            raise ValueError("Call columns must have equal length")
+        if n == 0:
+            return self.version
+
+        if np.any(batch['start'][1:] < batch['start'][:-1]):
+            order = np.argsort(batch['start'], kind='stable')
+            batch = {name: col[order] for name, col in batch.items()}
+
+        with self._lock:
+            if self.rows and batch['start'][0] < self.latest_start():
+                raise ValueError("Calls must be appended in start-time order")
+            for name, col in batch.items():
+                with open(self._column_path(name), 'ab') as f:
+                    f.write(col.tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+            self.rows += n
+            self.version += 1
+            self._write_meta()
+            return self.version
+
+    # Reads ----------------------------------------------------------------
+
+    def column(self, name):
+        """Return a read-only view of a whole column without copying it"""
+        with self._lock:
+            rows = self.rows
+            mapped = self._maps.get(name)
+            if mapped is None or len(mapped) < rows:
+                if rows == 0:
+                    return np.empty(0, dtype=COLUMNS[name])
+                mapped = np.memmap(self._column_path(name), dtype=COLUMNS[name],
+                                   mode='r', shape=(rows,))
+                self._maps[name] = mapped
+            return mapped[:rows]
+
+    def latest_start(self):
+        """Start time of the most recent call, or None when empty"""
+        if self.rows == 0:
+            return None
+        return int(self.column('start')[-1])
+
+    def earliest_start(self):
+        """Start time of the oldest call, or None when empty"""
+        if self.rows == 0:
+            return None
+        return int(self.column('start')[0])
+
+    def row_range(self, t0, t1):
+        """Row slice of calls that started in [t0, t1)"""
+        start = self.column('start')
+        lo, hi = np.searchsorted(start, [t0, t1], side='left')
+        return slice(int(lo), int(hi))
+
+    def window(self, t0, t1, columns=None):
+        """Column views for calls that started in [t0, t1)"""
+        rows = self.row_range(t0, t1)
+        return {name: self.column(name)[rows] for name in (columns or COLUMNS)}
+
+
+class AppendBuffer:
+    """Collects call batches and appends them to a CallStore in fewer, larger writes
+
+    Every ``CallStore.append`` fsyncs each column file, which is too much
+    for a feed publishing every second.  Batches are held in memory and
+    written together every ``interval`` seconds by a background thread, or
+    straight away once ``max_rows`` calls are waiting.  Buffered calls are
+    not visible to store readers until they are flushed.
+    """
+
+    def __init__(self, store, interval=5.0, max_rows=100_000):
+        self.store = store
+        self.interval = interval
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        # Held while writing, so flushes reach the store in the order they were taken
+        self._write_lock = threading.Lock()
+        self._pending = []
+        self._rows = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="call-store-flush", daemon=True)
+            self._thread.start()
+            atexit.register(self.flush)
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self.flush()
+
+    def append(self, records):
+        """Queue a batch; writes everything queued once ``max_rows`` calls are waiting"""
+        n = len(records['start'])
+        if n == 0:
+            return
+        with self._lock:
+            self._pending.append(records)
+            self._rows += n
+            full = self._rows >= self.max_rows
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Append every queued batch to the store in one write; returns the store version"""
+        with self._write_lock:
+            with self._lock:
+                pending, self._pending, self._rows = self._pending, [], 0
+            if not pending:
+                return self.store.version
+            if len(pending) == 1:
+                return self.store.append(pending[0])
+            return self.store.append({name: np.concatenate([batch[name] for batch in pending])
+                                      for name in COLUMNS})
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.flush()
+            except Exception:
+                # Keep flushing later batches; the failed ones are dropped and logged
+                logger.exception("Failed to append buffered calls")
@@ -0,0 +1,212 @@
+"""Process-wide cached data access for the analytics pages.
+
+``DatasetCache`` is an LRU shared by every session.  Each dataset has its own
+TTL: an entry stays valid while the store version it was computed from is
+current, and once the store moves on it is reused until its TTL runs out.
+That bounds staleness per dataset while computing each aggregate at most
+once per refresh interval, no matter how many viewers rerun.  Entries are
+evicted least-recently-used first once their estimated size passes the
+memory ceiling.
+"""
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Seconds a dataset may lag behind newly appended calls
+DATASET_TTLS = {
+    'dashboard_metrics': 5,
+    'hourly_volume': 30,
+    'report': 60,
+    'categories': 3600,
+    'agents': 300,
+}
+
+
+def estimate_nbytes(value):
+    """Approximate memory held by a cached value"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sum(estimate_nbytes(k) + estimate_nbytes(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_nbytes(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class CacheEntry:
+    __slots__ = ('value', 'version', 'computed_at', 'nbytes')
+
+    def __init__(self, value, version, computed_at, nbytes):
+        self.value = value
+        self.version = version
+        self.computed_at = computed_at
+        self.nbytes = nbytes
+
+
+class DatasetCache:
+    """Thread-safe LRU of computed datasets with TTLs and a byte ceiling"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight = {}
+
+    def _fresh(self, entry, version, ttl, now):
+        return entry.version == version or now - entry.computed_at < ttl
+
+    def get(self, key, version, ttl, compute):
+        """Return the cached value for ``key`` or compute it exactly once
+
+        Concurrent callers asking for the same stale key wait for the single
+        in-flight computation instead of repeating it.
+        """
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and self._fresh(entry, version, ttl, time.monotonic()):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry.value
+                pending = self._inflight.get(key)
+                if pending is None:
+                    pending = self._inflight[key] = threading.Event()
+                    break
+            pending.wait()
+
+        try:
+            value = compute()
+            self._put(key, CacheEntry(value, version, time.monotonic(), estimate_nbytes(value)))
+            return value
+        finally:
+            with self._lock:
+                self.misses += 1
+                self._inflight.pop(key, None)
+            pending.set()
+
+    def _put(self, key, entry):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= old.nbytes
+            if entry.nbytes > self.max_bytes:
+                return
+            self._entries[key] = entry
+            self.nbytes += entry.nbytes
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+
+    def invalidate(self, name=None):
+        """Drop every entry, or only those of one dataset"""
+        with self._lock:
+            for key in list(self._entries):
+                if name is None or key[0] == name:
+                    self.nbytes -= self._entries.pop(key).nbytes
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.nbytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+class CallDataLayer:
+    """Cached aggregates over a CallStore and its rollups, shared by all sessions
+
+    Returned frames and arrays are shared between sessions and must be
+    treated as read-only.
+    """
+
+    def __init__(self, store, rollups, cache=None, ttls=None):
+        self.store = store
+        self.rollups = rollups
+        self.cache = cache or DatasetCache()
+        self.ttls = dict(DATASET_TTLS, **(ttls or {}))
+
+    def _cached(self, name, args, compute):
+        return self.cache.get((name,) + tuple(args), self.store.version,
+                              self.ttls[name], compute)
+
+    def invalidate(self, name=None):
+        self.cache.invalidate(name)
+
+    def now(self):
+        """Reference time for 'live' views: the most recent call start"""
+        return self.store.latest_start() or int(time.time())
+
+    def categories(self):
+        return self._cached('categories', (), lambda: list(self.store.categories))
+
+    def agents(self):
+        return self._cached('agents', (), lambda: list(self.store.agents))
+
+    def dashboard_metrics(self):
+        """Active calls, response time and satisfaction around the latest call"""
+        def compute():
+            now = self.now()
+            recent = self.store.window(now - 7200, now + 1, ['start', 'end', 'response_time'])
+            last_hour = recent['start'] >= now - 3600
+            response_now = float(recent['response_time'][last_hour].mean()) if last_hour.any() else 0.0
+            response_before = (float(recent['response_time'][~last_hour].mean())
+                               if (~last_hour).any() else response_now)
+            day = self.store.window(now - 86400, now + 1, ['satisfaction'])
+            return {
+                'active_now': int(np.count_nonzero(recent['end'] > now)),
+                'active_before': int(np.count_nonzero(
+                    (recent['start'] <= now - 3600) & (recent['end'] > now - 3600))),
+                'response_now': response_now,
+                'response_before': response_before,
+                'satisfaction': float(day['satisfaction'].mean()) if len(day['satisfaction']) else 0.0,
+            }
+        return self._cached('dashboard_metrics', (), compute)
+
+    def hourly_volume(self, hours=24):
+        """Calls per hour for the last ``hours`` hourly buckets"""
+        def compute():
+            hour_end = (self.now() // 3600 + 1) * 3600
+            return pd.DataFrame({
+                'hour': range(hours),
+                'calls': self.rollups.summary('hourly', hour_end - hours * 3600, hour_end)['calls']
+            })
+        return self._cached('hourly_volume', (hours,), compute)
+
+    def report(self, resolution, buckets):
+        """Per-bucket call totals for the last ``buckets`` buckets of a rollup"""
+        def compute():
+            day_end = (self.now() // 86400 + 1) * 86400
+            span = {'hourly': 3600, 'daily': 86400, 'monthly': 31 * 86400}[resolution]
+            summary = self.rollups.summary(resolution, day_end - buckets * span, day_end)
+            return pd.DataFrame({
+                'Date': pd.to_datetime(summary['start'], unit='s'),
+                'Calls_Handled': summary['calls'],
+                'Avg_Response_Time': summary['response_time'],
+                'Satisfaction_Score': summary['satisfaction']
+            }).tail(buckets).reset_index(drop=True)
+        return self._cached('report', (resolution, buckets), compute)
+
+    def iter_calls(self, t0, t1, columns, chunk_rows=250_000):
+        """Calls that started in [t0, t1), ``chunk_rows`` rows at a time
+
+        Chunks are views of the store's memory maps and bypass the cache, so
+        streaming a long range never holds more than one chunk.
+        """
+        rows = self.store.row_range(t0, t1)
+        for lo in range(rows.start, rows.stop, chunk_rows):
+            chunk = slice(lo, min(lo + chunk_rows, rows.stop))
+            yield {name: self.store.column(name)[chunk] for name in columns}
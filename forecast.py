@@ -0,0 +1,258 @@
+"""Seasonal call-volume forecasts per category, fitted once per day of data.
+
+Each (category, interval) series gets an additive Holt-Winters model with a
+damped trend on log call counts, so seasonal swings scale with volume:
+hourly buckets carry a 168-hour season (weekday and time of day together),
+daily buckets a 7-day one.  Smoothing parameters are picked from a grid by
+one-step-ahead error; every grid point of every series in a job is updated
+together, one NumPy step per bucket.
+
+``ForecastEngine`` fits every category and interval on the calls up to the
+last closed day and keeps the result until another day closes, so viewers
+only read fitted states.  A stale fit keeps serving while its replacement
+is computed in the background.  A fit takes tens of milliseconds per
+series, so it runs in-process unless there are at least
+``POOL_MIN_SERIES`` series; larger fits are split across ``POOL_WORKERS``
+worker processes that run this module as a script, importing only NumPy,
+and exit when the fit is done.
+"""
+import itertools
+import os
+import pickle
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Interval -> (seconds per bucket, season in buckets, training window in buckets)
+INTERVALS = {
+    'hourly': (3600, 168, 12 * 168),
+    'daily': (86400, 7, 365),
+}
+
+MAX_HORIZON_DAYS = 14
+DAMPING = 0.98
+
+# Smoothing grid: level, trend and seasonal weights of the error-correction form
+ALPHAS = (0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.4)
+BETAS = (0.0, 0.002, 0.01)
+GAMMAS = (0.05, 0.1, 0.2, 0.3, 0.5)
+
+# Prediction band half-width in standard deviations (about 95%)
+BAND_Z = 1.96
+
+# Series across all intervals before a fit is worth starting worker processes
+POOL_MIN_SERIES = 64
+POOL_WORKERS = 2
+
+
+def parameter_grid():
+    """(alpha, beta, gamma) columns of every grid point"""
+    return np.array(list(itertools.product(ALPHAS, BETAS, GAMMAS))).T
+
+
+def fit_holt_winters(y, season):
+    """Best grid parameters and final state for every column of ``y`` (buckets x series)
+
+    ``y`` is on the log scale and needs at least two seasons.  The first
+    season seeds the level and seasonal terms; the rest scores each grid
+    point by its squared one-step-ahead errors.
+    """
+    alpha, beta, gamma = (values[:, None] for values in parameter_grid())
+    first = y[:season]
+    level = np.broadcast_to(first.mean(axis=0), (len(alpha), y.shape[1])).copy()
+    trend = np.zeros_like(level)
+    # Seasonal terms indexed by phase, so each step reads one contiguous (grid, series) block
+    seasonal = np.repeat((first - first.mean(axis=0))[:, None, :], len(alpha), axis=1)
+    sse = np.zeros_like(level)
+    for t in range(season, len(y)):
+        phase = seasonal[t % season]
+        error = y[t] - (level + DAMPING * trend + phase)
+        sse += error * error
+        level += DAMPING * trend + alpha * error
+        trend *= DAMPING
+        trend += beta * error
+        phase += gamma * error
+
+    best = sse.argmin(axis=0)
+    series = np.arange(y.shape[1])
+    steps = len(y) - season
+    return {
+        'alpha': alpha[best, 0],
+        'beta': beta[best, 0],
+        'gamma': gamma[best, 0],
+        'level': level[best, series],
+        'trend': trend[best, series],
+        'seasonal': seasonal[:, best, series],
+        'sigma': np.sqrt(sse[best, series] / steps),
+        'phase': len(y) % season,
+    }
+
+
+def project(fit, column, steps):
+    """Mean forecast and band on the log scale for ``steps`` buckets of one series"""
+    h = np.arange(1, steps + 1)
+    season = len(fit['seasonal'])
+    mean = (fit['level'][column] + np.cumsum(DAMPING ** h) * fit['trend'][column]
+            + fit['seasonal'][(fit['phase'] + h - 1) % season, column])
+    # Level uncertainty grows with the horizon; seasonal and trend terms are left out
+    spread = BAND_Z * fit['sigma'][column] * np.sqrt(1 + (h - 1) * fit['alpha'][column] ** 2)
+    return mean, mean - spread, mean + spread
+
+
+def _fit_job(job):
+    interval, columns, y, season = job
+    return interval, columns, fit_holt_winters(y, season)
+
+
+def _fit_jobs(jobs):
+    """Fit ``jobs`` in a worker process running this module"""
+    worker = subprocess.run([sys.executable, os.path.abspath(__file__)], input=pickle.dumps(jobs),
+                            capture_output=True, check=True)
+    return pickle.loads(worker.stdout)
+
+
+def _merge(parts):
+    """Join per-job fits of one interval back into category order"""
+    parts.sort(key=lambda part: part[0][0])
+    merged = {}
+    for name in parts[0][1]:
+        if name == 'phase':
+            merged[name] = parts[0][1][name]
+        else:
+            merged[name] = np.concatenate([fit[name] for _, fit in parts], axis=-1)
+    return merged
+
+
+class ForecastEngine:
+    """Per-category Holt-Winters fits over the rollups, refreshed once per closed day"""
+
+    def __init__(self, rollups, workers=POOL_WORKERS):
+        self.rollups = rollups
+        self.store = rollups.store
+        self.workers = workers
+        self._fits = None
+        self._lock = threading.Lock()
+        self._refit = None
+
+    def _map(self, jobs, workers):
+        if workers <= 1:
+            return [_fit_job(job) for job in jobs]
+        # Fresh processes rather than a multiprocessing pool, whose workers would
+        # re-import the parent's __main__, which is the app script under Streamlit
+        groups = [jobs[i::workers] for i in range(workers)]
+        with ThreadPoolExecutor(max_workers=workers) as threads:
+            return [result for group in threads.map(_fit_jobs, groups) for result in group]
+
+    def data_day(self):
+        """Day number whose start closes the data used for fitting, or None before any call"""
+        latest = self.store.latest_start()
+        return None if latest is None else latest // 86400
+
+    def _jobs(self, end, workers):
+        """Training series split into jobs for ``workers`` processes, plus the counts they were built from"""
+        earliest = self.store.earliest_start()
+        per_interval = max(1, -(-workers // len(INTERVALS)))
+        jobs, history = [], {}
+        for interval, (seconds, season, window) in INTERVALS.items():
+            # Whole buckets only, up to the window
+            start = max(-(-earliest // seconds) * seconds, end - window * seconds)
+            if end - start < 2 * season * seconds:
+                continue
+            counts = self.rollups.by_category(interval, start, end)
+            history[interval] = (start, counts)
+            y = np.log1p(counts.astype(np.float64))
+            for columns in np.array_split(np.arange(counts.shape[1]), min(per_interval, counts.shape[1])):
+                jobs.append((interval, columns, np.ascontiguousarray(y[:, columns]), season))
+        return jobs, history
+
+    def fit(self, day, workers=None):
+        """Fit every category and interval on calls before the start of ``day``
+
+        ``workers`` defaults to the engine's pool size for fits of at least
+        ``POOL_MIN_SERIES`` series and to in-process fitting below that.
+        """
+        started = time.perf_counter()
+        end = day * 86400
+        if workers is None:
+            series = len(self.store.categories) * len(INTERVALS)
+            workers = self.workers if series >= POOL_MIN_SERIES else 1
+        jobs, history = self._jobs(end, workers)
+        workers = min(workers, len(jobs))
+        results = self._map(jobs, workers)
+        fits = {}
+        for interval, columns, fit in results:
+            fits.setdefault(interval, []).append((columns, fit))
+        return {
+            'day': day,
+            'end': end,
+            'history': history,
+            'models': {interval: _merge(parts) for interval, parts in fits.items()},
+            'workers': max(workers, 1),
+            'seconds': time.perf_counter() - started,
+        }
+
+    def _refresh(self, day):
+        try:
+            fits = self.fit(day)
+            with self._lock:
+                self._fits = fits
+        finally:
+            # A failed refit is retried by the next reader
+            with self._lock:
+                self._refit = None
+
+    def fits(self):
+        """Fits for the latest closed day; a stale fit is served while its successor runs"""
+        day = self.data_day()
+        if day is None:
+            return None
+        with self._lock:
+            current = self._fits
+            if current is not None and (current['day'] == day or self._refit is not None):
+                return current
+            if current is not None:
+                self._refit = threading.Thread(target=self._refresh, args=(day,), name="forecast-refit",
+                                               daemon=True)
+                self._refit.start()
+                return current
+            # Nothing to serve yet: the first caller fits while later callers wait on the lock
+            self._fits = self.fit(day)
+            return self._fits
+
+    def forecast(self, interval, category, days):
+        """History and ``days`` of forecast for one category index
+
+        Returns bucket starts and counts of the last two seasons, then the
+        forecast bucket starts, mean and band, plus the model's parameters,
+        or None while there is too little data for the interval.
+        """
+        fits = self.fits()
+        if fits is None or interval not in fits['models']:
+            return None
+        seconds, season, _ = INTERVALS[interval]
+        fit = fits['models'][interval]
+        start, counts = fits['history'][interval]
+        shown = min(len(counts), 2 * season)
+        steps = days * 86400 // seconds
+        mean, low, high = project(fit, category, steps)
+        return {
+            'history_t': start + np.arange(len(counts) - shown, len(counts)) * seconds,
+            'history': counts[-shown:, category],
+            't': fits['end'] + np.arange(steps) * seconds,
+            'value': np.expm1(mean),
+            'low': np.maximum(np.expm1(low), 0),
+            'high': np.expm1(high),
+            'params': {name: float(fit[name][category]) for name in ('alpha', 'beta', 'gamma')},
+            'fitted_through': fits['end'],
+            'fit_seconds': fits['seconds'],
+            'workers': fits['workers'],
+        }
+
+
+if __name__ == '__main__':
+    # Worker process: fit the pickled jobs on stdin, write the results to stdout
+    sys.stdout.buffer.write(pickle.dumps([_fit_job(job) for job in pickle.load(sys.stdin.buffer)]))
@@ -0,0 +1,176 @@
+"""Plotly template and figure builders for the Matrix theme.
+
+Importing this module registers a ``matrix`` template (black plot area,
+green type, neon colorway) as Plotly's default, so charts no longer repeat
+the same ``update_layout`` calls.  The template is deliberately small: every
+figure embeds its template in the spec sent to the browser.
+
+Builders take NumPy arrays, which Plotly sends as base64 typed arrays
+instead of JSON number lists.  Times go out as epoch milliseconds on a date
+axis for the same reason.  The app caches built figures by their inputs, so
+identical charts are built once per process.
+"""
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+
+TEMPLATE = 'matrix'
+COLORWAY = ['#00ff41', '#00ffff', '#9d4edd', '#39ff14', '#008f11']
+GRID = 'rgba(0,255,65,0.15)'
+ALERT = '#ff0055'
+
+
+def matrix_template():
+    axis = dict(gridcolor=GRID, zerolinecolor=GRID, linecolor=GRID, automargin=True)
+    return go.layout.Template(layout=dict(
+        plot_bgcolor='rgba(0,0,0,0.9)',
+        paper_bgcolor='rgba(0,0,0,0.9)',
+        font=dict(color='#00ff41', family="'Share Tech Mono', monospace"),
+        title=dict(font=dict(color='#39ff14', family="'Orbitron', monospace")),
+        colorway=COLORWAY,
+        piecolorway=COLORWAY,
+        hoverlabel=dict(bgcolor='#000000', bordercolor='#00ff41', font_color='#00ff41'),
+        legend=dict(bgcolor='rgba(0,0,0,0)'),
+        xaxis=axis,
+        yaxis=axis
+    ))
+
+
+def register_template():
+    """Install the matrix template as Plotly's default"""
+    if TEMPLATE not in pio.templates:
+        pio.templates[TEMPLATE] = matrix_template()
+    pio.templates.default = TEMPLATE
+
+
+def epoch_ms(times):
+    """Datetimes (or integer epoch seconds) as float epoch milliseconds, which a date axis reads natively"""
+    times = np.asarray(times)
+    if times.dtype.kind in 'iu':
+        times = times.astype('datetime64[s]')
+    return times.astype('datetime64[ms]').astype(np.int64).astype(np.float64)
+
+
+def translucent(color, alpha=0.18):
+    """``#rrggbb`` as an rgba() fill"""
+    return 'rgba({},{},{},{})'.format(*(int(color[i:i + 2], 16) for i in (1, 3, 5)), alpha)
+
+
+def line_figure(times, values, title, color, accent=None):
+    """Single time series on a date axis"""
+    fig = go.Figure(go.Scatter(x=epoch_ms(times), y=np.asarray(values, dtype=np.float64),
+                               mode='lines', line_color=color,
+                               hovertemplate="%{x|%Y-%m-%d}<br>%{y:,.2f}<extra></extra>"))
+    fig.update_layout(title=title, xaxis_type='date')
+    if accent:
+        fig.update_layout(title_font_color=accent)
+    return fig
+
+
+def band_figure(times, values, band_times, low, high, title, color, accent=None, y_title=None,
+                mark_times=None, mark_values=None):
+    """Time series with a shaded min/max band behind it and optional flagged points
+
+    Band values go out as float32.
+    """
+    band = dict(x=epoch_ms(band_times), mode='lines', line=dict(width=0, shape='hv'), hoverinfo='skip')
+    fill = translucent(color)
+    fig = go.Figure([
+        go.Scatter(y=np.asarray(low, dtype=np.float32), **band),
+        go.Scatter(y=np.asarray(high, dtype=np.float32), fill='tonexty', fillcolor=fill, **band),
+        go.Scatter(x=epoch_ms(times), y=np.asarray(values, dtype=np.float64), mode='lines', line_color=color,
+                   hovertemplate="%{x|%Y-%m-%d %H:%M}<br>%{y:,.2f}<extra></extra>")
+    ])
+    if mark_times is not None and len(mark_times):
+        fig.add_trace(go.Scatter(x=epoch_ms(mark_times), y=np.asarray(mark_values, dtype=np.float64),
+                                 mode='markers', marker=dict(symbol='x', size=9, color=ALERT),
+                                 hovertemplate="anomaly %{x|%Y-%m-%d %H:%M}<br>%{y:,.2f}<extra></extra>"))
+    fig.update_layout(title=title, xaxis_type='date', yaxis_title=y_title, showlegend=False)
+    if accent:
+        fig.update_layout(title_font_color=accent)
+    return fig
+
+
+def forecast_figure(history_t, history, t, value, low, high, title, color, accent=None):
+    """Recent actuals followed by a dashed forecast inside its prediction band"""
+    fill = translucent(accent or color)
+    band = dict(x=epoch_ms(t), mode='lines', line=dict(width=0), hoverinfo='skip')
+    fig = go.Figure([
+        go.Scatter(x=epoch_ms(history_t), y=np.asarray(history, dtype=np.float64), mode='lines',
+                   line_color=color, name="actual",
+                   hovertemplate="%{x|%Y-%m-%d %H:%M}<br>%{y:,.0f} calls<extra></extra>"),
+        go.Scatter(y=np.asarray(low, dtype=np.float32), **band),
+        go.Scatter(y=np.asarray(high, dtype=np.float32), fill='tonexty', fillcolor=fill, **band),
+        go.Scatter(x=epoch_ms(t), y=np.asarray(value, dtype=np.float64), mode='lines',
+                   line=dict(color=accent or color, dash='dash'), name="forecast",
+                   hovertemplate="%{x|%Y-%m-%d %H:%M}<br>%{y:,.0f} calls forecast<extra></extra>")
+    ])
+    fig.update_layout(title=title, xaxis_type='date', yaxis_title="calls", showlegend=False)
+    if accent:
+        fig.update_layout(title_font_color=accent)
+    return fig
+
+
+def staffing_figure(times, agents, baseline, title, color, accent=None):
+    """Agents needed per interval as steps, against a dotted baseline"""
+    x = epoch_ms(times)
+    hover = "%{x|%a %H:%M}<br>%{y:,.0f} agents %{fullData.name}<extra></extra>"
+    fig = go.Figure([
+        go.Scatter(x=x, y=np.asarray(baseline, dtype=np.float32), mode='lines', name="as measured",
+                   line=dict(color=color, dash='dot', width=1, shape='hv'), hovertemplate=hover),
+        go.Scatter(x=x, y=np.asarray(agents, dtype=np.float32), mode='lines', name="what-if",
+                   line=dict(color=accent or color, shape='hv'), hovertemplate=hover)
+    ])
+    fig.update_layout(title=title, xaxis_type='date', yaxis_title="agents", showlegend=False)
+    if accent:
+        fig.update_layout(title_font_color=accent)
+    return fig
+
+
+def pie_figure(values, names, title):
+    return go.Figure(go.Pie(values=np.asarray(values), labels=list(names)), layout=dict(title=title))
+
+
+def bar_figure(names, values, title, accent=None, colorscale=None, text=None, tickangle=None):
+    """Bars, colored by value on ``colorscale`` when one is given"""
+    values = np.asarray(values, dtype=np.float64)
+    marker = dict(color=values, colorscale=colorscale, showscale=True) if colorscale else {}
+    fig = go.Figure(go.Bar(x=list(names), y=values, marker=marker,
+                           text=None if text is None else np.asarray(text)))
+    fig.update_layout(title=title)
+    if accent:
+        fig.update_layout(title_font_color=accent)
+    if tickangle is not None:
+        fig.update_layout(xaxis_tickangle=tickangle)
+    return fig
+
+
+def network_figure(layer, neuron, activation, layer_type, title):
+    """Neuron activation map, one WebGL trace per layer type
+
+    Separate traces put the layer type in the trace name rather than in a
+    per-point string array, so every per-point array stays numeric; float32
+    is plenty for marker sizes and colors and halves their encoded size.
+    """
+    activation = np.asarray(activation, dtype=np.float32)
+    fig = go.Figure(layout=dict(
+        title=dict(text=title, font_color='#9d4edd'),
+        xaxis_title="Network Layer",
+        yaxis_title="Neuron Index",
+        coloraxis=dict(colorscale="Viridis", colorbar=dict(title="activation")),
+        showlegend=False
+    ))
+    for name in ("Input", "Hidden", "Output"):
+        mask = layer_type == name
+        if not mask.any():
+            continue
+        fig.add_trace(go.Scattergl(
+            x=layer[mask], y=neuron[mask], mode="markers", name=name,
+            marker=dict(size=activation[mask] * 15 + 5, color=activation[mask], coloraxis="coloraxis"),
+            hovertemplate="layer %{x} · neuron %{y}<br>%{fullData.name}<br>activation %{marker.color:.3f}<extra></extra>"
+        ))
+    return fig
+
+
+# Charts built anywhere in the process use the template
+register_template()
@@ -0,0 +1,119 @@
+"""Matrix theme stylesheet, built once at startup into a single static asset.
+
+The readable source lives in ``theme/matrix.css``.  ``build_theme`` minifies
+it into ``static/matrix.css``, which Streamlit serves from ``app/static/``
+when ``server.enableStaticServing`` is on.  Every rerun then only sends a
+short ``<link>``; the URL carries a hash of the contents, so browsers cache
+it indefinitely and fetch it again only after the source changes.
+
+Fonts come from the ``@font-face`` rules in ``theme/fonts.css``, served
+from woff2 files vendored under ``static/fonts``; nothing is fetched from a
+third-party host when the page renders.
+"""
+import hashlib
+import os
+import re
+import sys
+import urllib.request
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+THEME_SOURCE = os.path.join(HERE, 'theme', 'matrix.css')
+FONTS_SOURCE = os.path.join(HERE, 'theme', 'fonts.css')
+STATIC_DIR = os.path.join(HERE, 'static')
+STATIC_URL = 'app/static'
+THEME_FILE = 'matrix.css'
+
+# Only used by --fetch-fonts to refresh the vendored files
+GOOGLE_FONTS_CSS = ('https://fonts.googleapis.com/css2?family=Orbitron:wght@400..900'
+                    '&family=Share+Tech+Mono&display=swap')
+
+
+class ThemeAsset:
+    """A built stylesheet: its file name, contents hash and minified contents"""
+
+    def __init__(self, filename, css, digest):
+        self.filename = filename
+        self.css = css
+        self.digest = digest
+
+    @property
+    def url(self):
+        return f"{STATIC_URL}/{self.filename}?v={self.digest}"
+
+    def markup(self, static_serving=True):
+        """HTML to send on each rerun: a cacheable link, or inline CSS as a fallback"""
+        if static_serving:
+            return f'<link rel="stylesheet" href="{self.url}">'
+        return f"<style>{self.css}</style>"
+
+
+def minify_css(css):
+    """Strip comments and redundant whitespace without touching selector semantics"""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    css = css.replace(';}', '}')
+    return css.strip()
+
+
+def font_css(source=FONTS_SOURCE, static_dir=STATIC_DIR):
+    """The @font-face rules, without the url() of any font file that is not vendored"""
+    with open(source, encoding='utf-8') as f:
+        css = f.read()
+
+    def vendored(match):
+        return match.group(0) if os.path.exists(os.path.join(static_dir, match.group(1))) else ''
+
+    return re.sub(r",\s*url\('(fonts/[^']+)'\)\s*format\('woff2'\)", vendored, css)
+
+
+def build_theme(source=THEME_SOURCE, static_dir=STATIC_DIR):
+    """Minify the theme and write it to one fixed file, only when its contents changed
+
+    Concurrent workers write identical bytes through their own temporary
+    file and an atomic rename, so a race leaves one complete stylesheet.
+    """
+    with open(source, encoding='utf-8') as f:
+        css = minify_css(font_css(static_dir=static_dir) + f.read())
+    data = css.encode('utf-8')
+    path = os.path.join(static_dir, THEME_FILE)
+
+    current = None
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            current = f.read()
+    if current != data:
+        os.makedirs(static_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    return ThemeAsset(THEME_FILE, css, hashlib.sha256(data).hexdigest()[:12])
+
+
+def fetch_fonts(dest=os.path.join(STATIC_DIR, 'fonts')):
+    """Download the latin woff2 file of each family in theme/fonts.css, to refresh the vendored copies"""
+    request = urllib.request.Request(GOOGLE_FONTS_CSS, headers={
+        # Google only serves woff2 to browsers it recognises
+        'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 Chrome/120 Safari/537.36'
+    })
+    with urllib.request.urlopen(request, timeout=30) as response:
+        google_css = response.read().decode('utf-8')
+
+    os.makedirs(dest, exist_ok=True)
+    pattern = r"/\* latin \*/\s*@font-face\s*{[^}]*font-family:\s*'([^']+)';[^}]*url\((\S+?\.woff2)\)"
+    saved = []
+    for family, url in re.findall(pattern, google_css):
+        filename = f"{family.lower().replace(' ', '-')}.woff2"
+        urllib.request.urlretrieve(url, os.path.join(dest, filename))
+        saved.append(filename)
+    return saved
+
+
+if __name__ == '__main__':
+    if '--fetch-fonts' in sys.argv:
+        for name in fetch_fonts():
+            print(f"saved static/fonts/{name}")
+    asset = build_theme()
+    print(f"built static/{asset.filename} ({len(asset.css):,} bytes, v={asset.digest})")
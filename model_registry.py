@@ -0,0 +1,266 @@
+"""Local model registry: SQLite metadata plus memory-mapped weight files.
+
+Listing versions only reads SQLite.  Weights are saved as one ``.npy`` file
+per layer and loaded with ``mmap_mode='r'`` the first time a version is
+used; the loaded model is kept in a process-wide cache, so every session
+shares one mapping (and the OS page cache) instead of holding its own copy.
+"""
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import zipfile
+import zlib
+from collections import OrderedDict
+from contextlib import closing, contextmanager
+
+import numpy as np
+
+from neural_engine import MLP
+
+DEFAULT_REGISTRY_DIR = os.environ.get(
+    'MODEL_REGISTRY_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'models')
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS models (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    dataset TEXT,
+    layer_sizes TEXT NOT NULL,
+    parameters INTEGER NOT NULL,
+    accuracy REAL,
+    f1 REAL,
+    loss REAL,
+    path TEXT NOT NULL,
+    UNIQUE (name, version)
+);
+CREATE TABLE IF NOT EXISTS deployment (
+    slot TEXT PRIMARY KEY,
+    model_id INTEGER NOT NULL REFERENCES models(id),
+    deployed_at REAL NOT NULL
+);
+"""
+
+PRIMARY_SLOT = 'primary'
+TMP_PREFIX = '.tmp-'
+TMP_MAX_AGE = 3600
+
+
+class ModelRegistry:
+    """Versioned MLP weights with lazy loading and an atomically swapped active model"""
+
+    def __init__(self, path=DEFAULT_REGISTRY_DIR, max_loaded=8):
+        self.path = path
+        self.max_loaded = max_loaded
+        os.makedirs(path, exist_ok=True)
+        self._db_path = os.path.join(path, 'registry.db')
+        self._lock = threading.Lock()
+        self._loaded = OrderedDict()
+        self._active = (None, None)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+        self.refresh()
+
+    @contextmanager
+    def _connect(self):
+        """A connection that commits on success and is closed on exit"""
+        with closing(sqlite3.connect(self._db_path, timeout=10)) as conn:
+            conn.row_factory = sqlite3.Row
+            with conn:
+                yield conn
+
+    # Metadata -------------------------------------------------------------
+
+    def list(self):
+        """Every registered version, newest first, without touching weight files"""
+        with self._connect() as conn:
+            rows = conn.execute("""
+                SELECT m.*, d.slot IS NOT NULL AS active
+                FROM models m LEFT JOIN deployment d ON d.model_id = m.id
+                ORDER BY m.created_at DESC, m.id DESC
+            """).fetchall()
+        return [dict(row, layer_sizes=json.loads(row['layer_sizes'])) for row in rows]
+
+    def get(self, model_id):
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM models WHERE id = ?", (model_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown model id {model_id}")
+        return dict(row, layer_sizes=json.loads(row['layer_sizes']))
+
+    def refresh(self):
+        """Re-read the deployed model, picking up deploys made by other processes"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT model_id FROM deployment WHERE slot = ?",
+                               (PRIMARY_SLOT,)).fetchone()
+        model_id = row['model_id'] if row else None
+        with self._lock:
+            if model_id != self._active[0]:
+                self._active = (model_id, None)
+        return model_id
+
+    # Writes ---------------------------------------------------------------
+
+    def register(self, name, weights, biases, metrics=None, dataset=None):
+        """Save a new version of ``name`` and return its model id
+
+        Weight files are written to a temporary directory first, without
+        any lock held.  The version is then allocated inside a write
+        transaction, so no other process can claim it, and the directory is
+        renamed into place before the metadata row is committed, so readers
+        never see a half-written version.  A directory already at the new
+        version's path was left by a register that failed before its commit,
+        and is replaced.
+        """
+        metrics = metrics or {}
+        layer_sizes = [int(weights[0].shape[0])] + [int(w.shape[1]) for w in weights]
+        model_dir = os.path.join(self.path, safe_name(name))
+        os.makedirs(model_dir, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix=TMP_PREFIX, dir=model_dir)
+        try:
+            for i, (w, b) in enumerate(zip(weights, biases)):
+                np.save(os.path.join(tmp_dir, f"W{i}.npy"), np.ascontiguousarray(w, dtype=np.float32))
+                np.save(os.path.join(tmp_dir, f"b{i}.npy"), np.ascontiguousarray(b, dtype=np.float32))
+            with self._connect() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                version = conn.execute("SELECT COALESCE(MAX(version), 0) + 1 FROM models WHERE name = ?",
+                                       (name,)).fetchone()[0]
+                rel_path = os.path.join(safe_name(name), f"v{version}")
+                final_dir = os.path.join(self.path, rel_path)
+                if os.path.exists(final_dir):
+                    shutil.rmtree(final_dir)
+                os.replace(tmp_dir, final_dir)
+                cursor = conn.execute("""
+                    INSERT INTO models (name, version, created_at, dataset, layer_sizes, parameters,
+                                        accuracy, f1, loss, path)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (name, version, time.time(), dataset, json.dumps(layer_sizes),
+                      int(sum(w.size + b.size for w, b in zip(weights, biases))),
+                      metrics.get('accuracy'), metrics.get('f1'), metrics.get('loss'), rel_path))
+                return cursor.lastrowid
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def register_model(self, name, model, metrics=None, dataset=None):
+        return self.register(name, model.weights, model.biases, metrics, dataset)
+
+    def deploy(self, model_id):
+        """Make ``model_id`` the active model for every session in one swap"""
+        model = self.load(model_id)
+        with self._connect() as conn:
+            conn.execute("""
+                INSERT INTO deployment (slot, model_id, deployed_at) VALUES (?, ?, ?)
+                ON CONFLICT(slot) DO UPDATE SET model_id = excluded.model_id,
+                                               deployed_at = excluded.deployed_at
+            """, (PRIMARY_SLOT, model_id, time.time()))
+        with self._lock:
+            self._active = (model_id, model)
+        return model
+
+    def cleanup(self, keep=3):
+        """Delete all but the newest ``keep`` versions of each model, sparing the active one
+
+        Temporary directories older than ``TMP_MAX_AGE``, left by registers
+        that crashed while writing, are removed too.
+        """
+        active_id = self.refresh()
+        with self._lock, self._connect() as conn:
+            rows = conn.execute("""
+                SELECT id, path FROM (
+                    SELECT id, path, ROW_NUMBER() OVER (PARTITION BY name ORDER BY version DESC) AS rank
+                    FROM models
+                ) WHERE rank > ?
+            """, (keep,)).fetchall()
+            doomed = [row for row in rows if row['id'] != active_id]
+            conn.executemany("DELETE FROM models WHERE id = ?", [(row['id'],) for row in doomed])
+            for row in doomed:
+                self._loaded.pop(row['id'], None)
+        for row in doomed:
+            shutil.rmtree(os.path.join(self.path, row['path']), ignore_errors=True)
+        cutoff = time.time() - TMP_MAX_AGE
+        for entry in os.scandir(self.path):
+            if entry.is_dir():
+                for tmp in os.scandir(entry.path):
+                    if tmp.name.startswith(TMP_PREFIX) and tmp.stat().st_mtime < cutoff:
+                        shutil.rmtree(tmp.path, ignore_errors=True)
+        return len(doomed)
+
+    # Weights --------------------------------------------------------------
+
+    def load(self, model_id):
+        """The model for ``model_id``, memory-mapping its weights on first use"""
+        with self._lock:
+            model = self._loaded.get(model_id)
+            if model is not None:
+                self._loaded.move_to_end(model_id)
+                return model
+
+        record = self.get(model_id)
+        directory = os.path.join(self.path, record['path'])
+        n_layers = len(record['layer_sizes']) - 1
+        weights = [np.load(os.path.join(directory, f"W{i}.npy"), mmap_mode='r') for i in range(n_layers)]
+        biases = [np.load(os.path.join(directory, f"b{i}.npy"), mmap_mode='r') for i in range(n_layers)]
+        model = MLP.from_arrays(weights, biases)
+
+        with self._lock:
+            model = self._loaded.setdefault(model_id, model)
+            while len(self._loaded) > self.max_loaded:
+                self._loaded.popitem(last=False)
+        return model
+
+    def active(self):
+        """(model id, model) currently deployed, or (None, None)"""
+        with self._lock:
+            model_id, model = self._active
+        if model_id is not None and model is None:
+            model = self.load(model_id)
+            with self._lock:
+                if self._active[0] == model_id:
+                    self._active = (model_id, model)
+        return model_id, model
+
+    def loaded_ids(self):
+        with self._lock:
+            return list(self._loaded)
+
+
+def safe_name(name):
+    return "".join(c if c.isalnum() or c in "-_" else "-" for c in name).strip("-") or "model"
+
+
+def arrays_from_npz(file):
+    """Weight and bias lists from an uploaded ``.npz`` holding W0, b0, W1, b1, ...
+
+    Any file that is not a readable archive of such arrays raises ValueError.
+    """
+    try:
+        npz = np.load(file, allow_pickle=False)
+    except (OSError, ValueError, EOFError, zipfile.BadZipFile) as exc:
+        raise ValueError(f"Not a readable .npz file ({exc})") from exc
+    if not isinstance(npz, np.lib.npyio.NpzFile):
+        raise ValueError("Model file must be an .npz archive, not a single array")
+    with npz:
+        n_layers = sum(1 for key in npz.files if key.startswith('W'))
+        names = [name for i in range(n_layers) for name in (f"W{i}", f"b{i}")]
+        if n_layers == 0 or any(name not in npz.files for name in names):
+            raise ValueError("Model file must contain W0, b0, W1, b1, ... arrays")
+        try:
+            weights = [np.asarray(npz[f"W{i}"], dtype=np.float32) for i in range(n_layers)]
+            biases = [np.asarray(npz[f"b{i}"], dtype=np.float32) for i in range(n_layers)]
+        except (OSError, ValueError, EOFError, zipfile.BadZipFile, zlib.error) as exc:
+            raise ValueError(f"Model file is corrupt ({exc})") from exc
+    for i in range(n_layers):
+        if weights[i].ndim != 2:
+            raise ValueError(f"W{i} must be a 2-D matrix")
+        if i and weights[i].shape[0] != weights[i - 1].shape[1]:
+            raise ValueError(f"W{i} does not match the output size of W{i - 1}")
+        if biases[i].shape != (weights[i].shape[1],):
+            raise ValueError(f"b{i} must have one value per output of W{i} ({weights[i].shape[1]})")
+    return weights, biases
@@ -0,0 +1,230 @@
+"""Vectorized NumPy multilayer perceptron used by the Neural Control training tab.
+
+Everything runs in float32.  ``MLPTrainer`` allocates its activation,
+gradient and momentum buffers once for the configured batch size and reuses
+them for every step, gathering each batch and writing matrix products
+straight into them with ``out=``, so steps do not allocate full-size arrays.
+"""
+import time
+
+import numpy as np
+
+DATASETS = ["Customer Service Calls", "Technical Support", "Sales Inquiries", "Custom Dataset"]
+
+# Dataset name -> call category it is restricted to (None for all calls)
+DATASET_CATEGORIES = {
+    "Customer Service Calls": None,
+    "Technical Support": "Technical",
+    "Sales Inquiries": "Sales",
+}
+
+SATISFIED_SCORE = 90.0
+
+
+class MLP:
+    """ReLU network with a softmax output layer"""
+
+    def __init__(self, layer_sizes, seed=0):
+        rng = np.random.default_rng(seed)
+        self.layer_sizes = list(layer_sizes)
+        self.weights = []
+        self.biases = []
+        for fan_in, fan_out in zip(self.layer_sizes[:-1], self.layer_sizes[1:]):
+            # He initialisation keeps deep ReLU stacks from vanishing
+            scale = np.sqrt(2.0 / fan_in)
+            self.weights.append((rng.standard_normal((fan_in, fan_out)) * scale).astype(np.float32))
+            self.biases.append(np.zeros(fan_out, dtype=np.float32))
+
+    @classmethod
+    def from_arrays(cls, weights, biases):
+        """Wrap existing weight arrays (e.g. read-only memory maps) without copying them"""
+        model = cls.__new__(cls)
+        model.layer_sizes = [int(weights[0].shape[0])] + [int(w.shape[1]) for w in weights]
+        model.weights = list(weights)
+        model.biases = list(biases)
+        return model
+
+    @property
+    def n_parameters(self):
+        return sum(w.size + b.size for w, b in zip(self.weights, self.biases))
+
+    def predict_proba(self, X):
+        a = np.asarray(X, dtype=np.float32)
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            a = a @ w + b
+            if i < len(self.weights) - 1:
+                np.maximum(a, 0, out=a)
+        return softmax(a)
+
+    def predict(self, X):
+        return self.predict_proba(X).argmax(axis=1)
+
+    def mean_activations(self, n_probe=256, seed=0):
+        """Mean absolute activation of every neuron, layer by layer, on a random probe batch"""
+        a = np.random.default_rng(seed).standard_normal(
+            (n_probe, self.layer_sizes[0])).astype(np.float32)
+        means = [np.abs(a).mean(axis=0)]
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            a = a @ w + b
+            if i < len(self.weights) - 1:
+                np.maximum(a, 0, out=a)
+                means.append(a.mean(axis=0))
+        means.append(softmax(a).mean(axis=0))
+        return means
+
+
+def softmax(z, out=None):
+    out = np.subtract(z, z.max(axis=1, keepdims=True), out=out)
+    np.exp(out, out=out)
+    out /= out.sum(axis=1, keepdims=True)
+    return out
+
+
+class MLPTrainer:
+    """Mini-batch SGD with momentum over preallocated float32 buffers"""
+
+    def __init__(self, model, batch_size=64, learning_rate=0.001, momentum=0.9, max_grad_norm=5.0):
+        self.model = model
+        self.batch_size = batch_size
+        self.learning_rate = np.float32(learning_rate)
+        self.momentum = np.float32(momentum)
+        self.max_grad_norm = max_grad_norm
+
+        sizes = model.layer_sizes
+        self._inputs = np.empty((batch_size, sizes[0]), dtype=np.float32)
+        self._acts = [np.empty((batch_size, n), dtype=np.float32) for n in sizes[1:]]
+        self._deltas = [np.empty((batch_size, n), dtype=np.float32) for n in sizes[1:]]
+        self._masks = [np.empty((batch_size, n), dtype=bool) for n in sizes[1:-1]]
+        self._grad_w = [np.empty_like(w) for w in model.weights]
+        self._grad_b = [np.empty_like(b) for b in model.biases]
+        self._vel_w = [np.zeros_like(w) for w in model.weights]
+        self._vel_b = [np.zeros_like(b) for b in model.biases]
+
+    def _step(self, X, y, rows):
+        """One SGD step on X[rows], gathered straight into the input buffer"""
+        n = len(rows)
+        model = self.model
+        last = len(model.weights) - 1
+        inputs = self._inputs[:n]
+        np.take(X, rows, axis=0, out=inputs)
+        y = y[rows]
+
+        # Forward pass into the reused activation buffers
+        a_prev = inputs
+        for i, (w, b) in enumerate(zip(model.weights, model.biases)):
+            a = self._acts[i][:n]
+            np.matmul(a_prev, w, out=a)
+            a += b
+            if i < last:
+                np.maximum(a, 0, out=a)
+            a_prev = a
+        probs = softmax(a_prev, out=a_prev)
+        picked = np.arange(n)
+        loss = float(-np.log(np.maximum(probs[picked, y], 1e-7)).mean())
+
+        # Backward pass: softmax cross-entropy gradient, then through each ReLU
+        delta = self._deltas[last][:n]
+        delta[...] = probs
+        delta[picked, y] -= 1
+        delta /= n
+        for i in range(last, -1, -1):
+            below = inputs if i == 0 else self._acts[i - 1][:n]
+            np.matmul(below.T, delta, out=self._grad_w[i])
+            np.sum(delta, axis=0, out=self._grad_b[i])
+            if i > 0:
+                prev_delta = self._deltas[i - 1][:n]
+                np.matmul(delta, model.weights[i].T, out=prev_delta)
+                mask = self._masks[i - 1][:n]
+                np.greater(below, 0, out=mask)
+                prev_delta *= mask
+                delta = prev_delta
+
+        norm = np.sqrt(sum(float(np.vdot(g, g)) for g in self._grad_w + self._grad_b))
+        scale = np.float32(min(1.0, self.max_grad_norm / (norm + 1e-12)))
+        for params, grads, velocity in ((model.weights, self._grad_w, self._vel_w),
+                                        (model.biases, self._grad_b, self._vel_b)):
+            for p, g, v in zip(params, grads, velocity):
+                v *= self.momentum
+                v -= (self.learning_rate * scale) * g
+                p += v
+        return loss
+
+    def train_epoch(self, X, y, rng):
+        """One shuffled pass over (X, y); returns mean loss and samples/s"""
+        started = time.perf_counter()
+        order = rng.permutation(len(y))
+        total_loss = 0.0
+        for lo in range(0, len(y), self.batch_size):
+            rows = order[lo:lo + self.batch_size]
+            total_loss += self._step(X, y, rows) * len(rows)
+        elapsed = time.perf_counter() - started
+        return total_loss / max(len(y), 1), len(y) / max(elapsed, 1e-9)
+
+
+def evaluate(model, X, y, n_classes):
+    """Accuracy, cross-entropy loss and macro-averaged F1 on held-out data"""
+    probs = model.predict_proba(X)
+    predicted = probs.argmax(axis=1)
+    loss = float(-np.log(np.maximum(probs[np.arange(len(y)), y], 1e-7)).mean())
+    confusion = np.bincount(y * n_classes + predicted, minlength=n_classes ** 2).reshape(n_classes, n_classes)
+    true_pos = np.diag(confusion).astype(np.float64)
+    precision = true_pos / np.maximum(confusion.sum(axis=0), 1)
+    recall = true_pos / np.maximum(confusion.sum(axis=1), 1)
+    f1 = 2 * precision * recall / np.maximum(precision + recall, 1e-12)
+    return {
+        'accuracy': float(true_pos.sum() / max(len(y), 1)),
+        'loss': loss,
+        'f1': float(f1.mean()),
+    }
+
+
+def load_dataset(name, store, max_samples=20000, seed=0):
+    """Standardised float32 features and integer labels for a training dataset
+
+    Call datasets predict whether a caller was satisfied from response time,
+    call duration, time of day, day of week and category, using the most
+    recent calls in the store.  "Custom Dataset" is a seeded three-class
+    spiral that needs a non-linear decision boundary.
+    """
+    rng = np.random.default_rng(seed)
+    if name not in DATASET_CATEGORIES:
+        return spiral_dataset(max_samples, rng)
+
+    rows = slice(max(0, store.rows - 20 * max_samples), store.rows)
+    calls = {col: store.column(col)[rows] for col in
+             ('start', 'end', 'category', 'response_time', 'satisfaction')}
+    category = DATASET_CATEGORIES[name]
+    if category is not None:
+        keep = calls['category'] == store.categories.index(category)
+        calls = {col: values[keep] for col, values in calls.items()}
+    calls = {col: values[-max_samples:] for col, values in calls.items()}
+
+    hour = (calls['start'] % 86400) / 86400 * 2 * np.pi
+    weekday = ((calls['start'] // 86400 + 3) % 7) / 7 * 2 * np.pi
+    features = np.column_stack([
+        calls['response_time'],
+        np.log1p(calls['end'] - calls['start']),
+        np.sin(hour), np.cos(hour),
+        np.sin(weekday), np.cos(weekday),
+        np.eye(len(store.categories), dtype=np.float32)[calls['category']],
+    ]).astype(np.float32)
+    features -= features.mean(axis=0)
+    features /= np.maximum(features.std(axis=0), 1e-6)
+    labels = (calls['satisfaction'] >= SATISFIED_SCORE).astype(np.int64)
+    return features, labels, ['Unsatisfied', 'Satisfied']
+
+
+def spiral_dataset(n, rng, classes=3):
+    per_class = n // classes
+    t = rng.uniform(0, 1, (classes, per_class))
+    angle = t * 4 * np.pi + np.arange(classes)[:, None] * 2 * np.pi / classes
+    radius = t + rng.normal(0, 0.03, t.shape)
+    features = np.stack([radius * np.cos(angle), radius * np.sin(angle)], axis=-1).reshape(-1, 2)
+    labels = np.repeat(np.arange(classes), per_class)
+    return features.astype(np.float32), labels, [f"Class {i}" for i in range(classes)]
+
+
+def train_test_split(X, y, test_fraction=0.2, seed=0):
+    order = np.random.default_rng(seed).permutation(len(y))
+    cut = int(len(y) * (1 - test_fraction))
+    return X[order[:cut]], y[order[:cut]], X[order[cut:]], y[order[cut:]]
@@ -0,0 +1,143 @@
+"""Per-rerun profiling of the app's render stages.
+
+``RerunProfiler`` times named stages of one script run and counts the
+elements and bytes Streamlit sends while each stage is active, by wrapping
+the session's outgoing message queue for the length of the run.  That queue
+is a private Streamlit attribute, so the app profiles only sessions that
+opt in with ``?perf=1``, and a Streamlit without it still gets stage
+timings, with no element or byte counts.  Finished runs go to a
+process-wide ``PerfStats``, which keeps a bounded window of samples per
+page and tab and reports rolling p50/p95/p99.
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+STAGES = ('theme', 'sidebar', 'page', 'plotly', 'footer')
+PERCENTILES = (50, 95, 99)
+
+_local = threading.local()
+
+
+class PerfStats:
+    """Rolling window of rerun samples per view, shared by every session"""
+
+    def __init__(self, window=500):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples = {}
+
+    def record(self, view, sample):
+        with self._lock:
+            self._samples.setdefault(view, deque(maxlen=self.window)).append(sample)
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+    def views(self):
+        with self._lock:
+            return sorted(self._samples)
+
+    def last(self, view):
+        with self._lock:
+            samples = self._samples.get(view)
+            return samples[-1] if samples else None
+
+    def summary(self):
+        """One row per view: run count plus percentiles of time, elements and bytes"""
+        with self._lock:
+            snapshot = {view: list(samples) for view, samples in self._samples.items()}
+        rows = []
+        for view, samples in sorted(snapshot.items()):
+            total_ms = np.array([s['total'] for s in samples]) * 1000
+            elements = np.array([sum(s['elements'].values()) for s in samples])
+            kbytes = np.array([sum(s['bytes'].values()) for s in samples]) / 1024
+            row = {'View': view, 'Runs': len(samples)}
+            for p, value in zip(PERCENTILES, np.percentile(total_ms, PERCENTILES)):
+                row[f'p{p} ms'] = round(float(value), 1)
+            for stage in STAGES:
+                stage_ms = np.array([s['stages'].get(stage, 0.0) for s in samples]) * 1000
+                row[f'{stage} p95 ms'] = round(float(np.percentile(stage_ms, 95)), 1)
+            row['Elements p50'] = int(np.percentile(elements, 50))
+            row['KB p50'] = round(float(np.percentile(kbytes, 50)), 1)
+            row['KB p95'] = round(float(np.percentile(kbytes, 95)), 1)
+            rows.append(row)
+        return rows
+
+
+class RerunProfiler:
+    """Stage timings and outgoing message counts for one script run
+
+    Stages nest: a stage's time includes any stage opened inside it (the
+    Plotly stage runs inside the page stage), while each message is counted
+    once, against the innermost stage open when it was sent.
+    """
+
+    def __init__(self, stats):
+        self.stats = stats
+        self.stages = {}
+        self.elements = {}
+        self.bytes = {}
+        self._stack = []
+        self._ctx = None
+        self._enqueue = None
+        self._started = None
+
+    def start(self, ctx=None):
+        """Begin the run; ``ctx`` is the ScriptRunContext whose messages are counted"""
+        self._started = time.perf_counter()
+        _local.profiler = self
+        if ctx is not None and callable(getattr(ctx, '_enqueue', None)):
+            self._ctx = ctx
+            self._enqueue = ctx._enqueue
+            ctx._enqueue = self._count
+        return self
+
+    def _count(self, msg):
+        stage = self._stack[-1] if self._stack else 'other'
+        if msg.HasField('delta'):
+            self.elements[stage] = self.elements.get(stage, 0) + 1
+        self.bytes[stage] = self.bytes.get(stage, 0) + msg.ByteSize()
+        self._enqueue(msg)
+
+    @contextmanager
+    def stage(self, name):
+        self._stack.append(name)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - started
+            self._stack.pop()
+
+    def finish(self, view):
+        """End the run, restore the message queue and record the sample under ``view``"""
+        if self._ctx is not None:
+            self._ctx._enqueue = self._enqueue
+            self._ctx = None
+        if getattr(_local, 'profiler', None) is self:
+            _local.profiler = None
+        sample = {
+            'total': time.perf_counter() - self._started,
+            'stages': dict(self.stages),
+            'elements': dict(self.elements),
+            'bytes': dict(self.bytes),
+            'at': time.time(),
+        }
+        self.stats.record(view, sample)
+        return sample
+
+
+@contextmanager
+def stage(name):
+    """Time ``name`` on this thread's active profiler; a no-op outside a profiled run"""
+    profiler = getattr(_local, 'profiler', None)
+    if profiler is None:
+        yield
+    else:
+        with profiler.stage(name):
+            yield
@@ -0,0 +1,215 @@
+"""Incremental hourly, daily and monthly rollups over the call event store.
+
+Each rollup keeps dense per-bucket, per-category sums (call count, response
+time, satisfaction).  New calls are folded in from a row watermark, so an
+update only touches the buckets those calls fall into and never rescans
+history.  Tables are persisted next to the store at most every
+``SAVE_INTERVAL`` seconds, so a restart resumes from the last saved
+watermark and folds in only the calls after it.
+"""
+import os
+import threading
+import time
+
+import numpy as np
+
+RESOLUTIONS = ('hourly', 'daily', 'monthly')
+METRICS = ('count', 'response_sum', 'satisfaction_sum')
+SAVE_INTERVAL = 60.0
+
+
+def bucket_ids(resolution, start):
+    """Map epoch-second start times to integer bucket ids"""
+    start = np.asarray(start, dtype=np.int64)
+    if resolution == 'hourly':
+        return start // 3600
+    if resolution == 'daily':
+        return start // 86400
+    if resolution == 'monthly':
+        return start.astype('datetime64[s]').astype('datetime64[M]').astype(np.int64)
+    raise ValueError(f"Unknown rollup resolution: {resolution}")
+
+
+def bucket_starts(resolution, ids):
+    """Epoch-second start time of each bucket id"""
+    ids = np.asarray(ids, dtype=np.int64)
+    if resolution == 'hourly':
+        return ids * 3600
+    if resolution == 'daily':
+        return ids * 86400
+    if resolution == 'monthly':
+        return ids.astype('datetime64[M]').astype('datetime64[s]').astype(np.int64)
+    raise ValueError(f"Unknown rollup resolution: {resolution}")
+
+
+def bucket_range(resolution, t0, t1):
+    """First and last bucket ids holding [t0, t1); the last is below the first when the range is empty"""
+    first_id = int(bucket_ids(resolution, [t0])[0])
+    if t1 <= t0:
+        return first_id, first_id - 1
+    return first_id, int(bucket_ids(resolution, [t1 - 1])[0])
+
+
+class RollupTable:
+    """Dense bucket x category sums for one resolution"""
+
+    def __init__(self, resolution, n_categories, origin=None, arrays=None):
+        self.resolution = resolution
+        self.n_categories = n_categories
+        self.origin = origin
+        self.arrays = arrays or {
+            name: np.zeros((0, n_categories), dtype=np.float64) for name in METRICS
+        }
+        # Buckets in use; the arrays themselves are over-allocated to grow cheaply
+        self.used = len(self.arrays['count'])
+
+    def _reserve(self, first_id, last_id):
+        if self.origin is None:
+            self.origin = int(first_id)
+        needed = int(last_id) - self.origin + 1
+        capacity = len(self.arrays['count'])
+        if needed > capacity:
+            capacity = max(needed, 2 * capacity, 64)
+            for name, values in self.arrays.items():
+                grown = np.zeros((capacity, self.n_categories), dtype=values.dtype)
+                grown[:len(values)] = values
+                self.arrays[name] = grown
+        self.used = max(self.used, needed)
+
+    def add(self, ids, category, response_time, satisfaction):
+        """Fold a batch of calls into the buckets they fall into"""
+        if len(ids) == 0:
+            return
+        first_id, last_id = int(ids.min()), int(ids.max())
+        self._reserve(first_id, last_id)
+
+        # Only the span [first_id, last_id] is touched by this batch
+        span = last_id - first_id + 1
+        flat = (ids - first_id) * self.n_categories + category
+        size = span * self.n_categories
+        lo = first_id - self.origin
+        shape = (span, self.n_categories)
+        self.arrays['count'][lo:lo + span] += np.bincount(flat, minlength=size).reshape(shape)
+        self.arrays['response_sum'][lo:lo + span] += np.bincount(
+            flat, weights=response_time, minlength=size).reshape(shape)
+        self.arrays['satisfaction_sum'][lo:lo + span] += np.bincount(
+            flat, weights=satisfaction, minlength=size).reshape(shape)
+
+    def last_id(self):
+        if self.origin is None:
+            return None
+        return self.origin + self.used - 1
+
+    def select(self, first_id, last_id):
+        """Sums for bucket ids [first_id, last_id], zero-filled outside the table"""
+        n = int(last_id) - int(first_id) + 1
+        out = {name: np.zeros((n, self.n_categories)) for name in METRICS}
+        if self.origin is None or n <= 0:
+            return out
+        lo = max(int(first_id), self.origin)
+        hi = min(int(last_id), self.last_id())
+        if lo <= hi:
+            for name in METRICS:
+                out[name][lo - first_id:hi - first_id + 1] = \
+                    self.arrays[name][lo - self.origin:hi - self.origin + 1]
+        return out
+
+
+class CallRollups:
+    """Hourly, daily and monthly rollups kept in step with a CallStore"""
+
+    def __init__(self, store, save_interval=SAVE_INTERVAL):
+        self.store = store
+        self.path = os.path.join(store.path, 'rollups')
+        self.save_interval = save_interval
+        self._lock = threading.Lock()
+        self._saved_at = None
+        self.watermark = 0
+        self.tables = {
+            res: RollupTable(res, len(store.categories)) for res in RESOLUTIONS
+        }
+        self._load()
+
+    def _file(self, resolution):
+        return os.path.join(self.path, f"{resolution}.npz")
+
+    def _load(self):
+        loaded = {}
+        for res in RESOLUTIONS:
+            if not os.path.exists(self._file(res)):
+                return
+            with np.load(self._file(res)) as data:
+                loaded[res] = {key: data[key] for key in data.files}
+        watermarks = {int(data['watermark']) for data in loaded.values()}
+        # Tables written by an interrupted save disagree; rebuild from scratch
+        if len(watermarks) != 1 or watermarks.pop() > self.store.rows:
+            return
+        for res, data in loaded.items():
+            table = RollupTable(res, len(self.store.categories), int(data['origin']),
+                                {name: data[name] for name in METRICS})
+            self.tables[res] = table
+        self.watermark = int(loaded['hourly']['watermark'])
+
+    def _save(self):
+        self._saved_at = time.monotonic()
+        os.makedirs(self.path, exist_ok=True)
+        for res, table in self.tables.items():
+            if table.origin is None:
+                continue
+            used = table.used
+            tmp_path = self._file(res) + '.tmp.npz'
+            np.savez(tmp_path, watermark=self.watermark, origin=table.origin,
+                     **{name: table.arrays[name][:used] for name in METRICS})
+            os.replace(tmp_path, self._file(res))
+
+    def update(self):
+        """Fold calls appended since the last update into every rollup"""
+        if self.watermark == self.store.rows:
+            return False
+        with self._lock:
+            rows = self.store.rows
+            if self.watermark >= rows:
+                return False
+            new = slice(self.watermark, rows)
+            start = self.store.column('start')[new]
+            category = self.store.column('category')[new].astype(np.int64)
+            response_time = self.store.column('response_time')[new]
+            satisfaction = self.store.column('satisfaction')[new]
+            for res, table in self.tables.items():
+                table.add(bucket_ids(res, start), category, response_time, satisfaction)
+            self.watermark = rows
+            if self._saved_at is None or time.monotonic() - self._saved_at >= self.save_interval:
+                self._save()
+            return True
+
+    def save(self):
+        """Persist every table now, as of the current watermark"""
+        with self._lock:
+            self._save()
+
+    def summary(self, resolution, t0, t1, category=None):
+        """Per-bucket totals for calls that started in [t0, t1)
+
+        Returns bucket start times plus call counts, mean response time and
+        mean satisfaction, optionally restricted to one category index.
+        """
+        self.update()
+        first_id, last_id = bucket_range(resolution, t0, t1)
+        sums = self.tables[resolution].select(first_id, last_id)
+        if category is None:
+            sums = {name: values.sum(axis=1) for name, values in sums.items()}
+        else:
+            sums = {name: values[:, category] for name, values in sums.items()}
+        per_call = np.maximum(sums['count'], 1)
+        return {
+            'start': bucket_starts(resolution, np.arange(first_id, last_id + 1)),
+            'calls': sums['count'].astype(np.int64),
+            'response_time': sums['response_sum'] / per_call,
+            'satisfaction': sums['satisfaction_sum'] / per_call,
+        }
+
+    def by_category(self, resolution, t0, t1):
+        """Per-bucket call counts split by category, shape (buckets, categories)"""
+        self.update()
+        first_id, last_id = bucket_range(resolution, t0, t1)
+        return self.tables[resolution].select(first_id, last_id)['count'].astype(np.int64)
@@ -0,0 +1,232 @@
+"""Multi-resolution call series for charting long time ranges.
+
+``CallSeriesPyramid`` keeps per-minute call counts plus satisfaction and
+response time sums for the whole store, plus coarser levels (5 and 15 minutes, hourly, 6-hourly and
+daily) derived from them.  Each coarser bucket holds totals and the min/max
+of the per-minute values inside it.  ``series`` picks the finest level that
+fits a point budget, so charting two years reads a few thousand buckets
+rather than a million minutes; the mean line is then reduced to the budget
+with Largest-Triangle-Three-Buckets and the min/max band with a bucketed
+reduce.  New calls are folded in from a row watermark, rebuilding only the
+buckets they touch.
+"""
+import threading
+
+import numpy as np
+
+# Minutes per bucket at each level; each divides the next
+LEVELS = (1, 5, 15, 60, 360, 1440)
+LEVEL_NAMES = {1: '1-minute', 5: '5-minute', 15: '15-minute', 60: 'hourly', 360: '6-hour', 1440: 'daily'}
+
+# A level is read when it has at most this many buckets per output point
+OVERSAMPLE = 4
+
+# Per-call columns charted as per-bucket means
+MEANS = ('satisfaction', 'response_time')
+
+# Store rows folded in per step when catching up
+CHUNK = 1 << 18
+
+
+def lttb(x, y, n_out):
+    """Indices of ``n_out`` points that keep the visual shape of (x, y)
+
+    Largest-Triangle-Three-Buckets: the first and last points are kept and
+    every bucket in between contributes the point forming the largest
+    triangle with the previously kept point and the next bucket's mean.
+    Pyramid levels leave only a few points per bucket, which a plain loop
+    scans faster than a NumPy call; wide buckets still go through NumPy.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    widths = np.diff(edges)
+    mean_x = np.append(np.add.reduceat(x[:n - 1], edges[:-1]) / widths, x[-1]).tolist()
+    mean_y = np.append(np.add.reduceat(y[:n - 1], edges[:-1]) / widths, y[-1]).tolist()
+    xs, ys, bounds = x.tolist(), y.tolist(), edges.tolist()
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = bounds[i], bounds[i + 1]
+        ax, ay = xs[a], ys[a]
+        cx, cy = mean_x[i + 1], mean_y[i + 1]
+        if hi - lo > 32:
+            area = np.abs((ax - cx) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (cy - ay))
+            a = lo + int(area.argmax())
+        else:
+            best = -1.0
+            for j in range(lo, hi):
+                area = abs((ax - cx) * (ys[j] - ay) - (ax - xs[j]) * (cy - ay))
+                if area > best:
+                    a, best = j, area
+        selected[i + 1] = a
+    return selected
+
+
+def envelope(x, low, high, n_out):
+    """Min/max band reduced to at most ``n_out`` buckets, each starting at its first x"""
+    if len(x) <= n_out:
+        return x, low, high
+    edges = np.linspace(0, len(x), n_out + 1).astype(np.int64)[:-1]
+    return x[edges], np.fmin.reduceat(low, edges), np.fmax.reduceat(high, edges)
+
+
+def reduce_series(t, mean, low, high, max_points):
+    """Mean line and band of at most ``max_points`` points each"""
+    keep = lttb(t.astype(np.float64), mean, max_points)
+    band_t, band_low, band_high = envelope(t, low, high, max_points)
+    return {'t': t[keep], 'value': mean[keep], 'band_t': band_t, 'low': band_low, 'high': band_high}
+
+
+class CallSeriesPyramid:
+    """Per-minute call counts and per-call means, with coarser min/max levels, kept in step with a CallStore"""
+
+    def __init__(self, store):
+        self.store = store
+        self.watermark = 0
+        self.origin = None
+        self.used = 0
+        self._lock = threading.Lock()
+        self._levels = {}
+
+    def _allocate(self, minutes):
+        levels = {}
+        for size in LEVELS:
+            names = ('calls',) + MEANS
+            if size > 1:
+                names += tuple(f"{name}_{bound}" for name in names for bound in ('min', 'max'))
+            # Mean bounds start as NaN, so buckets never rebuilt are skipped by fmin/fmax above them
+            levels[size] = {name: np.full(minutes // size, np.nan if name.startswith(MEANS) and name not in MEANS
+                                          else 0.0) for name in names}
+        return levels
+
+    def _reserve(self, minutes):
+        """Grow every level to cover ``minutes`` base buckets, in whole days"""
+        capacity = len(self._levels[1]['calls']) if self._levels else 0
+        if minutes <= capacity:
+            return
+        days = -(-max(minutes, 2 * capacity) // 1440)
+        grown = self._allocate(days * 1440)
+        for size, arrays in self._levels.items():
+            for name, values in arrays.items():
+                grown[size][name][:len(values)] = values
+        self._levels = grown
+
+    @staticmethod
+    def _bounds(arrays, c=slice(None)):
+        """Min/max arrays of a level slice; the base level's minutes are their own bounds"""
+        if 'calls_min' in arrays:
+            return {name: arrays[name][c] for name in arrays if name.endswith(('_min', '_max'))}
+        calls = arrays['calls'][c]
+        bounds = {'calls_min': calls, 'calls_max': calls}
+        for name in MEANS:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                per_minute = np.where(calls > 0, arrays[name][c] / calls, np.nan)
+            bounds[f"{name}_min"] = bounds[f"{name}_max"] = per_minute
+        return bounds
+
+    def _rebuild(self, lo, hi):
+        """Recompute coarser buckets covering base minutes [lo, hi]"""
+        previous = 1
+        for size in LEVELS[1:]:
+            child = self._levels[previous]
+            parent = self._levels[size]
+            p_lo, p_hi = lo // size, hi // size
+            ratio = size // previous
+            c = slice(p_lo * ratio, (p_hi + 1) * ratio)
+            shape = (-1, ratio)
+            for name in ('calls',) + MEANS:
+                parent[name][p_lo:p_hi + 1] = child[name][c].reshape(shape).sum(axis=1)
+            # Means are NaN in minutes without calls, which fmin/fmax skip
+            for name, values in self._bounds(child, c).items():
+                reduce = np.fmin if name.endswith('_min') else np.fmax
+                parent[name][p_lo:p_hi + 1] = reduce.reduce(values.reshape(shape), axis=1)
+            previous = size
+
+    def _fold(self, start, stop):
+        """Add store rows [start, stop) to the base level and rebuild the buckets above them"""
+        minute = self.store.column('start')[start:stop] // 60
+        if self.origin is None:
+            self.origin = int(minute.min()) // 1440 * 1440
+        ids = minute - self.origin
+        # The store is append-only by arrival; calls before the first day are dropped
+        valid = ids >= 0
+        ids = ids[valid]
+        if not len(ids):
+            return
+        lo, hi = int(ids.min()), int(ids.max())
+        self._reserve(hi + 1)
+        base = self._levels[1]
+        base['calls'][lo:hi + 1] += np.bincount(ids - lo, minlength=hi - lo + 1)
+        for name in MEANS:
+            weights = self.store.column(name)[start:stop][valid]
+            base[name][lo:hi + 1] += np.bincount(ids - lo, weights=weights, minlength=hi - lo + 1)
+        self.used = max(self.used, hi + 1)
+        self._rebuild(lo, hi)
+
+    def update(self):
+        """Fold calls appended since the last update into every level"""
+        if self.watermark == self.store.rows:
+            return False
+        with self._lock:
+            rows = self.store.rows
+            if self.watermark >= rows:
+                return False
+            # Chunks bound the temporary per-row arrays on a cold start over a large store
+            for start in range(self.watermark, rows, CHUNK):
+                self._fold(start, min(start + CHUNK, rows))
+            self.watermark = rows
+            return True
+
+    def extent(self):
+        """First and last second covered, in whole days, or None before any call"""
+        self.update()
+        if self.origin is None:
+            return None
+        days = -(-self.used // 1440)
+        return self.origin * 60, (self.origin + days * 1440) * 60
+
+    def level_for(self, t0, t1, max_points):
+        """Minutes per bucket of the finest level with at most OVERSAMPLE buckets per point"""
+        minutes = max((t1 - t0) // 60, 1)
+        for size in LEVELS:
+            if minutes // size <= max_points * OVERSAMPLE:
+                return size
+        return LEVELS[-1]
+
+    def series(self, t0, t1, max_points=1000, metrics=('volume',) + MEANS):
+        """Named metrics over [t0, t1), each at most ``max_points`` points
+
+        Returns the level's bucket size in minutes and, per metric, the mean
+        line (``t``, ``value``) and min/max band (``band_t``, ``low``,
+        ``high``).  Volume is in calls per minute and its band spans the
+        busiest and quietest minute of each bucket; per-call means leave out
+        buckets without calls.
+        """
+        self.update()
+        size = self.level_for(t0, t1, max_points)
+        empty = {'t': np.zeros(0, dtype=np.int64), 'value': np.zeros(0),
+                 'band_t': np.zeros(0, dtype=np.int64), 'low': np.zeros(0), 'high': np.zeros(0)}
+        if self.origin is None:
+            return size, dict.fromkeys(metrics, empty)
+        with self._lock:
+            lo = max((t0 // 60 - self.origin) // size, 0)
+            hi = min(((t1 - 1) // 60 - self.origin) // size, (self.used - 1) // size)
+            arrays = {name: values[lo:hi + 1].copy() for name, values in self._levels[size].items()}
+        if hi < lo:
+            return size, dict.fromkeys(metrics, empty)
+        t = (self.origin + np.arange(lo, hi + 1) * size) * 60
+        calls = arrays['calls']
+        bounds = self._bounds(arrays)
+        answered = calls > 0
+        result = {}
+        for name in metrics:
+            if name == 'volume':
+                result[name] = reduce_series(t, calls / size, bounds['calls_min'], bounds['calls_max'], max_points)
+            else:
+                result[name] = reduce_series(t[answered], arrays[name][answered] / calls[answered],
+                                             bounds[f"{name}_min"][answered], bounds[f"{name}_max"][answered],
+                                             max_points)
+        return size, result
@@ -0,0 +1,171 @@
+"""Agents needed per 15-minute interval to meet a service level, from Erlang C.
+
+``required_agents`` solves any broadcast array of intervals and scenarios at
+once.  Erlang C is built from the Erlang B recursion,
+B(n) = A B(n-1) / (n + A B(n-1)), which stays within [0, 1] for any load A,
+instead of from A**n / n!, which overflows past a few hundred Erlangs.  Each
+step of the recursion adds one agent to every interval still short of its
+target, so a solve takes as many NumPy steps as the busiest interval needs
+agents, whatever the number of intervals.
+
+``StaffingPlanner`` measures arrivals and handle times from a CallStore: the
+last closed intervals for the sidebar, and a per-slot weekly profile that
+what-if scenarios scale.
+"""
+import threading
+
+import numpy as np
+
+# Seconds per staffing interval and intervals per week
+INTERVAL = 900
+WEEK = 7 * 86400 // INTERVAL
+
+# Default target: 80% of calls answered within 20 seconds
+SERVICE_LEVEL = 0.8
+ANSWER_WITHIN = 20
+
+
+def required_agents(calls, handle_time, target=SERVICE_LEVEL, answer_within=ANSWER_WITHIN, interval=INTERVAL):
+    """Fewest agents meeting ``target`` for every cell of the broadcast inputs
+
+    ``calls`` arrive per ``interval`` seconds and take ``handle_time``
+    seconds each on average; the target is the share of calls answered
+    within ``answer_within`` seconds.  Returns agent counts and the service
+    level each count achieves; intervals without load need no agents.
+    """
+    calls, handle_time, target, answer_within = np.broadcast_arrays(
+        *(np.asarray(value, dtype=np.float64) for value in (calls, handle_time, target, answer_within)))
+    load = calls * handle_time / interval
+    if not np.all(np.isfinite(load) & (load >= 0)):
+        raise ValueError("Calls and handle times must be finite and non-negative")
+    if np.any((target <= 0) | (target >= 1)):
+        raise ValueError("Service level targets must be between 0 and 1")
+    agents = np.zeros(load.size, dtype=np.int64)
+    level = np.ones(load.size)
+
+    # Cells still short of their target, with Erlang B for the agents tried so far
+    active = np.flatnonzero(load > 0)
+    erlangs = load.ravel()[active]
+    patience = answer_within.ravel()[active] / handle_time.ravel()[active]
+    goal = target.ravel()[active]
+    blocking = np.ones(len(active))
+    n = 0
+    while len(active):
+        n += 1
+        blocking = erlangs * blocking / (n + erlangs * blocking)
+        # Queues only settle once agents outnumber the load
+        stable = np.flatnonzero(erlangs < n)
+        if not len(stable):
+            continue
+        waiting = blocking[stable] / (1 - erlangs[stable] / n * (1 - blocking[stable]))
+        achieved = 1 - waiting * np.exp(-(n - erlangs[stable]) * patience[stable])
+        met = achieved >= goal[stable]
+        if not met.any():
+            continue
+        done = stable[met]
+        agents[active[done]] = n
+        level[active[done]] = achieved[met]
+        keep = np.ones(len(active), dtype=bool)
+        keep[done] = False
+        active, erlangs, patience, goal, blocking = (
+            values[keep] for values in (active, erlangs, patience, goal, blocking))
+    return agents.reshape(load.shape), level.reshape(load.shape)
+
+
+class StaffingPlanner:
+    """Arrivals and handle times per 15-minute interval from a CallStore, for current and what-if staffing
+
+    The weekly profile averages each slot of the week over the last
+    ``weeks`` weeks of closed intervals.  Both measurements are kept until
+    another interval closes.
+    """
+
+    def __init__(self, store, weeks=4):
+        self.store = store
+        self.weeks = weeks
+        self._lock = threading.Lock()
+        self._current = None
+        self._profile = None
+
+    def _open_interval(self):
+        latest = self.store.latest_start()
+        return None if latest is None else latest // INTERVAL
+
+    def _measure(self, first, last):
+        """Calls and handle time sums per interval id in [first, last)"""
+        rows = self.store.row_range(first * INTERVAL, last * INTERVAL)
+        ids = self.store.column('start')[rows] // INTERVAL - first
+        handle = self.store.column('end')[rows] - self.store.column('start')[rows]
+        calls = np.bincount(ids, minlength=last - first).astype(np.float64)
+        return calls, np.bincount(ids, weights=handle, minlength=last - first)
+
+    def current(self, target=SERVICE_LEVEL, answer_within=ANSWER_WITHIN):
+        """Agents the last two closed intervals needed, oldest first, or None before any call"""
+        interval = self._open_interval()
+        if interval is None:
+            return None
+        with self._lock:
+            if self._current is None or self._current[0] != (interval, target, answer_within):
+                calls, handle = self._measure(interval - 2, interval)
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    handle_time = np.where(calls > 0, handle / calls, 0.0)
+                agents, level = required_agents(calls, handle_time, target, answer_within)
+                self._current = ((interval, target, answer_within), {
+                    't': (interval - 2 + np.arange(2)) * INTERVAL,
+                    'calls': calls,
+                    'handle_time': handle_time,
+                    'agents': agents,
+                    'service_level': level,
+                })
+            return self._current[1]
+
+    def profile(self):
+        """Mean calls and handle time for each slot of the week, indexed by interval id % WEEK
+
+        Slots without calls in the window borrow the overall handle time.
+        Returns None before any call.
+        """
+        interval = self._open_interval()
+        if interval is None:
+            return None
+        with self._lock:
+            if self._profile is None or self._profile[0] != interval:
+                first = max(interval - self.weeks * WEEK, self.store.earliest_start() // INTERVAL)
+                calls, handle = self._measure(first, interval)
+                slots = np.arange(first, interval) % WEEK
+                samples = np.maximum(np.bincount(slots, minlength=WEEK), 1)
+                slot_calls = np.bincount(slots, weights=calls, minlength=WEEK)
+                slot_handle = np.bincount(slots, weights=handle, minlength=WEEK)
+                overall = handle.sum() / max(calls.sum(), 1)
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    handle_time = np.where(slot_calls > 0, slot_handle / slot_calls, overall)
+                self._profile = (interval, {
+                    'calls': slot_calls / samples,
+                    'handle_time': handle_time,
+                    'mean_handle_time': overall,
+                })
+            return self._profile[1]
+
+    def plan(self, days=7, rate_scales=(1.0,), handle_scales=(1.0,), target=SERVICE_LEVEL,
+             answer_within=ANSWER_WITHIN):
+        """Agents per interval over the next ``days`` for every arrival x handle time scaling
+
+        Returns the interval starts, profiled calls and handle times, and
+        agents and service levels shaped (rate scales, handle scales,
+        intervals), or None before any call.
+        """
+        profile = self.profile()
+        if profile is None:
+            return None
+        ids = self._open_interval() + np.arange(days * 86400 // INTERVAL)
+        calls, handle_time = profile['calls'][ids % WEEK], profile['handle_time'][ids % WEEK]
+        rates = np.asarray(rate_scales, dtype=np.float64)[:, None, None]
+        handles = np.asarray(handle_scales, dtype=np.float64)[None, :, None]
+        agents, level = required_agents(calls * rates, handle_time * handles, target, answer_within)
+        return {
+            't': ids * INTERVAL,
+            'calls': calls,
+            'handle_time': handle_time,
+            'agents': agents,
+            'service_level': level,
+        }
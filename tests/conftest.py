@@ -0,0 +1,19 @@
+import pytest
+
+from call_generator import CallGenerator
+from call_store import CallStore
+
+# Seeded stores end here, as the benchmarks' do
+END = 1_790_000_000
+
+
+@pytest.fixture
+def generator():
+    return CallGenerator(calls_per_day=2000, agents=40)
+
+
+def filled_store(path, generator, begin, end, chunk_rows=1):
+    """A call store at ``path`` holding the generator's calls of [begin, end)"""
+    store = CallStore(str(path))
+    generator.fill(store, begin, end, chunk_rows)
+    return store
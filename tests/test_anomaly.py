@@ -0,0 +1,28 @@
+import numpy as np
+
+from anomaly import CallAnomalyMonitor
+from tests.conftest import END, filled_store
+
+
+def test_replayed_events_are_never_new(tmp_path, generator):
+    store = filled_store(tmp_path / 'calls', generator, END - 35 * 86400, END)
+    monitor = CallAnomalyMonitor(store)
+    # A session opened before the replay finished holds an early cursor
+    cursor = monitor.sequence
+    monitor.update()
+    fresh, cursor = monitor.since(cursor)
+    assert fresh == [] and cursor == monitor.sequence
+
+    # An hour with three times the usual Billing calls, then one call to close it
+    hour = END // 3600 + 1
+    rng = np.random.default_rng(1)
+    start = np.sort(hour * 3600 + rng.integers(0, 3600, 600))
+    spike = {'start': start, 'end': start + 100, 'category': np.ones(600), 'agent': rng.integers(0, 40, 600),
+             'response_time': np.full(600, 0.35), 'satisfaction': np.full(600, 90.0)}
+    store.append(spike)
+    store.append({name: values[:1] + (3600 if name in ('start', 'end') else 0) for name, values in spike.items()})
+    monitor.update()
+    fresh, _ = monitor.since(cursor)
+    assert fresh and not any(event['replayed'] for event in fresh)
+    spiked = {event['series'] for event in fresh if event['t'] == hour * 3600 and event['metric'] == 'volume'}
+    assert {'All calls', 'Billing'} <= spiked
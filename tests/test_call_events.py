@@ -0,0 +1,100 @@
+import numpy as np
+
+from call_events import CATCH_UP, CallEventBus, DemoCallFeed, LiveAgentScores, SlidingCategoryCounter
+from call_generator import concat_calls
+from tests.conftest import END, filled_store
+
+WINDOWS = (60, 300, 900, 3600)
+
+
+def brute_force_counts(start, category, clock, window, n_categories):
+    recent = clock - start < window
+    return np.bincount(category[recent], minlength=n_categories)
+
+
+def test_sliding_counts_match_brute_force():
+    rng = np.random.default_rng(3)
+    counter = SlidingCategoryCounter(5, WINDOWS)
+    seen_start, seen_category = [], []
+    clock = 1_790_000_000
+    for step in range(300):
+        # Mostly small steps, sometimes a quiet spell longer than a window or the whole span
+        clock += int(rng.choice([0, 1, 7, 45, 400, 5000], p=[0.2, 0.4, 0.2, 0.1, 0.07, 0.03]))
+        n = int(rng.integers(0, 40))
+        # Late calls, some of them older than the longest window
+        start = clock - rng.integers(0, 4000, n) * (rng.random(n) < 0.3)
+        category = rng.integers(0, 5, n)
+        counter.add(start, category)
+        seen_start.append(start)
+        seen_category.append(category)
+
+        all_start, all_category = np.concatenate(seen_start), np.concatenate(seen_category)
+        snapshot = counter.snapshot()
+        for window in WINDOWS:
+            expected = brute_force_counts(all_start, all_category, counter.clock, window, 5)
+            np.testing.assert_array_equal(snapshot[window], expected, err_msg=f"step {step}, {window}s")
+            np.testing.assert_array_equal(counter.counts(window), expected)
+
+
+def test_quiet_feed_keeps_the_counts():
+    counter = SlidingCategoryCounter(3, (60,))
+    counter.add([100, 101, 130], [0, 2, 2])
+    counter.add([], [])
+    assert counter.clock == 130
+    assert list(counter.counts(60)) == [1, 0, 2]
+
+
+def test_subscribe_replays_logged_calls_after_a_second_once():
+    bus = CallEventBus()
+    bus.publish({'start': np.array([10, 11, 12]), 'category': np.array([0, 1, 2])})
+    bus.publish({'start': np.array([13]), 'category': np.array([3])})
+    seen = []
+    bus.subscribe(lambda batch: seen.extend(batch['start']), after=12)
+    bus.publish({'start': np.array([14]), 'category': np.array([4])})
+    assert seen == [12, 13, 14]
+
+
+def test_live_agent_scores_match_a_recount(tmp_path, generator):
+    store = filled_store(tmp_path / 'calls', generator, END - 2 * 86400, END - 3600)
+    bus = CallEventBus()
+    bus.subscribe(store.append)
+    feed = DemoCallFeed(bus, generator, store.agent_codes(generator.agent_names), start=store.latest_start() + 1)
+    bus.publish(feed.make_batch(END - 3000))
+    # Published but not yet in the store, as when appends are buffered
+    unsaved = feed.make_batch(END - 2900)
+    bus._log.append(unsaved)
+
+    everything = LiveAgentScores(store, bus, window=10 * 86400)
+    hour = LiveAgentScores(store, bus)
+    for now in range(END - 2800, END, 100):
+        bus.publish(feed.make_batch(now))
+
+    calls = concat_calls([store.window(0, END), {name: unsaved[name] for name in store.window(0, 1)}])
+    n_agents = everything.agents.calls.shape[1]
+    np.testing.assert_array_equal(everything.agents.calls.sum(axis=0), np.bincount(calls['agent'], minlength=n_agents))
+    # Whole batches leave the hour, so its edge is off by at most one 100-second batch
+    newest = calls['start'].max()
+    counted = hour.agents.calls.sum()
+    assert np.count_nonzero(calls['start'] > newest - 3600) <= counted <= np.count_nonzero(calls['start'] > newest - 3700)
+    codes, score = hour.top_agents(5)
+    assert list(codes) == list(hour.page(5)[0]) and np.all(np.diff(score) <= 0)
+
+def test_demo_feed_continues_the_store_after_a_gap(tmp_path, generator):
+    store = filled_store(tmp_path / 'calls', generator, END - 3 * 86400, END - 2 * 86400 - 500)
+    bus = CallEventBus()
+    bus.subscribe(store.append)
+    codes = store.agent_codes(generator.agent_names)
+    feed = DemoCallFeed(bus, generator, codes, start=store.latest_start() + 1)
+    # Restarted two days later: catch up a day per batch, then tick along
+    now = END - 250
+    while True:
+        batch = feed.make_batch(now)
+        assert batch['start'][-1] - batch['start'][0] < CATCH_UP
+        bus.publish(batch)
+        if feed._until >= now:
+            break
+    bus.publish(feed.make_batch(now + 3))
+
+    expected = concat_calls(list(generator.chunks(END - 3 * 86400, now + 3)))
+    np.testing.assert_array_equal(store.column('start'), expected['start'])
+    np.testing.assert_array_equal(store.column('agent'), codes[expected['agent']])
@@ -0,0 +1,24 @@
+import os
+import time
+
+from call_export import export_path, new_session_dir, prune_exports
+
+
+def touch(path, age):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, 'wb').close()
+    then = time.time() - age
+    os.utime(path, (then, then))
+
+
+def test_prune_removes_expired_files_and_empty_session_dirs(tmp_path):
+    stale, fresh = new_session_dir(), new_session_dir()
+    touch(export_path(stale, 'old.csv.gz', str(tmp_path)), 7200)
+    touch(export_path(fresh, 'old.parquet', str(tmp_path)), 7200)
+    touch(export_path(fresh, 'new.parquet', str(tmp_path)), 0)
+    then = time.time() - 7200
+    os.utime(tmp_path / stale, (then, then))
+
+    prune_exports(str(tmp_path), max_age=3600)
+    assert not (tmp_path / stale).exists()
+    assert os.listdir(tmp_path / fresh) == ['new.parquet']
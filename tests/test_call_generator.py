@@ -0,0 +1,42 @@
+import numpy as np
+
+from call_generator import CallGenerator, concat_calls
+from tests.conftest import END
+
+BEGIN = END - 4 * 86400 - 1234
+
+
+def generate(generator, begin, end, chunk_rows):
+    return concat_calls(list(generator.chunks(begin, end, chunk_rows)))
+
+
+def assert_calls_equal(calls, expected):
+    assert calls.keys() == expected.keys()
+    for name in calls:
+        np.testing.assert_array_equal(calls[name], expected[name], err_msg=name)
+
+
+def test_chunk_size_does_not_change_the_calls(generator):
+    expected = generate(generator, BEGIN, END, 1 << 30)
+    for chunk_rows in (1, 500, 5000):
+        assert_calls_equal(generate(generator, BEGIN, END, chunk_rows), expected)
+
+
+def test_split_ranges_and_fresh_generators_agree(generator):
+    expected = generate(generator, BEGIN, END, 1 << 30)
+    middle = END - 86400 - 777
+    split = concat_calls([generate(generator, BEGIN, middle, 1), generate(generator, middle, END, 1)])
+    assert_calls_equal(split, expected)
+    assert_calls_equal(generate(CallGenerator(calls_per_day=2000, agents=40), BEGIN, END, 1), expected)
+
+
+def test_calls_are_ordered_in_range_and_seeded(generator):
+    calls = generate(generator, BEGIN, END, 1)
+    assert np.all(np.diff(calls['start']) >= 0)
+    assert calls['start'][0] >= BEGIN and calls['start'][-1] < END
+    assert np.all(calls['end'] > calls['start'])
+    assert calls['agent'].max() < len(generator.agent_names)
+    # About calls_per_day a day, and a different seed draws different calls
+    assert 0.5 < len(calls['start']) / 4 / generator.calls_per_day < 1.5
+    other = generate(CallGenerator(calls_per_day=2000, agents=40, seed=8), BEGIN, END, 1)
+    assert len(other['start']) != len(calls['start']) or np.any(other['start'] != calls['start'])
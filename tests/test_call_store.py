@@ -0,0 +1,50 @@
+import time
+
+import numpy as np
+import pytest
+
+from call_store import AppendBuffer, CallStore
+from tests.conftest import END
+
+
+def calls(start):
+    n = len(start)
+    return {'start': np.asarray(start), 'end': np.asarray(start) + 60, 'category': np.zeros(n),
+            'agent': np.zeros(n), 'response_time': np.ones(n), 'satisfaction': np.full(n, 90.0)}
+
+
+def test_append_keeps_start_order(tmp_path):
+    store = CallStore(str(tmp_path))
+    store.append(calls([END + 5, END, END + 2]))
+    assert list(store.column('start')) == [END, END + 2, END + 5]
+    with pytest.raises(ValueError):
+        store.append(calls([END + 1]))
+    reopened = CallStore(str(tmp_path))
+    assert reopened.rows == 3 and reopened.latest_start() == END + 5
+
+
+def test_buffer_writes_on_size_and_on_flush(tmp_path):
+    store = CallStore(str(tmp_path))
+    buffer = AppendBuffer(store, interval=3600, max_rows=5)
+    buffer.append(calls([END, END + 1]))
+    buffer.append(calls([END + 2]))
+    assert store.rows == 0
+    buffer.append(calls([END + 3, END + 4]))
+    assert store.rows == 5 and store.version == 1
+    buffer.append(calls([END + 5]))
+    buffer.flush()
+    assert list(store.column('start')) == list(range(END, END + 6))
+
+
+def test_buffer_thread_flushes_on_its_interval(tmp_path):
+    store = CallStore(str(tmp_path))
+    buffer = AppendBuffer(store, interval=0.05).start()
+    try:
+        for second in range(10):
+            buffer.append(calls([END + second]))
+        deadline = time.monotonic() + 5
+        while store.rows < 10 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert store.rows == 10
+    finally:
+        buffer.stop()
@@ -0,0 +1,46 @@
+import io
+import os
+
+import numpy as np
+import pytest
+
+from model_registry import ModelRegistry, arrays_from_npz
+
+
+def layers(rng, sizes):
+    weights = [rng.standard_normal((a, b)).astype(np.float32) for a, b in zip(sizes, sizes[1:])]
+    return weights, [np.zeros(b, dtype=np.float32) for b in sizes[1:]]
+
+
+def npz_bytes(**arrays):
+    buffer = io.BytesIO()
+    np.savez(buffer, **arrays)
+    return io.BytesIO(buffer.getvalue())
+
+
+def test_register_versions_and_load(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    weights, biases = layers(np.random.default_rng(0), [4, 8, 3])
+    first = registry.register("net", weights, biases)
+    second = registry.register("net", weights, biases)
+    assert [registry.get(i)['version'] for i in (first, second)] == [1, 2]
+    np.testing.assert_array_equal(registry.load(second).weights[0], weights[0])
+    assert not [name for name in os.listdir(tmp_path / "net") if name.startswith('.tmp-')]
+
+
+def test_arrays_from_npz_round_trip():
+    weights, biases = layers(np.random.default_rng(1), [5, 6, 2])
+    loaded_w, loaded_b = arrays_from_npz(npz_bytes(W0=weights[0], b0=biases[0], W1=weights[1], b1=biases[1]))
+    np.testing.assert_array_equal(loaded_w[1], weights[1])
+    np.testing.assert_array_equal(loaded_b[0], biases[0])
+
+
+def test_arrays_from_npz_rejects_bad_files():
+    plain = io.BytesIO()
+    np.save(plain, np.zeros(3))
+    plain.seek(0)
+    corrupt = npz_bytes(W0=np.zeros((2, 2)), b0=np.zeros(2)).getvalue()
+    for file in (plain, io.BytesIO(b"PK\x03\x04 not a zip"), io.BytesIO(corrupt[:len(corrupt) // 2]),
+                 npz_bytes(W0=np.zeros((2, 2))), npz_bytes(W0=np.zeros((2, 2)), b0=np.zeros(3))):
+        with pytest.raises(ValueError):
+            arrays_from_npz(file)
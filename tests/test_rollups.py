@@ -0,0 +1,69 @@
+import numpy as np
+
+from rollups import RESOLUTIONS, METRICS, CallRollups
+from tests.conftest import END, filled_store
+
+BEGIN = END - 40 * 86400
+# Last whole hour of the seeded calls
+HOUR = END // 3600 * 3600 - 3600
+
+
+def assert_tables_equal(rollups, expected):
+    for res in RESOLUTIONS:
+        table, full = rollups.tables[res], expected.tables[res]
+        assert (table.origin, table.used) == (full.origin, full.used)
+        for name in METRICS:
+            np.testing.assert_allclose(table.arrays[name][:table.used], full.arrays[name][:full.used])
+
+
+def test_incremental_updates_match_a_full_build(tmp_path, generator):
+    store = filled_store(tmp_path / 'incremental', generator, BEGIN, BEGIN + 86400)
+    rollups = CallRollups(store, save_interval=0)
+    rollups.update()
+    codes = store.agent_codes(generator.agent_names)
+    # Day-sized batches, then batches of a few minutes that straddle bucket edges
+    edges = list(range(BEGIN + 86400, END - 86400, 86400)) + list(range(END - 86400, END, 433)) + [END]
+    for t0, t1 in zip(edges, edges[1:]):
+        for calls in generator.chunks(t0, t1):
+            store.append(dict(calls, agent=codes[calls['agent']]))
+        rollups.update()
+
+    full = CallRollups(filled_store(tmp_path / 'full', generator, BEGIN, END))
+    full.update()
+    assert store.rows == full.store.rows
+    assert_tables_equal(rollups, full)
+
+
+def test_restart_resumes_from_the_saved_watermark(tmp_path, generator):
+    store = filled_store(tmp_path / 'calls', generator, BEGIN, END - 86400)
+    CallRollups(store).update()
+    generator.fill(store, END - 86400, END)
+
+    resumed = CallRollups(store)
+    assert 0 < resumed.watermark < store.rows
+    resumed.update()
+    full = CallRollups(filled_store(tmp_path / 'full', generator, BEGIN, END))
+    full.update()
+    assert_tables_equal(resumed, full)
+
+
+def test_summary_matches_the_raw_calls(tmp_path, generator):
+    store = filled_store(tmp_path / 'calls', generator, BEGIN, END)
+    summary = CallRollups(store).summary('hourly', HOUR - 86400, HOUR)
+
+    start = store.column('start')
+    hours = start[(start >= HOUR - 86400) & (start < HOUR)] // 3600
+    ids, counts = np.unique(hours, return_counts=True)
+    assert list(summary['start'] // 3600) == list(range(ids[0], ids[-1] + 1))
+    np.testing.assert_array_equal(summary['calls'][ids - ids[0]], counts)
+
+
+def test_summary_ranges_are_half_open(tmp_path, generator):
+    rollups = CallRollups(filled_store(tmp_path / 'calls', generator, BEGIN, END))
+    t = END - 5000
+    for res in RESOLUTIONS:
+        assert len(rollups.summary(res, t, t)['start']) == 0
+        assert len(rollups.summary(res, t, t + 1)['start']) == 1
+        assert rollups.by_category(res, t, t - 10).shape == (0, len(rollups.store.categories))
+    # A range ending on a bucket edge leaves the bucket after it out
+    assert len(rollups.summary('hourly', HOUR - 3600, HOUR)['start']) == 1
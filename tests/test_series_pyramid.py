@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+from series_pyramid import LEVELS, MEANS, CallSeriesPyramid, lttb
+from tests.conftest import END, filled_store
+
+BEGIN = END - 5 * 86400
+
+
+def per_minute(store, origin, minutes):
+    """Calls and summed means per base minute, zero-filled, from the raw calls"""
+    calls = pd.DataFrame({name: store.column(name) for name in ('start',) + MEANS})
+    calls['minute'] = calls.pop('start') // 60 - origin
+    grouped = calls.groupby('minute').agg(calls=(MEANS[0], 'size'), **{name: (name, 'sum') for name in MEANS})
+    return grouped.reindex(np.arange(minutes), fill_value=0)
+
+
+def test_levels_match_groupby(tmp_path, generator):
+    store = filled_store(tmp_path / 'calls', generator, BEGIN, END - 86400)
+    pyramid = CallSeriesPyramid(store)
+    pyramid.update()
+    # A second fold lands partway through a day, so coarse buckets are rebuilt in place
+    generator.fill(store, END - 86400, END)
+    pyramid.update()
+
+    base = per_minute(store, pyramid.origin, len(pyramid._levels[1]['calls']))
+    for name, expected in base.items():
+        np.testing.assert_allclose(pyramid._levels[1][name], expected, err_msg=name)
+    for name in MEANS:
+        base[f"{name}_minute"] = base[name] / base['calls'].where(base['calls'] > 0)
+    for size in LEVELS[1:]:
+        level = pyramid._levels[size]
+        grouped = base.groupby(base.index // size)
+        for name in ('calls',) + MEANS:
+            np.testing.assert_allclose(level[name], grouped[name].sum(), err_msg=f"{size} {name}")
+        np.testing.assert_array_equal(level['calls_min'], grouped['calls'].min())
+        np.testing.assert_array_equal(level['calls_max'], grouped['calls'].max())
+        # Buckets without calls have no mean bounds (NaN on both sides)
+        for name in MEANS:
+            for bound in ('min', 'max'):
+                expected = getattr(grouped[f"{name}_minute"], bound)()
+                np.testing.assert_allclose(level[f"{name}_{bound}"], expected, rtol=1e-6,
+                                           err_msg=f"{size} {name}_{bound}")
+
+
+def test_series_volume_adds_up_to_the_calls(tmp_path, generator):
+    store = filled_store(tmp_path / 'calls', generator, BEGIN, END)
+    t0, t1 = BEGIN // 3600 * 3600 + 3600, END // 3600 * 3600
+    size, result = CallSeriesPyramid(store).series(t0, t1, max_points=10_000, metrics=('volume',))
+    assert size == 1
+    start = store.column('start')
+    assert result['volume']['value'].sum() == np.count_nonzero((start >= t0) & (start < t1))
+
+
+def test_lttb_keeps_the_ends_and_the_peak():
+    x = np.arange(1000, dtype=np.float64)
+    y = np.sin(x / 50)
+    y[437] = 10
+    keep = lttb(x, y, 50)
+    assert len(keep) == 50 and keep[0] == 0 and keep[-1] == 999
+    assert 437 in keep and np.all(np.diff(keep) > 0)
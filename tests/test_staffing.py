@@ -0,0 +1,56 @@
+import math
+
+import numpy as np
+import pytest
+
+from staffing import INTERVAL, required_agents
+
+
+def direct_service_level(n, erlangs, patience):
+    """Erlang C service level with n agents, summing A**k / k! in log space"""
+    terms = [k * math.log(erlangs) - math.lgamma(k + 1) for k in range(n)]
+    queued = n * math.log(erlangs) - math.lgamma(n + 1) + math.log(n / (n - erlangs))
+    top = max(terms + [queued])
+    waiting = math.exp(queued - top) / (sum(math.exp(t - top) for t in terms) + math.exp(queued - top))
+    return 1 - waiting * math.exp(-(n - erlangs) * patience)
+
+
+def direct_required_agents(calls, handle_time, target, answer_within):
+    erlangs = calls * handle_time / INTERVAL
+    if erlangs == 0:
+        return 0, 1.0
+    n = math.floor(erlangs) + 1
+    while (level := direct_service_level(n, erlangs, answer_within / handle_time)) < target:
+        n += 1
+    return n, level
+
+
+def test_matches_direct_formula():
+    rng = np.random.default_rng(11)
+    calls = np.concatenate([rng.integers(0, 400, 150), rng.integers(1000, 6000, 20), [0, 1, 12000]])
+    handle_time = rng.uniform(60, 900, len(calls))
+    target = rng.choice([0.5, 0.8, 0.9, 0.95], len(calls))
+    answer_within = rng.choice([10, 20, 60], len(calls))
+
+    agents, level = required_agents(calls, handle_time, target, answer_within)
+    for i in range(len(calls)):
+        expected_agents, expected_level = direct_required_agents(calls[i], handle_time[i], target[i], answer_within[i])
+        assert agents[i] == expected_agents, i
+        assert level[i] == pytest.approx(expected_level, rel=1e-9, abs=1e-12)
+
+
+def test_broadcasts_scenarios_over_intervals():
+    calls = np.array([[100.0, 250.0, 0.0]])
+    targets = np.array([[0.7], [0.8], [0.9]])
+    agents, level = required_agents(calls, 300, targets)
+    assert agents.shape == level.shape == (3, 3)
+    assert np.all(np.diff(agents, axis=0) >= 0)
+    assert list(agents[:, 2]) == [0, 0, 0]
+    assert np.all(level >= targets)
+
+
+def test_rejects_bad_inputs():
+    with pytest.raises(ValueError):
+        required_agents(-1, 300)
+    with pytest.raises(ValueError):
+        required_agents(10, 300, target=1.0)
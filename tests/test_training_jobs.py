@@ -0,0 +1,31 @@
+import time
+
+from training_jobs import COMPLETED, JobManager
+
+
+def train(job, epochs):
+    job.report(epochs, {'loss': 0.5})
+    return object()
+
+
+def wait(manager, job_id, timeout=5.0):
+    deadline = time.time() + timeout
+    while manager.get(job_id).finished_at is None and time.time() < deadline:
+        time.sleep(0.01)
+    return manager.get(job_id)
+
+
+def test_only_newest_results_are_kept():
+    manager = JobManager(max_workers=1, max_results=2)
+    jobs = [wait(manager, manager.submit(train, epochs=3)) for _ in range(4)]
+    time.sleep(0.05)
+    assert all(job.status == COMPLETED and job.history for job in jobs)
+    assert [job.result is not None for job in jobs] == [False, False, True, True]
+
+
+def test_release_keeps_metrics():
+    manager = JobManager(max_workers=1)
+    job = wait(manager, manager.submit(train, epochs=3))
+    manager.release(job.id)
+    assert job.result is None
+    assert job.metrics == {'loss': 0.5} and job.history == [{'loss': 0.5, 'epoch': 3}]
@@ -0,0 +1,184 @@
+"""Background training jobs shared by every session of the app.
+
+``JobManager`` runs training functions on a bounded thread pool so a
+session's script thread never blocks on an epoch loop.  Sessions keep only a
+job id; they poll ``snapshot()`` for progress and can reattach to a running
+job after a page reload.  Training functions call ``job.checkpoint()``
+between steps, which is where pause, resume and cancel take effect.
+Finished jobs keep their metrics and history, but only the newest few keep
+their trained model, and ``release()`` drops it once it has been saved.
+"""
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+QUEUED = 'queued'
+RUNNING = 'running'
+PAUSED = 'paused'
+COMPLETED = 'completed'
+CANCELLED = 'cancelled'
+FAILED = 'failed'
+
+ACTIVE_STATES = (QUEUED, RUNNING, PAUSED)
+
+class JobCancelled(Exception):
+    """Raised inside a training function when its job is cancelled"""
+
+
+class JobLimitError(RuntimeError):
+    """Raised when submitting past the manager's concurrency bound"""
+
+
+class TrainingJob:
+    """State of one training run, updated by its worker and read by sessions"""
+
+    def __init__(self, name, params):
+        self.id = uuid.uuid4().hex[:8]
+        self.name = name
+        self.params = params
+        self.status = QUEUED
+        self.epoch = 0
+        self.total_epochs = params.get('epochs', 0)
+        self.metrics = {}
+        self.history = []
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self._lock = threading.Lock()
+        self._resume = threading.Event()
+        self._resume.set()
+        self._cancel = threading.Event()
+
+    @property
+    def progress(self):
+        return self.epoch / self.total_epochs if self.total_epochs else 0.0
+
+    def report(self, epoch, metrics):
+        """Record metrics for a finished epoch (called from the worker)"""
+        with self._lock:
+            self.epoch = epoch
+            self.metrics = dict(metrics)
+            self.history.append(dict(metrics, epoch=epoch))
+
+    def checkpoint(self):
+        """Block while paused and raise JobCancelled once cancelled"""
+        while not self._resume.wait(0.2):
+            if self._cancel.is_set():
+                break
+        if self._cancel.is_set():
+            raise JobCancelled(self.id)
+
+    def snapshot(self):
+        """Consistent copy of the job's state for rendering"""
+        with self._lock:
+            return {
+                'id': self.id,
+                'name': self.name,
+                'params': dict(self.params),
+                'status': self.status,
+                'epoch': self.epoch,
+                'total_epochs': self.total_epochs,
+                'progress': self.progress,
+                'metrics': dict(self.metrics),
+                'history': list(self.history),
+                'error': self.error,
+                'created_at': self.created_at,
+                'finished_at': self.finished_at,
+            }
+
+
+class JobManager:
+    """Bounded pool of background training workers"""
+
+    def __init__(self, max_workers=2, max_pending=4, max_history=50, max_results=2):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_history = max_history
+        self.max_results = max_results
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="training-job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, func, name="training", **params):
+        """Queue ``func(job, **params)`` and return its job id"""
+        with self._lock:
+            active = sum(job.status in ACTIVE_STATES for job in self._jobs.values())
+            if active >= self.max_workers + self.max_pending:
+                raise JobLimitError(
+                    f"{active} training jobs already queued or running; wait for one to finish")
+            job = TrainingJob(name, params)
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._run, job, func)
+        return job.id
+
+    def _run(self, job, func):
+        with job._lock:
+            if job._cancel.is_set():
+                job.status = CANCELLED
+                job.finished_at = time.time()
+                return
+            job.status = RUNNING
+        try:
+            result = func(job, **job.params)
+            status, error = COMPLETED, None
+        except JobCancelled:
+            result, status, error = None, CANCELLED, None
+        except Exception as exc:
+            result, status, error = None, FAILED, f"{type(exc).__name__}: {exc}"
+        with job._lock:
+            job.result = result
+            job.status = status
+            job.error = error
+            job.finished_at = time.time()
+        with self._lock:
+            self._prune()
+
+    def _prune(self):
+        finished = [job for job in self._jobs.values() if job.status not in ACTIVE_STATES]
+        finished.sort(key=lambda job: job.created_at)
+        for job in finished[:max(0, len(finished) - self.max_history)]:
+            del self._jobs[job.id]
+        kept = [job for job in finished if job.result is not None]
+        for job in kept[:max(0, len(kept) - self.max_results)]:
+            job.result = None
+
+    def release(self, job_id):
+        """Drop a finished job's result, keeping its metrics and history"""
+        job = self._jobs.get(job_id)
+        if job is not None and job.status not in ACTIVE_STATES:
+            with job._lock:
+                job.result = None
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def jobs(self):
+        """Every tracked job, newest first"""
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda job: job.created_at, reverse=True)
+
+    def pause(self, job_id):
+        job = self._jobs.get(job_id)
+        if job is not None:
+            with job._lock:
+                if job.status == RUNNING:
+                    job._resume.clear()
+                    job.status = PAUSED
+
+    def resume(self, job_id):
+        job = self._jobs.get(job_id)
+        if job is not None:
+            with job._lock:
+                if job.status == PAUSED:
+                    job.status = RUNNING
+                    job._resume.set()
+
+    def cancel(self, job_id):
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job._cancel.set()
+            job._resume.set()